@@ -0,0 +1,61 @@
+"""
+Compare the compiled keyword categorizer with the per-keyword substring scan.
+
+Run from the repository root:
+    python -m benchmarks.bench_categorizer [--size 10000]
+"""
+
+import argparse
+import time
+
+from benchmarks.corpus import make_articles
+from categorizer import CATEGORY_KEYWORDS, KeywordCategorizer
+
+
+def legacy_categorize(articles):
+    """The original categorize_articles loop: one substring scan per keyword"""
+    for article in articles:
+        text = (article['title'] + ' ' + article['summary']).lower()
+        category_counts = {category: 0 for category in CATEGORY_KEYWORDS}
+        for category, keywords in CATEGORY_KEYWORDS.items():
+            for keyword in keywords:
+                if keyword.lower() in text:
+                    category_counts[category] += 1
+        assigned = [category for category, count in category_counts.items() if count >= 1]
+        article['categories'] = ','.join(assigned or ['innovation', 'business'])
+    return articles
+
+
+def best_of(func, articles, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        batch = [article.copy() for article in articles]
+        start = time.perf_counter()
+        func(batch)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(size: int = 10000, repeat: int = 5) -> dict:
+    articles = make_articles(size)
+    categorizer = KeywordCategorizer()
+    legacy = best_of(legacy_categorize, articles, repeat)
+    compiled = best_of(categorizer.categorize_articles, articles, repeat)
+    return {'size': size, 'legacy_s': legacy, 'compiled_s': compiled, 'speedup': legacy / compiled}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=10000, help="Number of synthetic articles")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per implementation (best is kept)")
+    args = parser.parse_args()
+
+    result = run(args.size, args.repeat)
+    print(f"articles:   {result['size']}")
+    print(f"legacy:     {result['legacy_s'] * 1000:.1f} ms")
+    print(f"compiled:   {result['compiled_s'] * 1000:.1f} ms")
+    print(f"speedup:    {result['speedup']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
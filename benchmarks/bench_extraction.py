@@ -0,0 +1,74 @@
+"""
+Compare lxml/XPath article extraction with the BeautifulSoup html.parser path.
+
+Runs both over the saved pages in benchmarks/fixtures and checks they extract
+the same text. The unknown-site fixture exercises the fallback.
+
+Run from the repository root:
+    python -m benchmarks.bench_extraction [--repeat 20]
+"""
+
+import argparse
+import os
+import time
+
+from web_scraper import WebScraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# Fixture file -> URL it stands in for (the domain picks the site selectors)
+FIXTURES = {
+    'canarymedia_article.html': 'https://www.canarymedia.com/articles/energy-storage/utilities-race-to-add-storage',
+    'utilitydive_article.html': 'https://www.utilitydive.com/news/regulators-approve-transmission-plan/700000/',
+    'unknown_site_article.html': 'https://www.example.com/news/hydrogen-hub-update'
+}
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(repeat: int = 20) -> list:
+    scraper = WebScraper()
+    results = []
+    for filename, url in FIXTURES.items():
+        with open(os.path.join(FIXTURES_DIR, filename), 'r', encoding='utf-8') as f:
+            page = f.read()
+        site = next((k for k in scraper.site_selectors if k in url), None)
+        selectors = scraper.site_selectors.get(site)
+
+        legacy_text = scraper._soup_article_text(page, selectors)
+        engine_text = scraper.extract_article_text(page, url)
+        legacy = best_of(lambda: scraper._soup_article_text(page, selectors), repeat)
+        engine = best_of(lambda: scraper.extract_article_text(page, url), repeat)
+        results.append({
+            'fixture': filename,
+            'kb': len(page.encode('utf-8')) / 1024,
+            'engine': 'lxml' if site in scraper.extractors else 'fallback',
+            'same_text': legacy_text == engine_text,
+            'chars': len(engine_text),
+            'legacy_ms': legacy * 1000,
+            'engine_ms': engine * 1000,
+            'speedup': legacy / engine
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help="Runs per fixture and implementation (best is kept)")
+    args = parser.parse_args()
+
+    print(f"{'fixture':<28} {'KB':>6} {'engine':>9} {'same':>5} {'soup ms':>8} {'lxml ms':>8} {'speedup':>8}")
+    for result in run(args.repeat):
+        print(f"{result['fixture']:<28} {result['kb']:>6.0f} {result['engine']:>9} {str(result['same_text']):>5} "
+              f"{result['legacy_ms']:>8.2f} {result['engine_ms']:>8.2f} {result['speedup']:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Time a cold import of main.py and the first /test request in fresh interpreters.
+
+Outbound network connections are blocked in the child process, so the run
+also checks that startup never reaches the network.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup [--repeat 5]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Executed in each child interpreter: block sockets, import the app, hit /test
+CHILD_SCRIPT = """
+import json, socket, time
+
+def refuse(*args, **kwargs):
+    raise OSError("network disabled during startup benchmark")
+
+socket.socket.connect = refuse
+socket.create_connection = refuse
+
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+response = main.app.test_client().get('/test')
+finished = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - start,
+    'first_request_s': finished - imported,
+    'status': response.status_code,
+    'heavy_modules': sorted(name for name in ('nltk', 'feedparser', 'openai', 'whisper', 'torch')
+                            if name in __import__('sys').modules)
+}))
+"""
+
+
+def run_once() -> dict:
+    completed = subprocess.run([sys.executable, '-c', CHILD_SCRIPT], capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run(repeat: int = 5) -> dict:
+    runs = [run_once() for _ in range(repeat)]
+    return {
+        'repeat': repeat,
+        'import_s': statistics.median(r['import_s'] for r in runs),
+        'first_request_s': statistics.median(r['first_request_s'] for r in runs),
+        'status': runs[-1]['status'],
+        'heavy_modules': runs[-1]['heavy_modules']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters to start (median is kept)")
+    args = parser.parse_args()
+
+    result = run(args.repeat)
+    print(f"import main:    {result['import_s'] * 1000:.1f} ms (median of {result['repeat']})")
+    print(f"first /test:    {result['first_request_s'] * 1000:.1f} ms (status {result['status']})")
+    print(f"heavy modules:  {', '.join(result['heavy_modules']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Deterministic synthetic content for benchmarks.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+WORDS = (
+    "the grid utility solar wind battery storage project developers said on "
+    "tuesday that new capacity will come online next year as state regulators "
+    "approve rate cases and transmission lines while investors pour billions "
+    "into clean hydrogen carbon capture and offshore wind despite rising costs "
+    "interest rates supply chain delays and permitting reform stalls in congress "
+    "a lawn care company announced layoffs as its house brand struggles"
+).split()
+
+SOURCES = ['Canary Media', 'Utility Dive']
+
+
+def make_sentence(rng: random.Random, min_words: int = 8, max_words: int = 30) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words)), str(rng.randint(1, 999)))
+    return ' '.join(words).capitalize() + '.'
+
+
+def make_text(rng: random.Random, sentences: int) -> str:
+    return ' '.join(make_sentence(rng) for _ in range(sentences))
+
+
+# Reference date of the synthetic corpora; pass today=datetime.now() for date-filter benchmarks
+REFERENCE_DATE = datetime(2025, 5, 5)
+
+
+def make_articles(count: int, seed: int = 42, summary_sentences: int = 4, today: datetime = None) -> List[Dict]:
+    """Articles shaped like the scraper output (title, link, summary, source, date)"""
+    rng = random.Random(seed)
+    today = today or REFERENCE_DATE
+    articles = []
+    for idx in range(count):
+        articles.append({
+            'title': make_sentence(rng, 6, 12).rstrip('.'),
+            'link': f"https://www.example.com/articles/{idx}",
+            'summary': make_text(rng, summary_sentences),
+            'source': SOURCES[idx % len(SOURCES)],
+            'date': (today - timedelta(days=rng.randint(0, 6))).strftime('%Y-%m-%d'),
+            'timestamp': today.isoformat()
+        })
+    return articles
+
+
+def make_episodes(count: int, seed: int = 7, today: datetime = None) -> List[Dict]:
+    """Podcast episodes shaped like the scraper output, about a third older than 30 days"""
+    rng = random.Random(seed)
+    today = today or REFERENCE_DATE
+    episodes = []
+    for idx in range(count):
+        episodes.append({
+            'title': make_sentence(rng, 4, 10).rstrip('.'),
+            'description': make_text(rng, 3),
+            'summary': make_text(rng, 3),
+            'has_transcript': True,
+            'release_date': (today - timedelta(days=rng.randint(0, 45))).strftime('%Y-%m-%d'),
+            'url': f"https://www.example.com/episodes/{idx}",
+            'source': 'Catalyst with Shayle Kann',
+            'timestamp': today.isoformat()
+        })
+    return episodes
@@ -0,0 +1,130 @@
+"""
+End-to-end load test of update_content against the local upstream simulator.
+
+Starts benchmarks.upstream_sim, points the scrapers at it through
+CANARY_MEDIA_BASE_URL, UTILITY_DIVE_BASE_URL and PODCAST_RSS_URL, and runs full
+content updates in a temporary working directory (the repository's data/ is not
+touched). Reports update throughput and per-stage latency percentiles from the
+app's own metrics; the second and later runs show the incremental path
+(conditional GETs and reused articles).
+
+Run from the repository root:
+    python -m benchmarks.load_test [--articles 5000] [--latency-ms 50 --jitter-ms 100] [--runs 2]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.upstream_sim import UpstreamSimulator, add_config_arguments, config_from_args
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def stage_report(metrics, summary: dict) -> list:
+    """Per (stage) count, errors, total time and latency percentiles for one run"""
+    stages = {}
+    for entry in summary.get('stages', []):
+        stage = stages.setdefault(entry['stage'], {'stage': entry['stage'], 'count': 0, 'errors': 0,
+                                                   'seconds': 0.0, 'max_seconds': 0.0})
+        stage['count'] += entry['count']
+        stage['errors'] += entry['errors']
+        stage['seconds'] = round(stage['seconds'] + entry['seconds'], 4)
+        stage['max_seconds'] = max(stage['max_seconds'], entry['max_seconds'])
+    for stage in stages.values():
+        for q in QUANTILES:
+            value = metrics.quantile('stage_duration_seconds', q, stage=stage['stage'])
+            # Bucket interpolation can overshoot the largest observation
+            stage[f"p{int(q * 100)}_seconds"] = round(min(value, stage['max_seconds']), 4) if value is not None else None
+    return sorted(stages.values(), key=lambda stage: -stage['seconds'])
+
+
+def print_run(run: dict):
+    print(f"\nRun {run['run']}: {'ok' if run['success'] else 'FAILED'} in {run['wall_seconds']:.2f}s, "
+          f"{run['articles_saved']} articles and {run['episodes_saved']} episodes saved, "
+          f"{run['articles_fetched']} articles fetched ({run['articles_per_second']:.1f}/s)")
+    print(f"  upstream: {run['upstream']['requests']} requests, {run['upstream']['errors']} errors, "
+          f"{run['upstream']['not_modified']} not modified")
+    print(f"  {'stage':<16} {'count':>7} {'errors':>6} {'total s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for stage in run['stages']:
+        def ms(value):
+            return f"{value * 1000:>9.1f}" if value is not None else f"{'-':>9}"
+        print(f"  {stage['stage']:<16} {stage['count']:>7} {stage['errors']:>6} {stage['seconds']:>9.2f} "
+              f"{ms(stage['p50_seconds'])} {ms(stage['p95_seconds'])} {ms(stage['p99_seconds'])} {ms(stage['max_seconds'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_config_arguments(parser)
+    parser.add_argument('--runs', type=int, default=2, help="Consecutive updates (later runs are incremental)")
+    parser.add_argument('--output', help="Write the report as JSON to this file")
+    parser.add_argument('--keep', action='store_true', help="Keep the temporary working directory")
+    args = parser.parse_args()
+
+    repo_dir = os.getcwd()
+    output = os.path.abspath(args.output) if args.output else None
+    simulator = UpstreamSimulator(config_from_args(args))
+    os.environ.update(simulator.start())
+    # Keep everything the simulator serves inside the update's date window
+    os.environ.setdefault('ARTICLE_DAYS_FILTER', str(args.days + 2))
+    os.environ.setdefault('PODCAST_DAYS_FILTER', str(args.days + 2))
+
+    workdir = tempfile.mkdtemp(prefix='load_test_')
+    os.chdir(workdir)
+    sys.path.insert(0, repo_dir)
+    runs = []
+    try:
+        # main wires up the scrapers at import, so import it once the environment is set
+        import main as app
+        from metrics import default_metrics
+
+        for run in range(1, args.runs + 1):
+            default_metrics.reset()
+            before = simulator.stats.as_dict()
+            start = time.perf_counter()
+            success = app.update_content(full_refresh=True if run == 1 else None)
+            wall = time.perf_counter() - start
+            after = simulator.stats.as_dict()
+
+            summary = default_metrics.last_run() or {}
+            stages = stage_report(default_metrics, summary)
+            fetched = next((stage['count'] for stage in stages if stage['stage'] == 'article_fetch'), 0)
+            result = {
+                'run': run,
+                'success': success,
+                'wall_seconds': round(wall, 3),
+                'articles_saved': len(app.web_scraper.load_articles('articles.json')),
+                'episodes_saved': len(app.podcast_scraper.load_episodes('podcasts.json')),
+                'articles_fetched': fetched,
+                'articles_per_second': fetched / wall if wall else 0.0,
+                'upstream': {
+                    'requests': sum(after['requests'].values()) - sum(before['requests'].values()),
+                    'errors': after['errors'] - before['errors'],
+                    'not_modified': after['not_modified'] - before['not_modified']
+                },
+                'stages': stages
+            }
+            runs.append(result)
+    finally:
+        os.chdir(repo_dir)
+        simulator.stop()
+        if args.keep:
+            print(f"Working directory kept at {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    for run in runs:
+        print_run(run)
+    if output:
+        report = {'config': vars(simulator.config), 'runs': runs}
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {output}")
+
+
+if __name__ == '__main__':
+    main()
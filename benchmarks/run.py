@@ -0,0 +1,333 @@
+"""
+Run the offline benchmark suite and write machine-readable results.
+
+Each benchmark runs against deterministic synthetic corpora (benchmarks/corpus.py)
+or the saved pages in benchmarks/fixtures at sizes from 100 to 100k items; sizes
+above a benchmark's cap are skipped. Results are written as JSON keyed by commit
+so runs can be compared with --compare.
+
+Run from the repository root:
+    python -m benchmarks.run [--sizes 100,1000,10000,100000] [--only categorize_articles,...]
+    python -m benchmarks.run --compare benchmarks/results/<old>.json
+"""
+
+import argparse
+import atexit
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta, timezone
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from benchmarks.corpus import make_articles, make_episodes, make_text
+from benchmarks.bench_extraction import FIXTURES, FIXTURES_DIR
+from categorizer import default_categorizer
+from dashboard_model import build_model
+from dedup import NearDuplicateIndex
+from podcast_scraper import PodcastScraper
+from site_templates import register_template_helpers
+from summary_cache import SummaryCache
+from web_scraper import WebScraper
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+
+
+def make_scrapers():
+    """Scrapers with the summary cache disabled so every call does the real work"""
+    web_scraper = WebScraper()
+    podcast_scraper = PodcastScraper()
+    web_scraper.summary_cache = podcast_scraper.summary_cache = SummaryCache(enabled=False)
+    return web_scraper, podcast_scraper
+
+
+# Each benchmark: (size, scrapers) -> (prepare, run[, cleanup]). prepare() builds fresh
+# input outside the timed region, run(state) is the timed call and cleanup(state), if
+# given, undoes prepare() after the timing stops.
+
+def bench_categorize_articles(size, scrapers):
+    articles = make_articles(size)
+    return (lambda: [article.copy() for article in articles],
+            default_categorizer.categorize_articles)
+
+
+def bench_filter_recent_content(size, scrapers):
+    web_scraper, _ = scrapers
+    articles = make_articles(size, today=datetime.now())
+    return (lambda: [article.copy() for article in articles],
+            lambda batch: web_scraper.filter_recent_content(batch, days=7, dedup_index=NearDuplicateIndex()))
+
+
+def _pairwise_title_dedup(articles, days=7):
+    """filter_recent_content before the MinHash index: date filter plus pairwise title-character Jaccard"""
+    for article in articles:
+        if isinstance(article['date'], str):
+            article['date'] = datetime.strptime(article['date'], '%Y-%m-%d')
+    cutoff_date = datetime.now() - timedelta(days=days)
+    unique_articles = []
+    seen_titles = set()
+    for article in articles:
+        if article['date'] < cutoff_date:
+            continue
+        simple_title = ''.join(c.lower() for c in article['title'] if c.isalnum())
+        if not any(
+            len(set(simple_title) & set(seen)) / len(set(simple_title) | set(seen)) > 0.8
+            for seen in seen_titles
+        ):
+            unique_articles.append(article)
+            seen_titles.add(simple_title)
+    return unique_articles
+
+
+def bench_filter_recent_content_pairwise(size, scrapers):
+    """Reference point for filter_recent_content: the quadratic dedup it replaced"""
+    articles = make_articles(size, today=datetime.now())
+    return (lambda: [article.copy() for article in articles], _pairwise_title_dedup)
+
+
+def bench_filter_recent_episodes(size, scrapers):
+    _, podcast_scraper = scrapers
+    episodes = make_episodes(size, today=datetime.now())
+    return (lambda: [episode.copy() for episode in episodes],
+            lambda batch: podcast_scraper.filter_recent_episodes(batch, days=30, dedup_index=NearDuplicateIndex()))
+
+
+def _long_texts(size, sentences, seed):
+    rng = random.Random(seed)
+    return [make_text(rng, sentences) for _ in range(size)]
+
+
+def bench_summarize_content(size, scrapers):
+    web_scraper, _ = scrapers
+    texts = _long_texts(size, 30, seed=11)
+    return (lambda: texts,
+            lambda batch: [web_scraper.summarize_content(text) for text in batch])
+
+
+def bench_podcast_summarize_text(size, scrapers):
+    _, podcast_scraper = scrapers
+    texts = _long_texts(size, 60, seed=13)
+    return (lambda: texts,
+            lambda batch: [podcast_scraper.summarize_text(text, num_sentences=5) for text in batch])
+
+
+def bench_article_extraction(size, scrapers):
+    """get_article_content minus the network: extraction over the fixture pages, cycled"""
+    web_scraper, _ = scrapers
+    pages = []
+    for filename, url in FIXTURES.items():
+        with open(os.path.join(FIXTURES_DIR, filename), 'r', encoding='utf-8') as f:
+            pages.append((f.read(), url))
+    batch = [pages[idx % len(pages)] for idx in range(size)]
+    return (lambda: batch,
+            lambda items: [web_scraper.extract_article_text(page, url) for page, url in items])
+
+
+def _enter_dir(directory: str = None):
+    """chdir into `directory` (a fresh temporary one if None); the scrapers use relative paths"""
+    previous = os.getcwd()
+    owned = directory is None
+    directory = directory or tempfile.mkdtemp(prefix='bench_')
+    os.chdir(directory)
+    return previous, (directory if owned else None)
+
+
+def _leave_dir(previous: str, owned_directory: str = None):
+    os.chdir(previous)
+    if owned_directory:
+        shutil.rmtree(owned_directory, ignore_errors=True)
+
+
+def _data_dir(articles, episodes=()) -> str:
+    """Temporary directory holding data/articles.json and data/podcasts.json, removed at exit"""
+    directory = tempfile.mkdtemp(prefix='bench_')
+    os.makedirs(os.path.join(directory, 'data'))
+    for filename, items in (('articles.json', articles), ('podcasts.json', list(episodes))):
+        with open(os.path.join(directory, 'data', filename), 'w') as f:
+            json.dump(items, f, indent=2)
+    atexit.register(shutil.rmtree, directory, True)
+    return directory
+
+
+def bench_json_save(size, scrapers):
+    """save_articles into an empty directory (snapshot plus root and data/ copies)"""
+    web_scraper, _ = scrapers
+    articles = make_articles(size)
+    return (lambda: (_enter_dir(), articles),
+            lambda state: web_scraper.save_articles(state[1], 'articles.json'),
+            lambda state: _leave_dir(*state[0]))
+
+
+def bench_json_load(size, scrapers):
+    web_scraper, _ = scrapers
+    directory = _data_dir(make_articles(size))
+    return (lambda: _enter_dir(directory),
+            lambda _: web_scraper.load_articles('articles.json'),
+            lambda state: _leave_dir(*state))
+
+
+def _template_env():
+    return register_template_helpers(Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=select_autoescape(['html'])
+    ))
+
+
+def bench_dashboard_render(size, scrapers):
+    """Dashboard model build (load, sort, categorize, API indexes) plus the template render"""
+    web_scraper, podcast_scraper = scrapers
+    template = _template_env().get_template('dashboard.html')
+    directory = _data_dir(make_articles(size), make_episodes(max(1, size // 10)))
+    now = datetime.now()
+
+    def render(_):
+        model = build_model(web_scraper, podcast_scraper)
+        return template.render(articles=model['articles'], podcasts=model['podcasts'],
+                               last_updated=now.strftime("%Y-%m-%d %H:%M:%S (PST)"), now=now)
+    return (lambda: _enter_dir(directory), render, lambda state: _leave_dir(*state))
+
+
+def bench_listing_render(size, scrapers):
+    """Category/archive page with every item rendered as a card"""
+    env = _template_env()
+    template = env.get_template('listing.html')
+    articles = default_categorizer.categorize_articles(make_articles(size))
+    now = datetime.now()
+    return (lambda: None,
+            lambda _: template.render(page_title='Archive', articles=articles, podcasts=[], root='../',
+                                      site_nav=True, last_updated=now.strftime("%Y-%m-%d %H:%M:%S (PST)"), now=now))
+
+
+# name -> (benchmark, largest size it runs at)
+BENCHMARKS = {
+    'categorize_articles': (bench_categorize_articles, 100000),
+    'filter_recent_content': (bench_filter_recent_content, 10000),
+    'filter_recent_content_pairwise': (bench_filter_recent_content_pairwise, 1000),
+    'filter_recent_episodes': (bench_filter_recent_episodes, 10000),
+    'summarize_content': (bench_summarize_content, 1000),
+    'podcast_summarize_text': (bench_podcast_summarize_text, 1000),
+    'article_extraction': (bench_article_extraction, 1000),
+    'json_save': (bench_json_save, 100000),
+    'json_load': (bench_json_load, 100000),
+    'dashboard_render': (bench_dashboard_render, 100000),
+    'listing_render': (bench_listing_render, 10000),
+}
+
+
+def time_case(repeat: int, prepare, run, cleanup=None) -> list:
+    timings = []
+    for _ in range(repeat):
+        state = prepare()
+        # The scrapers log progress with print; keep it out of the report
+        try:
+            with redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                run(state)
+                timings.append(time.perf_counter() - start)
+        finally:
+            if cleanup is not None:
+                cleanup(state)
+    return timings
+
+
+def git_revision() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    status = git('status', '--porcelain', '--untracked-files=no')
+    return {'commit': git('rev-parse', '--short', 'HEAD') or 'unknown', 'dirty': bool(status)}
+
+
+def run_suite(sizes, names, repeat: int) -> dict:
+    scrapers = make_scrapers()
+    results = []
+    for name in names:
+        benchmark, max_size = BENCHMARKS[name]
+        for size in sizes:
+            if size > max_size:
+                continue
+            timings = time_case(repeat, *benchmark(size, scrapers))
+            best = min(timings)
+            results.append({
+                'benchmark': name,
+                'size': size,
+                'repeat': repeat,
+                'best_s': round(best, 6),
+                'mean_s': round(sum(timings) / len(timings), 6),
+                'per_item_us': round(best / size * 1e6, 3)
+            })
+            print(f"{name:<30} {size:>7}  best {best * 1000:>10.2f} ms  {best / size * 1e6:>10.2f} us/item",
+                  file=sys.stderr)
+    return {
+        **git_revision(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+
+
+def compare(baseline: dict, current: dict):
+    """Print current/baseline time ratios for the benchmarks both runs have"""
+    previous = {(r['benchmark'], r['size']): r for r in baseline['results']}
+    print(f"{'benchmark':<30} {'size':>7} {baseline['commit']:>12} {current['commit']:>12} {'ratio':>7}")
+    for result in current['results']:
+        old = previous.get((result['benchmark'], result['size']))
+        if old is None:
+            continue
+        ratio = result['best_s'] / old['best_s'] if old['best_s'] else float('inf')
+        flag = '  slower' if ratio > 1.1 else '  faster' if ratio < 0.9 else ''
+        print(f"{result['benchmark']:<30} {result['size']:>7} {old['best_s'] * 1000:>10.2f}ms "
+              f"{result['best_s'] * 1000:>10.2f}ms {ratio:>6.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated corpus sizes")
+    parser.add_argument('--only', help="Comma-separated benchmark names (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per case (best is reported)")
+    parser.add_argument('--output', help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', help="Earlier results file to compare against")
+    parser.add_argument('--list', action='store_true', help="List benchmark names and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (_, max_size) in BENCHMARKS.items():
+            print(f"{name:<30} up to {max_size} items")
+        return
+
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+    sizes = sorted(int(size) for size in args.sizes.split(','))
+
+    report = run_suite(sizes, names, args.repeat)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{report['commit']}{'-dirty' if report['dirty'] else ''}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
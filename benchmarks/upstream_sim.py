@@ -0,0 +1,324 @@
+"""
+Local stand-in for the upstream news sites and podcast feed.
+
+Serves synthetic Canary Media and Utility Dive sites (RSS feed, HTML listing and
+article pages using each site's real selectors) and a podcast RSS feed with
+small WAV enclosures, each site on its own port. Latency, errors and volume are
+configurable, and everything is deterministic for a given seed.
+
+Run from the repository root, then export the printed variables before
+starting the app or `python main.py --run-once`:
+    python -m benchmarks.upstream_sim [--articles 5000] [--latency-ms 50] [--error-rate 0.01]
+"""
+
+import argparse
+import hashlib
+import io
+import random
+import threading
+import time
+import wave
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from benchmarks.corpus import make_sentence, make_text
+
+# Page markup per site: listing item wrapper and article content container match
+# news_sources.py and WebScraper.site_selectors
+SITES = {
+    'canary': {
+        'env': 'CANARY_MEDIA_BASE_URL',
+        'feed_path': '/rss.rss',
+        'item': '<article><time datetime="{date}">{date}</time><h2>{title}</h2><a href="{path}">Read</a></article>',
+        'content_class': 'article-content',
+        'exclude_class': 'newsletter-signup'
+    },
+    'utilitydive': {
+        'env': 'UTILITY_DIVE_BASE_URL',
+        'feed_path': '/feeds/news/',
+        'item': '<div class="feed__item"><span class="date">{date}</span><h3>{title}</h3><a href="{path}">Read</a></div>',
+        'content_class': 'article-body',
+        'exclude_class': 'advertisement'
+    }
+}
+
+
+class SimulatorConfig:
+    """Volume, latency and failure knobs shared by all simulated sites"""
+    def __init__(self, articles: int = 200, episodes: int = 20, days: int = 5, paragraphs: int = 12,
+                 latency_ms: float = 0, jitter_ms: float = 0, slow_fraction: float = 0, slow_ms: float = 2000,
+                 error_rate: float = 0, audio_seconds: float = 1, no_feeds: bool = False, seed: int = 1):
+        self.articles = articles  # per news site
+        self.episodes = episodes
+        self.days = days  # publish dates spread over this many days before now
+        self.paragraphs = paragraphs
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.slow_fraction = slow_fraction  # share of requests delayed by slow_ms (tail latency)
+        self.slow_ms = slow_ms
+        self.error_rate = error_rate  # share of requests answered with a 503
+        self.audio_seconds = audio_seconds
+        self.no_feeds = no_feeds  # feeds return 404 so the HTML listing fallback is exercised
+        self.seed = seed
+
+
+def make_wav(seconds: float, sample_rate: int = 16000) -> bytes:
+    """A mono 16-bit WAV of a quiet 440 Hz square wave"""
+    frames = bytearray()
+    period = sample_rate // 440
+    for idx in range(int(seconds * sample_rate)):
+        frames += (1000 if idx % period < period // 2 else -1000).to_bytes(2, 'little', signed=True)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+class SiteContent:
+    """Deterministic articles (or episodes) for one simulated site"""
+    def __init__(self, name: str, count: int, config: SimulatorConfig, now: datetime):
+        rng = random.Random(f"{config.seed}:{name}")
+        span = max(1, config.days) * 86400
+        self.items = []
+        for idx in range(count):
+            published = now - timedelta(seconds=span * idx / max(1, count))
+            self.items.append({
+                'id': idx,
+                'title': f"{make_sentence(rng, 5, 10).rstrip('.')} ({name} {idx})",
+                'published': published,
+                'seed': rng.random()
+            })
+        self.last_modified = now
+
+
+class SimulatorStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.errors = 0
+        self.not_modified = 0
+
+    def record(self, site: str, status: int):
+        with self._lock:
+            self.requests[site] = self.requests.get(site, 0) + 1
+            self.errors += status >= 500
+            self.not_modified += status == 304
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            return {'requests': dict(self.requests), 'errors': self.errors, 'not_modified': self.not_modified}
+
+
+def make_handler(site: str, content: SiteContent, config: SimulatorConfig, stats: SimulatorStats,
+                 audio: Optional[bytes] = None):
+    rng = random.Random(f"{config.seed}:{site}:requests")
+    rng_lock = threading.Lock()
+    layout = SITES.get(site)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: bytes = b'', content_type: str = 'text/html; charset=utf-8',
+                  validators: bool = False):
+            self.send_response(status)
+            if status != 304:
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+            if validators:
+                self.send_header('ETag', self._etag)
+                self.send_header('Last-Modified', format_datetime(content.last_modified, usegmt=True))
+            self.end_headers()
+            if status != 304:
+                self.wfile.write(body)
+            stats.record(site, status)
+
+        def do_GET(self):
+            with rng_lock:
+                delay = config.latency_ms + rng.uniform(0, config.jitter_ms)
+                if rng.random() < config.slow_fraction:
+                    delay += config.slow_ms
+                fail = rng.random() < config.error_rate
+            if delay:
+                time.sleep(delay / 1000)
+            if fail:
+                return self._send(503, b'Service Unavailable', 'text/plain')
+
+            path = self.path.split('?')[0]
+            self._etag = '"%s"' % hashlib.sha1(f"{site}:{path}:{content.last_modified}".encode()).hexdigest()[:16]
+            # Every page is static for the simulator's lifetime, so validators always match
+            if self.headers.get('If-None-Match') == self._etag:
+                return self._send(304, validators=True)
+            if_modified_since = self.headers.get('If-Modified-Since')
+            if if_modified_since and not self.headers.get('If-None-Match'):
+                try:
+                    if parsedate_to_datetime(if_modified_since) >= content.last_modified.replace(microsecond=0):
+                        return self._send(304, validators=True)
+                except (TypeError, ValueError):
+                    pass
+
+            if site == 'podcast':
+                return self._podcast(path)
+            if path == layout['feed_path'] and not config.no_feeds:
+                return self._send(200, self._feed(), 'application/rss+xml; charset=utf-8', validators=True)
+            if path == '/':
+                return self._send(200, self._listing(), validators=True)
+            if path.startswith('/articles/'):
+                item = self._item(path)
+                if item is not None:
+                    return self._send(200, self._article(item), validators=True)
+            return self._send(404, b'Not Found', 'text/plain')
+
+        def _item(self, path: str) -> Optional[Dict]:
+            try:
+                idx = int(path.rstrip('/').rsplit('-', 1)[-1].split('.')[0])
+            except ValueError:
+                return None
+            return content.items[idx] if 0 <= idx < len(content.items) else None
+
+        def _base(self) -> str:
+            return f"http://{self.headers.get('Host')}"
+
+        def _feed(self) -> bytes:
+            entries = ''.join(
+                f"<item><title>{escape(item['title'])}</title>"
+                f"<link>{self._base()}/articles/story-{item['id']}</link>"
+                f"<guid isPermaLink=\"false\">{site}-{item['id']}</guid>"
+                f"<pubDate>{format_datetime(item['published'], usegmt=True)}</pubDate></item>"
+                for item in content.items
+            )
+            return (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+                    f'<title>{site}</title><link>{self._base()}/</link>{entries}</channel></rss>').encode('utf-8')
+
+        def _listing(self) -> bytes:
+            items = ''.join(
+                layout['item'].format(date=item['published'].strftime('%Y-%m-%d'), title=escape(item['title']),
+                                      path=f"/articles/story-{item['id']}")
+                for item in content.items
+            )
+            return f'<!DOCTYPE html><html><body><header><nav>Menu</nav></header><main>{items}</main></body></html>'.encode('utf-8')
+
+        def _article(self, item: Dict) -> bytes:
+            rng_item = random.Random(item['seed'])
+            paragraphs = ''.join(f"<p>{make_text(rng_item, 4)}</p>" for _ in range(config.paragraphs))
+            return (f"<!DOCTYPE html><html><head><title>{escape(item['title'])}</title>"
+                    f"<script>var tracking = true;</script></head><body><header><nav>Menu</nav></header>"
+                    f"<main><article><h1>{escape(item['title'])}</h1>"
+                    f"<div class=\"{layout['content_class']}\">{paragraphs}"
+                    f"<div class=\"{layout['exclude_class']}\"><p>{make_text(rng_item, 2)}</p></div></div>"
+                    f"</article></main><footer>Footer</footer></body></html>").encode('utf-8')
+
+        def _podcast(self, path: str):
+            if path.startswith('/audio/'):
+                return self._send(200, audio, 'audio/wav', validators=True)
+            if path not in ('/', '/catalyst'):
+                return self._send(404, b'Not Found', 'text/plain')
+            entries = ''.join(
+                f"<item><title>{escape(item['title'])}</title>"
+                f"<link>{self._base()}/episodes/{item['id']}</link>"
+                f"<guid isPermaLink=\"false\">episode-{item['id']}</guid>"
+                f"<description>{escape(make_text(random.Random(item['seed']), 4))}</description>"
+                f"<pubDate>{format_datetime(item['published'], usegmt=True)}</pubDate>"
+                f"<itunes:duration>0:01</itunes:duration>"
+                f"<enclosure url=\"{self._base()}/audio/{item['id']}.wav\" length=\"{len(audio)}\" type=\"audio/wav\"/>"
+                f"</item>"
+                for item in content.items
+            )
+            body = (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0" '
+                    f'xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"><channel>'
+                    f'<title>Simulated Podcast</title>{entries}</channel></rss>').encode('utf-8')
+            return self._send(200, body, 'application/rss+xml; charset=utf-8', validators=True)
+
+    return Handler
+
+
+class UpstreamSimulator:
+    """Runs one threaded HTTP server per simulated site on 127.0.0.1"""
+    def __init__(self, config: SimulatorConfig = None, host: str = '127.0.0.1'):
+        self.config = config or SimulatorConfig()
+        self.host = host
+        self.stats = SimulatorStats()
+        self.servers = {}
+        self._threads = []
+
+    def start(self) -> Dict[str, str]:
+        """Start the servers and return the environment variables pointing the scrapers at them"""
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        audio = make_wav(self.config.audio_seconds)
+        for site in list(SITES) + ['podcast']:
+            count = self.config.episodes if site == 'podcast' else self.config.articles
+            content = SiteContent(site, count, self.config, now)
+            handler = make_handler(site, content, self.config, self.stats, audio)
+            server = ThreadingHTTPServer((self.host, 0), handler)
+            server.daemon_threads = True
+            thread = threading.Thread(target=server.serve_forever, name=f'upstream-{site}', daemon=True)
+            thread.start()
+            self.servers[site] = server
+            self._threads.append(thread)
+        return self.environment()
+
+    def base_url(self, site: str) -> str:
+        return f"http://{self.host}:{self.servers[site].server_port}"
+
+    def environment(self) -> Dict[str, str]:
+        env = {layout['env']: self.base_url(site) for site, layout in SITES.items()}
+        env['PODCAST_RSS_URL'] = f"{self.base_url('podcast')}/catalyst"
+        return env
+
+    def stop(self):
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--articles', type=int, default=200, help="Articles per news site")
+    parser.add_argument('--episodes', type=int, default=20, help="Podcast episodes in the feed")
+    parser.add_argument('--days', type=int, default=5, help="Publish dates spread over this many days")
+    parser.add_argument('--latency-ms', type=float, default=0, help="Base latency added to every response")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="Extra random latency, uniform up to this")
+    parser.add_argument('--slow-fraction', type=float, default=0, help="Share of responses delayed by --slow-ms")
+    parser.add_argument('--slow-ms', type=float, default=2000, help="Delay of the slow responses")
+    parser.add_argument('--error-rate', type=float, default=0, help="Share of responses that are 503 errors")
+    parser.add_argument('--no-feeds', action='store_true', help="Serve no RSS feeds (HTML listing fallback)")
+    parser.add_argument('--seed', type=int, default=1)
+
+
+def config_from_args(args) -> SimulatorConfig:
+    return SimulatorConfig(
+        articles=args.articles, episodes=args.episodes, days=args.days,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        slow_fraction=args.slow_fraction, slow_ms=args.slow_ms,
+        error_rate=args.error_rate, no_feeds=args.no_feeds, seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    simulator = UpstreamSimulator(config_from_args(args))
+    for name, value in simulator.start().items():
+        print(f"export {name}={value}")
+    print("# Ctrl+C to stop", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        simulator.stop()
+        print(simulator.stats.as_dict())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+import re
+from typing import Dict, Iterable, List
+
+# Keywords that assign an article to each dashboard category
+CATEGORY_KEYWORDS = {
+    'policy': [
+        'policy', 'regulation', 'law', 'bill', 'legislation', 'government',
+        'epa', 'regulatory', 'compliance', 'mandate', 'tax', 'incentive', 'subsidy',
+        'administration', 'congress', 'senate', 'house', 'department', 'agency',
+        'IRA', 'inflation reduction act', 'DOE', 'FERC'
+    ],
+    'innovation': [
+        'innovation', 'technology', 'research', 'development', 'breakthrough',
+        'prototype', 'invention', 'startup', 'efficiency', 'advanced', 'novel',
+        'solution', 'discovery', 'cutting-edge', 'emerging', 'battery', 'storage',
+        'inverter', 'grid', 'smart', 'digital', 'AI', 'artificial intelligence'
+    ],
+    'business': [
+        'investment', 'merger', 'acquisition', 'funding', 'IPO', 'capital',
+        'market', 'stock', 'shares', 'venture', 'profit', 'revenue', 'cost',
+        'price', 'company', 'corporation', 'industry', 'commercial', 'economics',
+        'billion', 'million', 'financial', 'CEO', 'executive', 'board'
+    ],
+    'climate': [
+        'climate', 'emissions', 'carbon', 'pollution', 'global warming', 'greenhouse',
+        'renewable', 'clean energy', 'sustainable', 'sustainability', 'environment',
+        'net-zero', 'decarbonization', 'methane', 'fossil fuel', 'coal', 'natural gas',
+        'conservation', 'biodiversity', 'ecosystem'
+    ]
+}
+
+# Categories assigned when no keyword matches
+DEFAULT_CATEGORIES = ['innovation', 'business']
+
+
+# Lowercase alphanumeric runs; punctuation and hyphens are word boundaries
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Translation table turning ASCII punctuation into spaces so str.split tokenizes
+# in C rather than through the regex engine
+PUNCTUATION_TO_SPACE = str.maketrans({
+    **{chr(code): ' ' for code in range(128) if not chr(code).isalnum()},
+    **{ch: ' ' for ch in '\u2018\u2019\u201c\u201d\u2013\u2014\u2026\u00a0'}
+})
+
+
+class KeywordCategorizer:
+    """Single-pass keyword matcher compiled once from a category keyword table"""
+    def __init__(self, category_keywords: Dict[str, List[str]] = None):
+        self.category_keywords = category_keywords or CATEGORY_KEYWORDS
+        self.categories = list(self.category_keywords)
+
+        # Map each lowercased keyword to the categories it counts towards
+        self.keyword_categories = {}
+        for category, keywords in self.category_keywords.items():
+            for keyword in keywords:
+                self.keyword_categories.setdefault(keyword.lower(), []).append(category)
+        self.category_order = {category: idx for idx, category in enumerate(self.categories)}
+
+        # Single-word keywords are matched by a set intersection over the text's
+        # tokens, which respects word boundaries ("law" no longer matches "lawn").
+        # Plural forms map back to their keyword since the old substring scan
+        # matched "markets" and "investments". Acronyms (written in capitals in the
+        # table) are not pluralized: "DOE" + "s" would turn "does" into a match.
+        self.word_lookup = {}
+        # Multi-word and hyphenated keywords are matched as token sequences,
+        # only checked when their first token occurs in the text
+        self.phrases = {}
+        acronyms = {keyword.lower() for keywords in self.category_keywords.values()
+                    for keyword in keywords if keyword.isupper()}
+        for keyword in self.keyword_categories:
+            tokens = TOKEN_RE.findall(keyword)
+            if len(tokens) == 1:
+                forms = (tokens[0],) if keyword in acronyms else (tokens[0], tokens[0] + 's', tokens[0] + 'es')
+                for form in forms:
+                    self.word_lookup.setdefault(form, keyword)
+            else:
+                joined = ' '.join(tokens)
+                self.phrases.setdefault(tokens[0], []).append(
+                    (keyword, (f' {joined} ', f' {joined}s '))
+                )
+        self.word_keys = frozenset(self.word_lookup)
+        self.phrase_starts = frozenset(self.phrases)
+
+    def matched_keywords(self, text: str) -> set:
+        """Distinct keywords that occur in the text as whole words"""
+        tokens = text.lower().translate(PUNCTUATION_TO_SPACE).split()
+        matched = {self.word_lookup[token] for token in self.word_keys.intersection(tokens)}
+
+        starts = self.phrase_starts.intersection(tokens)
+        if starts:
+            padded = ' ' + ' '.join(tokens) + ' '
+            for start in starts:
+                for keyword, forms in self.phrases[start]:
+                    if any(form in padded for form in forms):
+                        matched.add(keyword)
+        return matched
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Count distinct keyword hits per category in one pass over the text"""
+        counts = dict.fromkeys(self.categories, 0)
+        for keyword in self.matched_keywords(text):
+            for category in self.keyword_categories[keyword]:
+                counts[category] += 1
+        return counts
+
+    def count_batch(self, texts: Iterable[str]) -> List[Dict[str, int]]:
+        """Per-category hit counts for a whole batch of texts"""
+        return [self.count(text) for text in texts]
+
+    def assign(self, text: str) -> List[str]:
+        """Categories with at least one keyword hit, or the defaults"""
+        assigned = set()
+        for keyword in self.matched_keywords(text):
+            assigned.update(self.keyword_categories[keyword])
+        if not assigned:
+            return list(DEFAULT_CATEGORIES)
+        return sorted(assigned, key=self.category_order.__getitem__)
+
+    def categorize_articles(self, articles: List[Dict]) -> List[Dict]:
+        """Set the comma-separated 'categories' field on each article"""
+        for article in articles:
+            # Combine title and summary text for categorization
+            text = article.get('title', '') + ' ' + article.get('summary', '')
+            article['categories'] = ','.join(self.assign(text))
+        return articles
+
+
+# Shared instance so the keyword table is compiled once per process
+default_categorizer = KeywordCategorizer()
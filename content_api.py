@@ -0,0 +1,113 @@
+import base64
+import json
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+class QueryError(ValueError):
+    """Invalid query parameter; reported to the client as a 400"""
+
+
+def encode_cursor(sort_key: Tuple[str, str]) -> str:
+    """Opaque cursor for the position after an item with this (date, id) sort key"""
+    return base64.urlsafe_b64encode(json.dumps(list(sort_key)).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        date, item_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return str(date), str(item_id)
+    except Exception:
+        raise QueryError("Invalid cursor")
+
+
+def parse_date(value: Optional[str], name: str) -> Optional[str]:
+    if value is None or value == '':
+        return None
+    if not DATE_RE.match(value):
+        raise QueryError(f"'{name}' must be a YYYY-MM-DD date")
+    return value
+
+
+def parse_limit(value: Optional[str]) -> int:
+    if value is None or value == '':
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise QueryError("'limit' must be an integer")
+    if limit < 1:
+        raise QueryError("'limit' must be at least 1")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """Requested field names, or None for the default field set"""
+    if not value:
+        return None
+    return [field.strip() for field in value.split(',') if field.strip()]
+
+
+def item_categories(item: Dict) -> List[str]:
+    return [c.strip() for c in (item.get('categories') or '').replace('\n', ',').split(',') if c.strip()]
+
+
+class ContentIndex:
+    """Items sorted newest first by (date, id) so cursors stay valid when data changes"""
+    def __init__(self, items: List[Dict], date_field: str, id_field: str):
+        self.date_field = date_field
+        self.id_field = id_field
+        self.items = sorted(items, key=self.sort_key, reverse=True)
+
+    def sort_key(self, item: Dict) -> Tuple[str, str]:
+        return (item.get(self.date_field) or '', item.get(self.id_field) or item.get('title') or '')
+
+    def _start_after(self, cursor_key: Tuple[str, str]) -> int:
+        """Index of the first item strictly older than the cursor (binary search on the descending keys)"""
+        low, high = 0, len(self.items)
+        while low < high:
+            middle = (low + high) // 2
+            if self.sort_key(self.items[middle]) < cursor_key:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def page(self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+             predicate: Callable[[Dict], bool] = None, since: str = None, until: str = None) -> Tuple[List[Dict], Optional[str]]:
+        """One page of matching items and the cursor of the next page (None on the last page)"""
+        start = self._start_after(decode_cursor(cursor)) if cursor else 0
+        if until:
+            # Skip straight past everything newer than the range
+            start = max(start, self._start_after((until, '\uffff')))
+        page = []
+        for item in self.items[start:]:
+            date = item.get(self.date_field) or ''
+            if since and date < since:
+                break  # Sorted newest first: nothing further can match
+            if predicate is None or predicate(item):
+                if len(page) == limit:
+                    return page, encode_cursor(self.sort_key(page[-1]))
+                page.append(item)
+        return page, None
+
+
+def select_fields(item: Dict, fields: Optional[List[str]], default_exclude=(),
+                  loaders: Dict[str, Callable[[Dict], object]] = None) -> Dict:
+    """Project an item onto the requested fields; `loaders` supply fields stored elsewhere"""
+    loaders = loaders or {}
+    if fields is None:
+        return {key: value for key, value in item.items() if key not in default_exclude}
+    selected = {}
+    for field in fields:
+        if field in loaders:
+            selected[field] = loaders[field](item)
+        elif field in item:
+            selected[field] = item[field]
+    return selected
+
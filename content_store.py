@@ -0,0 +1,291 @@
+import json
+import os
+import sqlite3
+import threading
+import traceback
+from contextlib import closing, contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from site_templates import category_list
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    key TEXT PRIMARY KEY,
+    title TEXT,
+    date TEXT,
+    source TEXT,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_date ON articles (date);
+CREATE INDEX IF NOT EXISTS idx_articles_source_date ON articles (source, date);
+
+CREATE TABLE IF NOT EXISTS article_categories (
+    key TEXT NOT NULL REFERENCES articles (key) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    date TEXT,
+    PRIMARY KEY (key, category)
+);
+CREATE INDEX IF NOT EXISTS idx_article_categories_category_date ON article_categories (category, date);
+
+CREATE TABLE IF NOT EXISTS episodes (
+    key TEXT PRIMARY KEY,
+    title TEXT,
+    release_date TEXT,
+    source TEXT,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_episodes_release_date ON episodes (release_date);
+CREATE INDEX IF NOT EXISTS idx_episodes_source_date ON episodes (source, release_date);
+"""
+
+
+def storage_backend() -> str:
+    """Configured storage backend: 'json' (default) or 'sqlite'"""
+    return os.getenv('STORAGE_BACKEND', 'json').strip().lower()
+
+
+def _serializable(item: Dict) -> Dict:
+    """Copy of an article/episode with datetimes turned into strings"""
+    item = item.copy()
+    for field in ('date', 'release_date'):
+        if isinstance(item.get(field), datetime):
+            item[field] = item[field].strftime('%Y-%m-%d')
+    if isinstance(item.get('timestamp'), datetime):
+        item['timestamp'] = item['timestamp'].isoformat()
+    return item
+
+
+def _split_categories(categories) -> List[str]:
+    # Same parsing as the templates, so category pages list the same articles in both backends
+    return sorted(set(category_list(categories)))
+
+
+def days_ago(days: int) -> str:
+    """Date string (YYYY-MM-DD) `days` days before today, for `since` filters"""
+    return (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+
+
+class ContentStore:
+    """SQLite store of articles and podcast episodes with upserts and indexed queries"""
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv('CONTENT_DB_PATH', os.path.join('data', 'content.db'))
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        """Connection for one transaction; commits on success, rolls back on error"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with closing(sqlite3.connect(self.path, timeout=30)) as connection:
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA foreign_keys = ON')
+            if not self._initialized:
+                with self._lock:
+                    connection.executescript(SCHEMA)
+                    self._initialized = True
+            with connection:
+                yield connection
+
+    def upsert_articles(self, articles: Iterable[Dict], key: Callable[[Dict], str] = None) -> int:
+        """Insert or update articles keyed by (normalized) link in one transaction"""
+        key = key or (lambda article: article['link'])
+        now = datetime.now().isoformat()
+        count = 0
+        with self._connect() as connection:
+            for article in articles:
+                article = _serializable(article)
+                article_key = key(article)
+                connection.execute(
+                    """INSERT INTO articles (key, title, date, source, data, updated_at)
+                       VALUES (?, ?, ?, ?, ?, ?)
+                       ON CONFLICT (key) DO UPDATE SET title = excluded.title, date = excluded.date,
+                           source = excluded.source, data = excluded.data, updated_at = excluded.updated_at""",
+                    (article_key, article.get('title'), article.get('date'), article.get('source'),
+                     json.dumps(article), now)
+                )
+                connection.execute('DELETE FROM article_categories WHERE key = ?', (article_key,))
+                connection.executemany(
+                    'INSERT INTO article_categories (key, category, date) VALUES (?, ?, ?)',
+                    [(article_key, category, article.get('date')) for category in _split_categories(article.get('categories'))]
+                )
+                count += 1
+        return count
+
+    def upsert_episodes(self, episodes: Iterable[Dict]) -> int:
+        """Insert or update podcast episodes keyed by page URL (or GUID) in one transaction"""
+        now = datetime.now().isoformat()
+        rows = []
+        for episode in episodes:
+            episode = _serializable(episode)
+            # Episodes saved before GUIDs were recorded only have a URL, so it is the stable key
+            episode_key = episode.get('url') or episode.get('guid') or episode.get('title')
+            rows.append((episode_key, episode.get('title'), episode.get('release_date'), episode.get('source'),
+                         json.dumps(episode), now))
+        with self._connect() as connection:
+            connection.executemany(
+                """INSERT INTO episodes (key, title, release_date, source, data, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (key) DO UPDATE SET title = excluded.title, release_date = excluded.release_date,
+                       source = excluded.source, data = excluded.data, updated_at = excluded.updated_at""",
+                rows
+            )
+        return len(rows)
+
+    def _query(self, sql: str, params: tuple) -> List[Dict]:
+        with self._connect() as connection:
+            return [json.loads(row['data']) for row in connection.execute(sql, params)]
+
+    def latest_articles(self, limit: int = None, source: str = None, since: str = None) -> List[Dict]:
+        """Newest articles first, optionally from one source and dated on or after `since`"""
+        sql = 'SELECT data FROM articles WHERE 1 = 1'
+        params = []
+        if source:
+            sql += ' AND source = ?'
+            params.append(source)
+        if since:
+            sql += ' AND date >= ?'
+            params.append(since)
+        sql += ' ORDER BY date DESC, updated_at DESC, key LIMIT ?'
+        params.append(-1 if limit is None else limit)
+        return self._query(sql, tuple(params))
+
+    def articles_in_category(self, category: str, limit: int = None, since: str = None) -> List[Dict]:
+        """Newest articles tagged with a category"""
+        sql = """SELECT a.data FROM article_categories c JOIN articles a ON a.key = c.key
+                 WHERE c.category = ?"""
+        params = [category]
+        if since:
+            sql += ' AND c.date >= ?'
+            params.append(since)
+        sql += ' ORDER BY c.date DESC, a.updated_at DESC, a.key LIMIT ?'
+        params.append(-1 if limit is None else limit)
+        return self._query(sql, tuple(params))
+
+    def articles_between(self, start: str, end: str) -> List[Dict]:
+        """Articles dated within [start, end] (YYYY-MM-DD), newest first"""
+        return self._query(
+            'SELECT data FROM articles WHERE date BETWEEN ? AND ? ORDER BY date DESC, updated_at DESC, key',
+            (start, end)
+        )
+
+    def latest_episodes(self, limit: int = None, source: str = None, since: str = None) -> List[Dict]:
+        """Newest podcast episodes first, optionally from one source and released on or after `since`"""
+        sql = 'SELECT data FROM episodes WHERE 1 = 1'
+        params = []
+        if source:
+            sql += ' AND source = ?'
+            params.append(source)
+        if since:
+            sql += ' AND release_date >= ?'
+            params.append(since)
+        sql += ' ORDER BY release_date DESC, updated_at DESC, key LIMIT ?'
+        params.append(-1 if limit is None else limit)
+        return self._query(sql, tuple(params))
+
+    def episodes_between(self, start: str, end: str) -> List[Dict]:
+        """Episodes released within [start, end] (YYYY-MM-DD), newest first"""
+        return self._query(
+            'SELECT data FROM episodes WHERE release_date BETWEEN ? AND ? ORDER BY release_date DESC, updated_at DESC, key',
+            (start, end)
+        )
+
+    def count(self, table: str) -> int:
+        """Number of rows in 'articles' or 'episodes'"""
+        if table not in ('articles', 'episodes'):
+            raise ValueError(f"Unknown table: {table}")
+        with self._connect() as connection:
+            return connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+
+
+class ContentCollection:
+    """Load and save one kind of content ('articles' or 'episodes') in the configured backend
+
+    With a ContentStore, saves are upserts and loads return the store's recent window (seeded
+    from the JSON file on first use). Otherwise saves publish a snapshot generation and loads
+    read the current snapshot, then the root and data/ copies.
+    """
+    def __init__(self, kind: str, content_store: Optional[ContentStore], snapshots, metrics, label: str,
+                 days_env: str, default_days: int, key: Callable[[Dict], str] = None):
+        if kind not in ('articles', 'episodes'):
+            raise ValueError(f"Unknown content kind: {kind}")
+        self.kind = kind
+        self.content_store = content_store
+        self.snapshots = snapshots
+        self.metrics = metrics
+        self.label = label
+        self.days_env = days_env
+        self.default_days = default_days
+        self.key = key
+
+    def _upsert(self, items: List[Dict]) -> int:
+        if self.kind == 'articles':
+            return self.content_store.upsert_articles(items, key=self.key)
+        return self.content_store.upsert_episodes(items)
+
+    def save(self, items: List[Dict], filename: str) -> bool:
+        """Upsert items into the store, or publish them as `filename`; False if that failed"""
+        try:
+            with self.metrics.stage('save', self.label):
+                if self.content_store is not None:
+                    count = self._upsert(items)
+                    print(f"Successfully upserted {count} {self.kind} into {self.content_store.path}")
+                    return True
+
+                # Publish a new snapshot generation (queued until the end of a snapshots.batch());
+                # readers switch over atomically, and the root and data/ copies are refreshed with it
+                generation = self.snapshots.publish({filename: [_serializable(item) for item in items]})
+
+                published = f" (generation {generation})" if generation else " (publish pending)"
+                print(f"Successfully saved {len(items)} {self.kind} to {filename}{published}")
+                return True
+        except Exception as e:
+            print(f"Error saving {self.kind}: {str(e)}")
+            traceback.print_exc()
+            return False
+
+    def load(self, filename: str) -> List[Dict]:
+        """Items from the store's recent window (newest first), the current snapshot or the JSON file"""
+        try:
+            if self.content_store is not None:
+                if self.content_store.count(self.kind) == 0:
+                    self._import_json(filename)
+                since = days_ago(int(os.getenv(self.days_env, str(self.default_days))))
+                if self.kind == 'articles':
+                    return self.content_store.latest_articles(since=since)
+                return self.content_store.latest_episodes(since=since)
+
+            # Prefer the current snapshot, then the root and data directory copies
+            items = self.snapshots.load(filename)
+            if items is not None:
+                return items
+
+            try:
+                with open(filename, 'r') as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                with open(os.path.join('data', filename), 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Error loading {self.kind}: {str(e)}")
+            traceback.print_exc()
+            return []
+
+    def _import_json(self, filename: str):
+        """Seed an empty store from an existing JSON file"""
+        for path in (filename, os.path.join('data', filename)):
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    items = json.load(f)
+                count = self._upsert(items)
+                print(f"Imported {count} {self.kind} from {path} into {self.content_store.path}")
+                return
+
+
+def open_content_store() -> Optional[ContentStore]:
+    """The SQLite store when STORAGE_BACKEND=sqlite, otherwise None (JSON files)"""
+    if storage_backend() == 'sqlite':
+        return ContentStore()
+    return None
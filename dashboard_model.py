@@ -0,0 +1,161 @@
+import hashlib
+import os
+import threading
+import traceback
+from typing import Callable, Dict, List, Optional, Tuple
+
+from categorizer import default_categorizer
+from content_api import ContentIndex
+from metrics import default_metrics
+
+
+def build_model(web_scraper, podcast_scraper) -> Dict:
+    """Load, sort and categorize content into the dashboard view model (no app state needed)"""
+    # Both files come from the same snapshot generation even if an update publishes meanwhile
+    with web_scraper.snapshots.pinned():
+        articles = web_scraper.load_articles('articles.json')
+        podcasts = podcast_scraper.load_episodes('podcasts.json')
+    
+    # Sort content by date (ISO dates sort correctly as strings); the SQLite store already returns newest first
+    if web_scraper.content_store is None:
+        articles.sort(key=lambda x: x.get('date', ''), reverse=True)
+        podcasts.sort(key=lambda x: x.get('release_date', ''), reverse=True)
+    
+    # Ensure articles have categories
+    with default_metrics.stage('categorization'):
+        articles = default_categorizer.categorize_articles(articles)
+    
+    # Keyset-paginated views for the JSON API
+    return {
+        'articles': articles,
+        'podcasts': podcasts,
+        'article_index': ContentIndex(articles, 'date', 'link'),
+        'episode_index': ContentIndex(podcasts, 'release_date', 'url')
+    }
+
+
+class DashboardModelCache:
+    """Cache the dashboard view model until the underlying data files change"""
+    def __init__(self, builder: Callable[[], Dict], filenames: List[str], data_dir: str = 'data',
+                 generation: Callable[[], Optional[int]] = None):
+        # builder loads, sorts and categorizes content into a render-ready dict
+        self.builder = builder
+        self.filenames = filenames
+        self.data_dir = data_dir
+        # Published snapshot generation; when available it replaces the file checks
+        self.generation = generation
+        self._lock = threading.Lock()
+        # (signature, model, version), replaced as one object so readers never mix versions
+        self._state = (None, None, None)
+
+    def _resolve(self, filename: str) -> Optional[str]:
+        """Find the file the scrapers' load_* methods would read (root first, then data/)"""
+        for path in (filename, os.path.join(self.data_dir, filename)):
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _stat_signature(self) -> Tuple:
+        """Cheap per-request check: path, mtime and size of each data file"""
+        signature = []
+        for filename in self.filenames:
+            path = self._resolve(filename)
+            if path is None:
+                signature.append((filename, None, None))
+                continue
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def _hash_contents(self, signature: Tuple) -> str:
+        """Hash the data files so a rewrite with identical content keeps the model"""
+        digest = hashlib.sha256()
+        for path, mtime, _ in signature:
+            digest.update(path.encode('utf-8'))
+            if mtime is None:
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 16), b''):
+                        digest.update(chunk)
+            except OSError:
+                pass
+        return digest.hexdigest()
+
+    @property
+    def last_modified(self) -> Optional[float]:
+        """Newest data file mtime (epoch seconds) when not keyed on a snapshot generation"""
+        signature = self._state[0]
+        if not signature or signature[0] == 'generation':
+            return None
+        mtimes = [mtime for _, mtime, _ in signature if mtime is not None]
+        return max(mtimes) / 1e9 if mtimes else None
+
+    @property
+    def version(self) -> Optional[str]:
+        """Snapshot generation (or content hash) of the data the cached model was built from"""
+        return self._state[2]
+
+    def get(self) -> Tuple[Dict, str]:
+        """Return (model, version), rebuilding the model only when the data changed
+
+        Both come from one read, so the version always describes the returned model.
+        """
+        generation = self.generation() if self.generation is not None else None
+        if generation is not None:
+            return self._get_generation(generation)
+
+        signature = self._stat_signature()
+        state = self._state
+        if state[1] is not None and signature == state[0]:
+            return state[1], state[2]
+
+        with self._lock:
+            # Another thread may have rebuilt while we waited for the lock
+            _, model, version = state = self._state
+            if model is not None and signature == state[0]:
+                return model, version
+
+            content_hash = self._hash_contents(signature)
+            if model is None or content_hash != version:
+                try:
+                    model, version = self.builder(), content_hash
+                except Exception as e:
+                    print(f"Error building dashboard model: {str(e)}")
+                    traceback.print_exc()
+                    if model is None:
+                        raise
+                    # Keep serving the last good model and retry on the next request
+                    return model, version
+            self._state = (signature, model, version)
+            return model, version
+
+    def _get_generation(self, generation: int) -> Tuple[Dict, str]:
+        """Cache keyed on the snapshot generation: snapshots are immutable, so no hashing"""
+        signature = ('generation', generation)
+        state = self._state
+        if state[1] is not None and signature == state[0]:
+            return state[1], state[2]
+
+        with self._lock:
+            state = self._state
+            if state[1] is not None and signature == state[0]:
+                return state[1], state[2]
+            try:
+                model = self.builder()
+            except Exception as e:
+                print(f"Error building dashboard model: {str(e)}")
+                traceback.print_exc()
+                if state[1] is None:
+                    raise
+                return state[1], state[2]
+            self._state = (signature, model, f"gen-{generation}")
+            return model, self._state[2]
+
+    def invalidate(self):
+        """Force the next request to rebuild the model"""
+        with self._lock:
+            self._state = (None, None, None)
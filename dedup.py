@@ -0,0 +1,230 @@
+import json
+import os
+import random
+import re
+import threading
+import traceback
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+# One-permutation MinHash: each shingle's 32-bit hash is mixed once, its remainder picks
+# one of num_perm bins and the bin keeps the smallest quotient. That costs one pass over
+# the shingles instead of one per permutation; empty bins borrow from a filled bin picked
+# by a per-bin random probe order (optimal densification).
+HASH_BITS = 32
+HASH_MASK = (1 << HASH_BITS) - 1
+# Value of an empty bin (above any quotient), also the signature of an item without shingles
+EMPTY_HASH = 1 << HASH_BITS
+
+# Rolls word hashes into shingle hashes
+SHINGLE_PRIME = 1000003
+
+# Lowercase alphanumeric words
+WORD_RE = re.compile(r'[^\W_]+')
+
+
+def tokenize(text: str, limit: int = None) -> List[str]:
+    """Lowercase alphanumeric words of a text (only the first `limit` if given)"""
+    if limit is not None:
+        # Tokenize a prefix that usually holds enough words; one extra word guarantees
+        # the last kept word wasn't cut off at the slice
+        prefix = text[:limit * 16]
+        if len(prefix) < len(text):
+            words = WORD_RE.findall(prefix.lower())
+            if len(words) > limit:
+                return words[:limit]
+        return WORD_RE.findall(text.lower())[:limit]
+    return WORD_RE.findall(text.lower())
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index over word shingles for roughly linear near-duplicate detection"""
+    def __init__(self, threshold: float = None, num_perm: int = 64, shingle_size: int = 2,
+                 body_words: int = 30, seed: int = 1):
+        if threshold is None:
+            threshold = float(os.getenv('DEDUP_THRESHOLD', '0.6'))
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.body_words = body_words
+        self.seed = seed
+
+        rng = random.Random(seed)
+        # Odd multiplier and offset that mix the crc32 bits before binning
+        self.multiplier = rng.getrandbits(HASH_BITS) | 1
+        self.offset = rng.getrandbits(HASH_BITS)
+        # Per-bin order in which an empty bin looks for a filled one to borrow from
+        self.probes = [rng.sample(range(num_perm), num_perm) for _ in range(num_perm)]
+        self.bands, self.rows = self._choose_bands(threshold, num_perm)
+
+        self.signatures = {}  # key -> MinHash signature
+        self.seen = {}        # key -> ISO timestamp of when the key was added
+        self.buckets = [{} for _ in range(self.bands)]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _choose_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+        """Pick the band/row split whose LSH threshold (1/b)^(1/r) best fits the target"""
+        best = None
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows:
+                continue
+            bands = num_perm // rows
+            approx = (1.0 / bands) ** (1.0 / rows)
+            # Prefer splits at or just below the threshold so true matches aren't missed
+            error = threshold - approx if approx <= threshold else (approx - threshold) * 2
+            if best is None or error < best[0]:
+                best = (error, bands, rows)
+        return best[1], best[2]
+
+    def shingles(self, title: str, body: str = '') -> set:
+        """Word shingles of the title plus the start of the body"""
+        words = tokenize(title) + tokenize(body, self.body_words)
+        if len(words) < self.shingle_size:
+            return {' '.join(words)} if words else set()
+        return {
+            ' '.join(words[idx:idx + self.shingle_size])
+            for idx in range(len(words) - self.shingle_size + 1)
+        }
+
+    def signature(self, title: str, body: str = '') -> List[int]:
+        """MinHash signature of a title/body pair (the hashed form of shingles())"""
+        words = tokenize(title) + tokenize(body, self.body_words)
+        if not words:
+            return [EMPTY_HASH] * self.num_perm
+        # Shingle hashes are rolled from per-word hashes instead of hashing joined strings
+        hashes = [zlib.crc32(word.encode('utf-8')) for word in words]
+        values = hashes[:max(1, len(hashes) - self.shingle_size + 1)]
+        for position in range(1, min(self.shingle_size, len(hashes))):
+            values = [(value * SHINGLE_PRIME + word) & HASH_MASK for value, word in zip(values, hashes[position:])]
+
+        num_bins = self.num_perm
+        bins = [EMPTY_HASH] * num_bins
+        multiplier, offset = self.multiplier, self.offset
+        for value in set(values):
+            value = (value * multiplier + offset) & HASH_MASK
+            idx = value % num_bins
+            value //= num_bins
+            if value < bins[idx]:
+                bins[idx] = value
+        return self._densify(bins)
+
+    def _densify(self, bins: List[int]) -> List[int]:
+        """Fill each empty bin from the first filled bin in its own random probe order, so
+        two items agree on it about as often as on a real permutation"""
+        if EMPTY_HASH not in bins:
+            return bins
+        densified = list(bins)
+        probes = self.probes
+        for idx in [idx for idx, value in enumerate(bins) if value == EMPTY_HASH]:
+            for probe in probes[idx]:
+                value = bins[probe]
+                if value != EMPTY_HASH:
+                    densified[idx] = value
+                    break
+        return densified
+
+    def _band_keys(self, signature: List[int]) -> List[Tuple]:
+        return [tuple(signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    @staticmethod
+    def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+    def find_duplicate(self, signature: List[int], key: str = None) -> Optional[str]:
+        """Key of an indexed near-duplicate other than `key`, if any"""
+        candidates = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self.buckets[band].get(band_key, ()))
+        candidates.discard(key)
+        for candidate in candidates:
+            if self.similarity(signature, self.signatures[candidate]) >= self.threshold:
+                return candidate
+        return None
+
+    def add(self, key: str, signature: List[int], seen: str = None):
+        """Index a signature under a key"""
+        if key in self.signatures:
+            self._remove_from_buckets(key)
+        self.signatures[key] = signature
+        self.seen[key] = seen or datetime.now().isoformat()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self.buckets[band].setdefault(band_key, set()).add(key)
+
+    def check_and_add(self, key: str, title: str, body: str = '') -> Optional[str]:
+        """Return the key this item duplicates, or index it and return None"""
+        signature = self.signature(title, body)
+        with self._lock:
+            duplicate = self.find_duplicate(signature, key)
+            if duplicate is None:
+                self.add(key, signature)
+            return duplicate
+
+    def _remove_from_buckets(self, key: str):
+        for band, band_key in enumerate(self._band_keys(self.signatures[key])):
+            bucket = self.buckets[band].get(band_key)
+            if bucket:
+                bucket.discard(key)
+                if not bucket:
+                    del self.buckets[band][band_key]
+
+    def prune(self, days: int):
+        """Forget items added more than `days` ago"""
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        with self._lock:
+            for key in [key for key, seen in self.seen.items() if seen < cutoff]:
+                self._remove_from_buckets(key)
+                del self.signatures[key]
+                del self.seen[key]
+
+    def _params(self) -> Dict:
+        return {
+            'threshold': self.threshold,
+            'num_perm': self.num_perm,
+            'shingle_size': self.shingle_size,
+            'body_words': self.body_words,
+            'seed': self.seed,
+            'hash': f"crc32-oph{HASH_BITS}"
+        }
+
+    def save(self, path: str):
+        """Persist the index so later runs can dedup against earlier items"""
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with self._lock:
+                data = {
+                    'params': self._params(),
+                    'items': {
+                        key: {'signature': self.signatures[key], 'seen': self.seen[key]}
+                        for key in self.signatures
+                    }
+                }
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error saving dedup index: {str(e)}")
+            traceback.print_exc()
+
+    @classmethod
+    def load(cls, path: str, threshold: float = None, **kwargs) -> 'NearDuplicateIndex':
+        """Load a persisted index, starting empty if it is missing or was built differently"""
+        index = cls(threshold=threshold, **kwargs)
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return index
+        except Exception as e:
+            print(f"Error loading dedup index: {str(e)}")
+            return index
+
+        if data.get('params') != index._params():
+            print("Dedup index parameters changed, starting a fresh index")
+            return index
+        for key, item in data.get('items', {}).items():
+            index.add(key, item['signature'], item.get('seen'))
+        return index
@@ -1,17 +1,36 @@
 """
 Script to generate a static version of the energy dashboard.
 This creates HTML files that can be hosted on GitHub Pages.
+
+Pages are rendered from the same Jinja templates as the Flask app: the
+dashboard (index.html), one page per category and a monthly archive. Only
+files whose content hash changed are written, each page with a precompressed
+.gz copy, so a rebuild with unchanged data touches nothing. Assets copied from
+static/ are not compressed, so copying the output back into the repository
+never feeds .gz files into the next build.
 """
 
-import os
+import gzip
+import hashlib
 import json
-import re
+import os
+import traceback
 from datetime import datetime
-import shutil
+from typing import Dict, List
+
 import pytz  # Add pytz for timezone handling
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from content_store import open_content_store, days_ago
+from site_templates import group_by_month, register_template_helpers
+from snapshots import default_snapshot_store
+
+OUTPUT_DIR = 'static_site'
+# Hashes of the files written by the last build, used to skip and prune
+BUILD_MANIFEST = os.path.join(OUTPUT_DIR, '.build-manifest.json')
+# Text assets worth precompressing
+COMPRESSIBLE = ('.html', '.css', '.js', '.json', '.svg')
 
-# Create static output directory
-os.makedirs('static_site', exist_ok=True)
 
 # Load article data
 def load_data(filename):
@@ -22,169 +41,197 @@ def load_data(filename):
         print(f"Warning: Could not load {filename}, using empty list")
         return []
 
-# Load data
-articles = load_data('articles.json')
-podcasts = load_data('podcasts.json')
-
-print(f"Loaded {len(articles)} articles and {len(podcasts)} podcasts")
-
-try:
-    # Try to read the dashboard template from different locations
-    template_path = None
-    template_paths = ['dashboard.html', 'templates/dashboard.html']
-    
-    for path in template_paths:
-        if os.path.exists(path):
-            template_path = path
-            break
-    
-    if not template_path:
-        raise FileNotFoundError("Could not find dashboard.html template in any expected location")
-        
-    print(f"Using template at: {template_path}")
-        
-    # Read the dashboard template
-    with open(template_path, 'r') as f:
-        content = f.read()
-    
-    # Replace the static template variables
+
+def article_since() -> str:
+    return days_ago(int(os.getenv('ARTICLE_DAYS_FILTER', '7')))
+
+
+def podcast_since() -> str:
+    return days_ago(int(os.getenv('PODCAST_DAYS_FILTER', '30')))
+
+
+def load_content(content_store=None):
+    """Articles and podcasts from the SQLite store, the current snapshot or data/"""
+    if content_store is not None:
+        return content_store.latest_articles(since=article_since()), content_store.latest_episodes(since=podcast_since())
+
+    with default_snapshot_store.pinned():
+        articles = default_snapshot_store.load('articles.json')
+        podcasts = default_snapshot_store.load('podcasts.json')
+    if articles is None:
+        articles = load_data('articles.json')
+    if podcasts is None:
+        podcasts = load_data('podcasts.json')
+    articles.sort(key=lambda x: x.get('date', ''), reverse=True)
+    podcasts.sort(key=lambda x: x.get('release_date', ''), reverse=True)
+    return articles, podcasts
+
+
+def data_published_at(articles: List[Dict], podcasts: List[Dict]) -> datetime:
+    """Publish time of the data (not build time), so unchanged data renders identical pages"""
+    published_at = default_snapshot_store.published_at()
+    if published_at:
+        published = datetime.fromisoformat(published_at)
+        return published if published.tzinfo else published.astimezone(pytz.utc)
+    timestamps = [item['timestamp'] for item in articles + podcasts if item.get('timestamp')]
+    if timestamps:
+        return datetime.fromisoformat(max(timestamps)).astimezone(pytz.utc)
+    return datetime.now(pytz.utc)
+
+
+class SiteWriter:
+    """Write output files only when their content hash changed, with .gz copies"""
+    def __init__(self, output_dir: str = OUTPUT_DIR, manifest_path: str = BUILD_MANIFEST):
+        self.output_dir = output_dir
+        self.manifest_path = manifest_path
+        try:
+            with open(manifest_path, 'r') as f:
+                self.previous = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.previous = {}
+        self.current = {}
+        self.written = []
+        self.skipped = 0
+
+    def write(self, relative_path: str, content: bytes, extra_paths=(), compress: bool = None):
+        """Write output_dir/relative_path (and any extra copies) if the content changed"""
+        digest = hashlib.sha256(content).hexdigest()
+        self.current[relative_path] = digest
+        path = os.path.join(self.output_dir, relative_path)
+        targets = [path, *extra_paths]
+        if compress is None:
+            compress = relative_path.endswith(COMPRESSIBLE)
+        if not compress:
+            self._remove(f"{path}.gz")  # Left over from a build that still compressed it
+        unchanged = (
+            self.previous.get(relative_path) == digest
+            and all(os.path.exists(target) for target in targets)
+            and (not compress or os.path.exists(f"{path}.gz"))
+        )
+        if unchanged:
+            self.skipped += 1
+            return
+        for target in targets:
+            self._atomic_write(target, content)
+        if compress:
+            self._atomic_write(f"{path}.gz", gzip.compress(content, compresslevel=9, mtime=0))
+        self.written.append(relative_path)
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _atomic_write(path: str, content: bytes):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def finish(self):
+        """Remove files the previous build produced but this one did not, then save the manifest"""
+        for relative_path in set(self.previous) - set(self.current):
+            for path in (relative_path, f"{relative_path}.gz"):
+                if self._remove(os.path.join(self.output_dir, path)):
+                    print(f"Removed stale {path}")
+        self._atomic_write(self.manifest_path, json.dumps(self.current, indent=2, sort_keys=True).encode('utf-8'))
+
+
+def build_site(output_dir: str = OUTPUT_DIR) -> SiteWriter:
+    # With STORAGE_BACKEND=sqlite, category and archive pages are indexed queries
+    content_store = open_content_store()
+    articles, podcasts = load_content(content_store)
+    print(f"Loaded {len(articles)} articles and {len(podcasts)} podcasts")
+
+    # One environment: each template is compiled once and reused for every page
+    env = register_template_helpers(Environment(
+        loader=FileSystemLoader('templates'),
+        autoescape=select_autoescape(['html'])
+    ))
     pacific_tz = pytz.timezone('America/Los_Angeles')
-    current_time_pst = datetime.now(pytz.utc).astimezone(pacific_tz)
-    content = content.replace('{{ last_updated }}', current_time_pst.strftime("%Y-%m-%d %H:%M:%S (PST)"))
-    content = content.replace('{{ now.year }}', str(current_time_pst.year))
-
-    # Helper function to generate a single article card HTML
-    def generate_article_card(article):
-        title = article.get('title', 'Untitled')
-        summary = article.get('summary', '')
-        link = article.get('link', '#')
-        date = article.get('date', '')
-        source = article.get('source', '')
-        categories = article.get('categories', 'innovation,business') # Default categories
-        # Clean up category string: remove newlines and ensure comma separation
-        cleaned_categories = ",".join(c.strip() for c in categories.replace('\\n', ',').split(',') if c.strip())
-        
-        category_badges = ""
-        for category_str in cleaned_categories.split(','):
-            if not category_str: continue # Skip empty category strings
-            category_name = {'policy': 'Policy', 'innovation': 'Innovation', 'business': 'Business', 'climate': 'Climate'}.get(category_str, category_str.capitalize())
-            category_badges += f'<span class="category-badge category-{category_str}">{category_name}</span>\\n'
-        
-        return f'''
-        <div class="news-card p-4 rounded-lg border border-gray-100" data-categories="{cleaned_categories}">
-            <div class="flex flex-wrap gap-2 mb-2">
-                {category_badges}
-                <span class="ml-auto text-xs text-gray-500">{date}</span>
-            </div>
-            <h3 class="text-xl font-medium text-gray-900 mb-2 leading-tight">
-                <a href="{link}" target="_blank" class="hover:text-primary-600">{title}</a>
-            </h3>
-            <p class="text-gray-600 mb-3">{summary}</p>
-            <div class="flex items-center justify-between">
-                <span class="text-xs bg-gray-100 text-gray-600 px-2 py-1 rounded">{source}</span>
-                <a href="{link}" target="_blank" class="text-primary-600 hover:text-primary-800 text-sm font-medium">
-                    Read more <i class="fas fa-arrow-right ml-1"></i>
-                </a>
-            </div>
-        </div>
-        '''
-
-    # Helper function to generate a single podcast card HTML
-    def generate_podcast_card(podcast):
-        title = podcast.get('title', 'Untitled')
-        summary = podcast.get('summary', 'LLM summary failed or not available.') # Default summary
-        url = podcast.get('url', '#')
-        release_date = podcast.get('release_date', '')
-        return f'''
-        <div class="news-card p-4 rounded-lg border border-gray-100">
-            <div class="mb-2 flex justify-between items-center">
-                <span class="text-xs bg-yellow-100 text-yellow-800 px-2 py-1 rounded">Podcast</span>
-                <span class="text-xs text-gray-500">{release_date}</span>
-            </div>
-            <h3 class="text-lg font-medium text-gray-900 mb-2 leading-tight">
-                <a href="{url}" target="_blank" class="hover:text-primary-600">{title}</a>
-            </h3>
-            <p class="text-sm text-gray-600 mb-3">{summary}</p>
-            <a href="{url}" target="_blank" class="text-primary-600 hover:text-primary-800 text-sm font-medium flex items-center">
-                <i class="fas fa-play mr-1"></i> Listen
-            </a>
-        </div>
-        '''
-
-    # --- Main Content Sections ---
-    articles_col1_html = "".join(generate_article_card(article) for article in articles[:3])
-    content = content.replace('<!-- ARTICLES_COLUMN_1_PLACEHOLDER -->', articles_col1_html)
-
-    podcasts_col1_html = "".join(generate_podcast_card(podcast) for podcast in podcasts[:2])
-    content = content.replace('<!-- PODCASTS_COLUMN_1_PLACEHOLDER -->', podcasts_col1_html)
-
-    article_col2_html = generate_article_card(articles[3]) if len(articles) > 3 else ""
-    content = content.replace('<!-- ARTICLE_COLUMN_2_PLACEHOLDER -->', article_col2_html)
-
-    article_col3_html = generate_article_card(articles[4]) if len(articles) > 4 else ""
-    content = content.replace('<!-- ARTICLE_COLUMN_3_PLACEHOLDER -->', article_col3_html)
-    
-    podcasts_col2_html = generate_podcast_card(podcasts[2]) if len(podcasts) > 2 else ""
-    content = content.replace('<!-- PODCASTS_COLUMN_2_PLACEHOLDER -->', podcasts_col2_html)
-
-    # --- Sidebar Sections ---
-    featured_podcast_html = ""
-    if len(podcasts) > 3:
-        podcast = podcasts[3]
-        featured_podcast_html = f'''
-        <div class="bg-white rounded-xl shadow-sm p-6">
-            <h2 class="text-xl font-semibold text-gray-900 mb-4 flex items-center">
-                <span class="text-energy-yellow mr-2"><i class="fas fa-podcast"></i></span>
-                Featured Podcast
-            </h2>
-            {generate_podcast_card(podcast)}
-        </div>
-        '''
-    content = content.replace('<!-- FEATURED_PODCAST_PLACEHOLDER -->', featured_podcast_html)
-
-    policy_update_article_html = ""
-    if len(articles) > 5:
-        article = articles[5]
-        policy_update_article_html = f'''
-        <div class="bg-white rounded-xl shadow-sm p-6">
-            <h2 class="text-xl font-semibold text-gray-900 mb-4 flex items-center">
-                <span class="text-energy-blue mr-2"><i class="fas fa-newspaper"></i></span>
-                Policy Update
-            </h2>
-            {generate_article_card(article)}
-        </div>
-        '''
-    content = content.replace('<!-- POLICY_UPDATE_ARTICLE_PLACEHOLDER -->', policy_update_article_html)
-    
-    # Final cleanup of any stray template tags that were not replaced by placeholders
-    # This specifically targets tags that might be left if a placeholder was missed or data was empty
-    content = re.sub(r'<!-- [A-Z0-9_]+_PLACEHOLDER -->', '', content) # Remove any unfilled placeholders
-    content = re.sub(r'{{\s*.*?\s*}}', '', content) # Remove {{ variable }} if data was missing for it
-    # The {% if ... %} tags should ideally be handled by the conditional logic above (e.g. if len(articles) > X)
-    # If some are still left, it indicates a mismatch between template structure and generation logic.
-    # A more robust solution for complex templates is a proper templating engine like Jinja2.
-    # For now, let's try a slightly more aggressive cleanup for leftover {% ... %} blocks if they are simple
-    content = re.sub(r'{%\s*if.*?%}(.*?){%\s*endif\s*%}', lambda m: m.group(1) if "PLACEHOLDER" not in m.group(1) else "", content, flags=re.DOTALL)
-    content = re.sub(r'{%\s*.*?\s*%}', '', content, flags=re.DOTALL) # General catch-all for other tags
-
-    # Write the static HTML
-    with open('static_site/index.html', 'w') as f:
-        f.write(content)
-    
-    # Also write to root index.html for immediate preview
-    with open('index.html', 'w') as f:
-        f.write(content)
-    
-    print(f"Successfully generated index.html")
-    
-    # Copy static assets
+    published_pst = data_published_at(articles, podcasts).astimezone(pacific_tz)
+    common = {
+        'last_updated': published_pst.strftime("%Y-%m-%d %H:%M:%S (PST)"),
+        'now': published_pst,
+        'site_nav': True
+    }
+    writer = SiteWriter(output_dir)
+
+    # Dashboard; also written to the root index.html for immediate preview
+    html = env.get_template('dashboard.html').render(articles=articles, podcasts=podcasts, root='', **common)
+    writer.write('index.html', html.encode('utf-8'), extra_paths=['index.html'])
+
+    listing = env.get_template('listing.html')
+    for category in env.globals['categories']:
+        if content_store is not None:
+            category_articles = content_store.articles_in_category(category, since=article_since())
+        else:
+            category_articles = [a for a in articles if category in env.filters['category_list'](a.get('categories'))]
+        html = listing.render(
+            page_title=env.globals['category_titles'][category],
+            articles=category_articles,
+            podcasts=[],
+            root='../',
+            **common
+        )
+        writer.write(f"category/{category}.html", html.encode('utf-8'))
+
+    article_months = group_by_month(articles, 'date')
+    podcast_months = group_by_month(podcasts, 'release_date')
+    months = sorted(set(article_months) | set(podcast_months), reverse=True)
+    html = listing.render(
+        page_title='Archive',
+        months=[(month, len(article_months.get(month, [])) + len(podcast_months.get(month, []))) for month in months],
+        articles=[],
+        podcasts=[],
+        root='../',
+        **common
+    )
+    writer.write('archive/index.html', html.encode('utf-8'))
+    for month in months:
+        month_articles, month_podcasts = article_months.get(month, []), podcast_months.get(month, [])
+        if content_store is not None and month != 'undated':
+            month_articles = content_store.articles_between(max(f"{month}-01", article_since()), f"{month}-31")
+            month_podcasts = content_store.episodes_between(max(f"{month}-01", podcast_since()), f"{month}-31")
+        html = listing.render(
+            page_title=f"Archive: {month}",
+            articles=month_articles,
+            podcasts=month_podcasts,
+            root='../',
+            **common
+        )
+        writer.write(f"archive/{month}.html", html.encode('utf-8'))
+
+    # Static assets: copied only when changed, uncompressed; stray .gz or temp files are not sources
     if os.path.exists('static'):
-        shutil.copytree('static', 'static_site/static', dirs_exist_ok=True)
-        print(f"Copied static assets")
-    
-    print(f"Static site generated successfully in 'static_site' directory")
-    
-except Exception as e:
-    print(f"Error generating static site: {str(e)}")
-    import traceback
-    traceback.print_exc() 
\ No newline at end of file
+        for directory, _, filenames in os.walk('static'):
+            for filename in sorted(filenames):
+                if filename.endswith(('.gz', '.tmp')):
+                    continue
+                source = os.path.join(directory, filename)
+                with open(source, 'rb') as f:
+                    writer.write(os.path.relpath(source, '.'), f.read(), compress=False)
+
+    writer.finish()
+    return writer
+
+
+def main():
+    try:
+        writer = build_site()
+        print(f"Wrote {len(writer.written)} changed files, skipped {writer.skipped} unchanged")
+        for path in writer.written:
+            print(f"  {path}")
+        print(f"Static site generated successfully in '{OUTPUT_DIR}' directory")
+    except Exception as e:
+        print(f"Error generating static site: {str(e)}")
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    main()
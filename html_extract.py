@@ -0,0 +1,113 @@
+"""
+Article text extraction with lxml and per-site compiled XPath.
+
+Each site's CSS selectors from WebScraper.site_selectors are compiled once into
+XPath expressions. A page is parsed by lxml's C parser and only the matched
+content subtree is cleaned and walked, instead of building a BeautifulSoup tree
+of the whole page and decomposing nodes across all of it.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from lxml import etree
+from lxml import html as lxml_html
+
+# Elements dropped before extraction (same list as the BeautifulSoup path)
+NOISE_TAGS = ('script', 'style', 'nav', 'header', 'footer', 'aside')
+
+# Paragraphs this short are navigation crumbs, captions and the like
+MIN_PARAGRAPH_CHARS = 50
+
+# One compound selector: optional tag, then any .class, #id and [attr] parts
+COMPOUND_RE = re.compile(r'^(?P<tag>[a-zA-Z][a-zA-Z0-9-]*|\*)?(?P<rest>(?:[.#][\w-]+|\[[\w-]+\])*)$')
+PART_RE = re.compile(r'([.#])([\w-]+)|\[([\w-]+)\]')
+
+_PARSER = lxml_html.HTMLParser(encoding='utf-8', remove_comments=True)
+
+
+def css_to_xpath(selector: str) -> Optional[str]:
+    """XPath for a descendant-only CSS selector (tag, .class, #id, [attr]); None if unsupported"""
+    steps = []
+    for compound in selector.split():
+        match = COMPOUND_RE.match(compound)
+        if not match:
+            return None
+        conditions = []
+        for kind, name, attr in PART_RE.findall(match.group('rest')):
+            if kind == '.':
+                conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')")
+            elif kind == '#':
+                conditions.append(f"@id='{name}'")
+            else:
+                conditions.append(f"@{attr}")
+        step = match.group('tag') or '*'
+        if conditions:
+            step += '[' + ' and '.join(conditions) + ']'
+        steps.append(step)
+    if not steps:
+        return None
+    return '//' + '//'.join(steps)
+
+
+def _compile_all(selectors: List[str]) -> Optional[List[etree.XPath]]:
+    compiled = []
+    for selector in selectors:
+        xpath = css_to_xpath(selector)
+        if xpath is None:
+            return None
+        compiled.append(etree.XPath(xpath))
+    return compiled
+
+
+class SiteExtractor:
+    """Compiled content/exclude selectors for one site"""
+    def __init__(self, content: List[str], exclude: List[str]):
+        self.content = _compile_all(content)
+        self.exclude = _compile_all(exclude)
+        self.noise = etree.XPath('|'.join(f'//{tag}' for tag in NOISE_TAGS))
+
+    @property
+    def compiled(self) -> bool:
+        return self.content is not None and self.exclude is not None
+
+    def extract(self, page: str) -> Optional[str]:
+        """Paragraph text of the site's content element, or None if it can't be found this way"""
+        try:
+            root = lxml_html.document_fromstring(page.encode('utf-8'), parser=_PARSER)
+        except (etree.ParserError, ValueError):
+            return None
+
+        # Content inside a removed element would have been dropped with it
+        removed = set(self.noise(root))
+        for xpath in self.exclude:
+            removed.update(xpath(root))
+
+        content_element = None
+        for xpath in self.content:
+            for element in xpath(root):
+                if element not in removed and not any(ancestor in removed for ancestor in element.iterancestors()):
+                    content_element = element
+                    break
+            if content_element is not None:
+                break
+        if content_element is None:
+            return None
+
+        # Only the content subtree is cleaned and walked
+        for element in list(content_element.iterdescendants()):
+            if element in removed and element.getparent() is not None:
+                element.drop_tree()
+
+        paragraphs = (p.text_content().strip() for p in content_element.iter('p'))
+        return ' '.join(text for text in paragraphs if len(text) > MIN_PARAGRAPH_CHARS)
+
+
+def build_extractors(site_selectors: Dict[str, Dict]) -> Dict[str, SiteExtractor]:
+    """SiteExtractor per site whose selectors can all be compiled; other sites use the fallback"""
+    extractors = {}
+    for site, selectors in site_selectors.items():
+        extractor = SiteExtractor(selectors.get('content', []), selectors.get('exclude', []))
+        if extractor.compiled:
+            extractors[site] = extractor
+    return extractors
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+
+import requests
+
+
+class CachedResponse:
+    """Minimal response object returned by HTTPCache.get"""
+    def __init__(self, url: str, text: str, status_code: int, from_cache: bool = False):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+        # True when the server answered 304 and the stored body was served
+        self.from_cache = from_cache
+
+
+class HTTPCache:
+    """On-disk cache of response bodies revalidated with conditional GETs"""
+    def __init__(self, cache_dir: str = None, max_bytes: int = None, enabled: bool = None):
+        self.cache_dir = cache_dir or os.getenv('HTTP_CACHE_DIR', os.path.join('data', 'http_cache'))
+        self.max_bytes = max_bytes or int(float(os.getenv('HTTP_CACHE_MAX_MB', '50')) * 1024 * 1024)
+        if enabled is None:
+            enabled = os.getenv('HTTP_CACHE_DISABLED', '').lower() not in ('1', 'true', 'yes')
+        self.enabled = enabled
+        self.index_path = os.path.join(self.cache_dir, 'index.json')
+        self._lock = threading.Lock()
+        self._index = None
+        # Index changes are kept in memory and written by flush()
+        self._dirty = False
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """Load the cache index from disk on first use"""
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r') as f:
+                    self._index = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _write_index(self):
+        """Write the index atomically so a crash never leaves it half-written"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _body_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.body')
+
+    def _read_body(self, url: str) -> Optional[str]:
+        try:
+            with open(self._body_path(url), 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store(self, url: str, response: requests.Response):
+        """Store a 200 response if it carries validators we can revalidate with"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        body = response.text
+        body_path = self._body_path(url)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{body_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(body)
+
+        # The body is swapped in under the index lock so an entry never points at a partial file
+        with self._lock:
+            os.replace(tmp_path, body_path)
+            index = self._load_index()
+            index[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'size': len(body.encode('utf-8')),
+                'last_used': time.time()
+            }
+            self._evict()
+            self._dirty = True
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        index = self._index
+        total = sum(entry.get('size', 0) for entry in index.values())
+        if total <= self.max_bytes:
+            return
+
+        for url, entry in sorted(index.items(), key=lambda item: item[1].get('last_used', 0)):
+            if total <= self.max_bytes:
+                break
+            total -= entry.get('size', 0)
+            del index[url]
+            try:
+                os.remove(self._body_path(url))
+            except OSError:
+                pass
+
+    def get(self, session: requests.Session, url: str, **kwargs) -> CachedResponse:
+        """GET a URL, revalidating any stored copy and serving it on 304"""
+        if not self.enabled:
+            response = session.get(url, **kwargs)
+            response.raise_for_status()
+            return CachedResponse(url, response.text, response.status_code)
+
+        with self._lock:
+            entry = dict(self._load_index().get(url) or {})
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        response = session.get(url, headers=headers, **kwargs)
+        if response.status_code == 304 and entry:
+            body = self._read_body(url)
+            if body is not None:
+                with self._lock:
+                    index = self._load_index()
+                    if url in index:
+                        index[url]['last_used'] = time.time()
+                        self._dirty = True
+                return CachedResponse(url, body, 200, from_cache=True)
+            # Stored body went missing; fetch it again without validators
+            response = session.get(url, **kwargs)
+
+        response.raise_for_status()
+        try:
+            self._store(url, response)
+        except Exception as e:
+            print(f"Error caching response for {url}: {str(e)}")
+            traceback.print_exc()
+        return CachedResponse(url, response.text, response.status_code)
+
+    def flush(self):
+        """Persist index changes (stored responses, last-used times) made since the last write"""
+        if not self.enabled or not self._dirty:
+            return
+        try:
+            with self._lock:
+                self._write_index()
+                self._dirty = False
+        except Exception as e:
+            print(f"Error saving HTTP cache index: {str(e)}")
+            traceback.print_exc()
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            for url in list(self._load_index()):
+                try:
+                    os.remove(self._body_path(url))
+                except OSError:
+                    pass
+            self._index = {}
+            self._write_index()
+            self._dirty = False
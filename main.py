@@ -1,14 +1,26 @@
 from dotenv import load_dotenv
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, g, render_template, jsonify, request, url_for
 from web_scraper import WebScraper
 from podcast_scraper import PodcastScraper
+from dashboard_model import DashboardModelCache, build_model
+from content_api import (QueryError, item_categories, parse_date, parse_fields, parse_limit,
+                         select_fields)
+from response_cache import ResponseCache
+from site_templates import register_template_helpers
+from categorizer import default_categorizer
+from dedup import NearDuplicateIndex
+from update_jobs import UpdateJobQueue, start_scheduler
+from metrics import default_metrics
 import os
+import sys
 from datetime import datetime
 import json
 import traceback
 import logging
 from logging.handlers import RotatingFileHandler
 import re
+import argparse
+import time
 import pytz
 
 # Set up logging
@@ -34,6 +46,8 @@ print("SPOTIFY_CLIENT_SECRET:", os.getenv('SPOTIFY_CLIENT_SECRET'))
 print("SPOTIPY_REDIRECT_URI:", os.getenv('SPOTIPY_REDIRECT_URI'))  # Keep this for debugging
 
 app = Flask(__name__)
+# Same template filters and globals as generate_static.py
+register_template_helpers(app.jinja_env)
 
 # Add custom Jinja2 filter for splitting strings
 @app.template_filter('split')
@@ -61,159 +75,249 @@ except Exception as e:
 
 def categorize_articles(articles):
     """Automatically categorize articles based on content and title"""
-    category_keywords = {
-        'policy': [
-            'policy', 'regulation', 'law', 'bill', 'legislation', 'government', 
-            'epa', 'regulatory', 'compliance', 'mandate', 'tax', 'incentive', 'subsidy',
-            'administration', 'congress', 'senate', 'house', 'department', 'agency',
-            'IRA', 'inflation reduction act', 'DOE', 'FERC'
-        ],
-        'innovation': [
-            'innovation', 'technology', 'research', 'development', 'breakthrough',
-            'prototype', 'invention', 'startup', 'efficiency', 'advanced', 'novel',
-            'solution', 'discovery', 'cutting-edge', 'emerging', 'battery', 'storage',
-            'inverter', 'grid', 'smart', 'digital', 'AI', 'artificial intelligence'
-        ],
-        'business': [
-            'investment', 'merger', 'acquisition', 'funding', 'IPO', 'capital',
-            'market', 'stock', 'shares', 'venture', 'profit', 'revenue', 'cost',
-            'price', 'company', 'corporation', 'industry', 'commercial', 'economics',
-            'billion', 'million', 'financial', 'CEO', 'executive', 'board'
-        ],
-        'climate': [
-            'climate', 'emissions', 'carbon', 'pollution', 'global warming', 'greenhouse',
-            'renewable', 'clean energy', 'sustainable', 'sustainability', 'environment',
-            'net-zero', 'decarbonization', 'methane', 'fossil fuel', 'coal', 'natural gas',
-            'conservation', 'biodiversity', 'ecosystem'
-        ]
-    }
-    
-    for article in articles:
-        # Combine title and summary text for categorization
-        text = (article['title'] + ' ' + article['summary']).lower()
-        
-        # Count occurrences of category keywords
-        category_counts = {category: 0 for category in category_keywords}
-        
-        for category, keywords in category_keywords.items():
-            for keyword in keywords:
-                if keyword.lower() in text:
-                    category_counts[category] += 1
-        
-        # Assign categories (can have multiple)
-        assigned_categories = []
-        for category, count in category_counts.items():
-            if count >= 1:  # If at least one keyword match, assign the category
-                assigned_categories.append(category)
-        
-        # Ensure at least one category
-        if not assigned_categories:
-            # Default to most likely based on energy news
-            assigned_categories = ['innovation', 'business']
-        
-        article['categories'] = ','.join(assigned_categories)
-    
-    return articles
+    with default_metrics.stage('categorization'):
+        return default_categorizer.categorize_articles(articles)
+
+def update_content(full_refresh: bool = None) -> bool:
+    """Update all content sources with improved error handling
 
-def update_content() -> bool:
-    """Update all content sources with improved error handling"""
+    Returns False when the update is broken: every news source failed, nothing could be
+    saved or the podcast step failed. Whatever was fetched is still saved and published.
+    """
     try:
         logger.info("Starting content update...")
+        # Stage timings from here on go into the last-run summary (data/last_run_metrics.json)
+        default_metrics.start_run()
         
         # Scrape articles with configurable date filters
         article_days = int(os.getenv('ARTICLE_DAYS_FILTER', '7'))
         podcast_days = int(os.getenv('PODCAST_DAYS_FILTER', '30'))
         
-        # Scrape and filter articles
-        canary_articles = web_scraper.scrape_canary_media()
-        utility_dive_articles = web_scraper.scrape_utility_dive()
+        # Incremental mode only fetches and summarizes articles we haven't seen
+        if full_refresh is None:
+            full_refresh = os.getenv('INCREMENTAL_UPDATES', '1').lower() in ('0', 'false', 'no')
+        existing_articles = [] if full_refresh else web_scraper.load_articles('articles.json')
+        web_scraper.set_known_articles(existing_articles)
         
-        # Combine and filter articles
+        # Scrape all registered news sources in parallel, each within its own timeout
+        scraped_articles, scrape_report = web_scraper.scrape_sources()
+        problems = []
+        if scrape_report['failed']:
+            logger.warning(f"{len(scrape_report['failed'])} of {scrape_report['sources']} news sources failed: "
+                           + ', '.join(f"{name} ({reason})" for name, reason in scrape_report['failed'].items()))
+            if len(scrape_report['failed']) == scrape_report['sources']:
+                problems.append("every news source failed")
+        
+        # Near-duplicate indexes persist across runs so repeats from earlier days are caught;
+        # by default items are only remembered while they can still be shown
+        dedup_retention = os.getenv('DEDUP_RETENTION_DAYS')
+        article_dedup = NearDuplicateIndex.load(os.path.join('data', 'article_dedup_index.json'))
+        article_dedup.prune(int(dedup_retention or article_days))
+        
+        # Combine with known articles and filter to the configured window
         all_articles = web_scraper.filter_recent_content(
-            canary_articles + utility_dive_articles,
-            days=article_days
+            web_scraper.merge_articles(existing_articles, scraped_articles),
+            days=article_days,
+            dedup_index=article_dedup
         )
+        article_dedup.save(os.path.join('data', 'article_dedup_index.json'))
         
         # Categorize articles
         all_articles = categorize_articles(all_articles)
         
-        # Save articles even if we can't get podcasts
-        if all_articles:
-            web_scraper.save_articles(all_articles, 'articles.json')
-            logger.info(f"Successfully updated {len(all_articles)} articles")
+        # Articles and episodes are published together as one snapshot generation when this block ends
+        with web_scraper.snapshots.batch():
+            # Save articles even if we can't get podcasts
+            if not all_articles:
+                problems.append("no articles to save")
+            elif web_scraper.save_articles(all_articles, 'articles.json'):
+                logger.info(f"Successfully updated {len(all_articles)} articles")
+            else:
+                problems.append("saving articles failed")
         
-        # Try to get podcast episodes, but don't fail if we can't
-        try:
-            # Scrape and filter podcast episodes
-            podcast_episodes = podcast_scraper.get_latest_episodes()
-            filtered_episodes = podcast_scraper.filter_recent_episodes(
-                podcast_episodes,
-                days=podcast_days
-            )
+            # Try to get podcast episodes, but don't fail if we can't
+            try:
+                # Scrape and filter podcast episodes
+                # Already-transcribed episodes are reused instead of being transcribed again
+                # Inline transcripts from older files move to the sidecar store here, never on the read path
+                known_episodes = podcast_scraper.migrate_inline_transcripts(podcast_scraper.load_episodes('podcasts.json'))
+                podcast_episodes = podcast_scraper.get_latest_episodes(known_episodes=known_episodes)
+                episode_dedup = NearDuplicateIndex.load(os.path.join('data', 'episode_dedup_index.json'))
+                episode_dedup.prune(int(dedup_retention or podcast_days))
+                filtered_episodes = podcast_scraper.filter_recent_episodes(
+                    podcast_episodes,
+                    days=podcast_days,
+                    dedup_index=episode_dedup
+                )
+                episode_dedup.save(os.path.join('data', 'episode_dedup_index.json'))
             
-            # Save episodes
-            if filtered_episodes:
-                podcast_scraper.save_episodes(filtered_episodes, 'podcasts.json')
-                logger.info(f"Successfully updated {len(filtered_episodes)} podcast episodes")
-        except Exception as e:
-            logger.error(f"Error updating podcast content: {str(e)}")
-            logger.info("Continuing with article content only")
+                # Save episodes
+                if filtered_episodes:
+                    if podcast_scraper.save_episodes(filtered_episodes, 'podcasts.json'):
+                        logger.info(f"Successfully updated {len(filtered_episodes)} podcast episodes")
+                    else:
+                        problems.append("saving podcast episodes failed")
+            except Exception as e:
+                logger.error(f"Error updating podcast content: {str(e)}")
+                logger.info("Continuing with article content only")
+                problems.append("podcast update failed")
         
-        return True
+        web_scraper.http_cache.flush()
+        web_scraper.summary_cache.save()
+        if problems:
+            logger.error(f"Content update incomplete: {'; '.join(problems)}")
+        default_metrics.finish_run(not problems)
+        return not problems
     except Exception as e:
         logger.error(f"Error updating content: {str(e)}")
         traceback.print_exc()
+        # Keep the responses cached before the failure
+        web_scraper.http_cache.flush()
+        default_metrics.finish_run(False)
         return False
 
+def build_dashboard_model() -> dict:
+    """Load, sort and categorize content once per data version"""
+    return build_model(web_scraper, podcast_scraper)
+
+# JSON data is keyed on the published snapshot generation (a manifest stat per request);
+# with STORAGE_BACKEND=sqlite the model is rebuilt when the database file changes
+if web_scraper.content_store is not None:
+    dashboard_cache = DashboardModelCache(build_dashboard_model, [web_scraper.content_store.path])
+else:
+    dashboard_cache = DashboardModelCache(
+        build_dashboard_model,
+        ['articles.json', 'podcasts.json'],
+        generation=web_scraper.snapshots.generation
+    )
+
+# Rendered pages and API responses per data version, with gzip/brotli variants
+response_cache = ResponseCache()
+
+def data_published_at() -> datetime:
+    """When the data being served was published: snapshot manifest, else data file mtime"""
+    published_at = web_scraper.snapshots.published_at() if web_scraper.content_store is None else None
+    if published_at:
+        published = datetime.fromisoformat(published_at)
+        return published if published.tzinfo else published.astimezone(pytz.utc)
+    mtime = dashboard_cache.last_modified
+    if mtime is not None:
+        return datetime.fromtimestamp(mtime, pytz.utc)
+    return datetime.now(pytz.utc)
+
 @app.route('/')
 def dashboard():
     """Render the main dashboard with error handling"""
     try:
-        # Load content
-        articles = web_scraper.load_articles('articles.json')
-        podcasts = podcast_scraper.load_episodes('podcasts.json')
+        # Pre-sorted, pre-categorized content, rebuilt only when the data files change;
+        # the version comes from the same read so a concurrent rebuild can't mislabel the page
+        model, version = dashboard_cache.get()
         
-        # Sort content by date
-        articles.sort(key=lambda x: datetime.strptime(x['date'], '%Y-%m-%d'), reverse=True)
-        podcasts.sort(key=lambda x: datetime.strptime(x['release_date'], '%Y-%m-%d'), reverse=True)
-        
-        # Ensure articles have categories
-        articles = categorize_articles(articles)
-        
-        # Get current time in Pacific timezone
-        pacific_tz = pytz.timezone('America/Los_Angeles')
-        current_time_pst = datetime.now(pytz.utc).astimezone(pacific_tz)
+        def render():
+            # "Last updated" is when the data was published, so the page is stable per version
+            pacific_tz = pytz.timezone('America/Los_Angeles')
+            published_pst = data_published_at().astimezone(pacific_tz)
+            html = render_template(
+                'dashboard.html',
+                articles=model['articles'],
+                podcasts=model['podcasts'],
+                last_updated=published_pst.strftime("%Y-%m-%d %H:%M:%S (PST)"),
+                now=published_pst
+            )
+            return html.encode('utf-8'), 'text/html'
         
-        return render_template(
-            'dashboard.html',
-            articles=articles,
-            podcasts=podcasts,
-            last_updated=current_time_pst.strftime("%Y-%m-%d %H:%M:%S (PST)"),
-            now=current_time_pst
-        )
+        # Clients holding the current version get a 304 without any rendering
+        return response_cache.respond(request, 'dashboard', version, data_published_at(), render)
     except Exception as e:
         logger.error(f"Error rendering dashboard: {str(e)}")
         traceback.print_exc()
         return render_template('error.html', error=str(e)), 500
 
-@app.route('/api/update')
+update_jobs = UpdateJobQueue(update_content)
+
+def start_update_scheduler():
+    """Start the in-process update scheduler (UPDATE_DAILY_AT=HH:MM or UPDATE_INTERVAL_HOURS)"""
+    daily_at = os.getenv('UPDATE_DAILY_AT')
+    interval_hours = float(os.getenv('UPDATE_INTERVAL_HOURS', '24'))
+    start_scheduler(update_jobs, interval_hours=interval_hours, daily_at=daily_at)
+    logger.info(f"Update scheduler started ({'daily at ' + daily_at if daily_at else f'every {interval_hours} hours'})")
+
+# Under gunicorn, only enable this with a single worker or every worker will schedule updates
+if os.getenv('ENABLE_SCHEDULER', '').lower() in ('1', 'true', 'yes') and __name__ != '__main__':
+    start_update_scheduler()
+
+@app.route('/api/update', methods=['GET', 'POST'])
 def update():
-    """API endpoint to trigger content update with improved response"""
+    """API endpoint to queue a content update and return its status URL"""
     try:
-        success = update_content()
-        if success:
-            return jsonify({
-                "status": "success",
-                "message": "Content updated successfully",
-                "timestamp": datetime.now().isoformat()
-            })
+        job = update_jobs.submit(trigger='api')
+        return jsonify({
+            "status": job['status'],
+            "message": "Content update queued",
+            "job_id": job['id'],
+            "status_url": url_for('update_status', job_id=job['id'], _external=True),
+            "timestamp": datetime.now().isoformat()
+        }), 202
+    except Exception as e:
+        logger.error(f"Error in update endpoint: {str(e)}")
+        traceback.print_exc()
         return jsonify({
             "status": "error",
-            "message": "Failed to update content",
+            "message": str(e),
             "timestamp": datetime.now().isoformat()
         }), 500
+
+@app.route('/api/update/<job_id>')
+def update_status(job_id):
+    """API endpoint reporting the status of a queued content update"""
+    job = update_jobs.get(job_id)
+    if job is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown update job {job_id}",
+            "timestamp": datetime.now().isoformat()
+        }), 404
+    return jsonify(job)
+
+def api_page(index_name: str, item_filter, default_exclude=(), loaders=None):
+    """Shared handler for the paginated read APIs: filters, fields, cursors and ETags"""
+    try:
+        model, version = dashboard_cache.get()
+        since = parse_date(request.args.get('since'), 'since')
+        until = parse_date(request.args.get('until'), 'until')
+        limit = parse_limit(request.args.get('limit'))
+        fields = parse_fields(request.args.get('fields'))
+
+        def render():
+            items, next_cursor = model[index_name].page(
+                cursor=request.args.get('cursor'),
+                limit=limit,
+                predicate=item_filter,
+                since=since,
+                until=until
+            )
+            next_url = None
+            if next_cursor:
+                next_url = url_for(request.endpoint, **{**request.args.to_dict(), 'cursor': next_cursor})
+            body = json.dumps({
+                "items": [select_fields(item, fields, default_exclude, loaders) for item in items],
+                "count": len(items),
+                "next_cursor": next_cursor,
+                "next_url": next_url,
+                "version": version
+            })
+            return body.encode('utf-8'), 'application/json'
+
+        key = f"{request.path}?{request.query_string.decode('utf-8')}"
+        return response_cache.respond(request, key, version, data_published_at(), render)
+    except QueryError as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.now().isoformat()
+        }), 400
     except Exception as e:
-        logger.error(f"Error in update endpoint: {str(e)}")
+        logger.error(f"Error in {request.path}: {str(e)}")
         traceback.print_exc()
         return jsonify({
             "status": "error",
@@ -221,6 +325,59 @@ def update():
             "timestamp": datetime.now().isoformat()
         }), 500
 
+@app.route('/api/news')
+def api_news():
+    """Articles, newest first: ?source=&category=&since=&until=&limit=&cursor=&fields="""
+    source = (request.args.get('source') or '').lower()
+    category = (request.args.get('category') or '').lower()
+
+    def item_filter(article):
+        if source and (article.get('source') or '').lower() != source:
+            return False
+        return not category or category in item_categories(article)
+
+    return api_page('article_index', item_filter)
+
+@app.route('/api/transcripts')
+def api_transcripts():
+    """Podcast episodes, newest first: ?source=&since=&until=&limit=&cursor=&fields= (add transcript to fields)"""
+    source = (request.args.get('source') or '').lower()
+
+    def item_filter(episode):
+        return not source or (episode.get('source') or '').lower() == source
+
+    # Transcripts and descriptions are read from the sidecar store only when requested
+    return api_page('episode_index', item_filter, default_exclude=('transcript', 'description'), loaders={
+        'transcript': podcast_scraper.load_transcript,
+        'description': podcast_scraper.load_description
+    })
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    """Latency histogram for the dashboard and the JSON APIs, labeled by route"""
+    if request.path == '/' or request.path.startswith('/api/'):
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        default_metrics.observe_request(endpoint, request.method, response.status_code,
+                                        time.perf_counter() - g.get('request_started', time.perf_counter()))
+    return response
+
+@app.route('/metrics')
+def metrics():
+    """Stage and request metrics of this process in Prometheus text format"""
+    return Response(default_metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/metrics/last-run')
+def metrics_last_run():
+    """Per-stage timing summary of the last finished content update"""
+    summary = default_metrics.last_run()
+    if summary is None:
+        return jsonify({'error': "No update has finished yet"}), 404
+    return jsonify(summary)
+
 @app.route('/test')
 def test():
     """Simple test endpoint to verify connectivity"""
@@ -237,16 +394,35 @@ def internal_error(error):
     return render_template('error.html', error="Internal server error"), 500
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Energy dashboard server")
+    parser.add_argument('--no-http-cache', action='store_true',
+                        help="Bypass the on-disk HTTP cache and re-download every page")
+    parser.add_argument('--full-refresh', action='store_true',
+                        help="Re-fetch and re-summarize every article instead of only new ones")
+    parser.add_argument('--run-once', action='store_true',
+                        help="Update content once and exit (status 0 on success, 1 on failure)")
+    parser.add_argument('--schedule', action='store_true',
+                        help="Queue content updates periodically while the server runs")
+    args = parser.parse_args()
+    
+    if args.no_http_cache:
+        web_scraper.http_cache.enabled = False
+        logger.info("HTTP cache disabled for this run")
+    
     # Create necessary directories
     os.makedirs('data', exist_ok=True)
     os.makedirs('logs', exist_ok=True)
     
-    # Initial content update - don't fail if it doesn't work
-    try:
-        update_content()
-    except Exception as e:
-        logger.warning(f"Initial content update failed: {str(e)}")
-        logger.warning("Will continue with existing content")
+    # Run-once mode: update, then exit with a status reflecting success
+    if args.run_once:
+        success = update_content(full_refresh=True if args.full_refresh else None)
+        sys.exit(0 if success else 1)
+    
+    # Initial content update runs in the background so the server starts right away
+    update_jobs.submit(trigger='startup', full_refresh=True if args.full_refresh else None)
+    
+    if args.schedule or os.getenv('ENABLE_SCHEDULER', '').lower() in ('1', 'true', 'yes'):
+        start_update_scheduler()
     
     # Get port from environment variable for hosting platforms like Heroku
     port = int(os.environ.get('PORT', 9000))
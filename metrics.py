@@ -0,0 +1,223 @@
+import json
+import os
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from snapshots import atomic_write_json
+
+# Histogram bucket upper bounds in seconds, from page fetches up to long transcriptions
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+# name -> (type, help) for everything exposed on /metrics
+METRIC_DEFINITIONS = {
+    'stage_duration_seconds': ('histogram', "Time spent in an update pipeline stage"),
+    'stage_total': ('counter', "Update pipeline stage executions by outcome"),
+    'update_runs_total': ('counter', "Content update runs by outcome"),
+    'update_last_run_timestamp_seconds': ('gauge', "Unix time the last content update finished"),
+    'update_last_run_duration_seconds': ('gauge', "Duration of the last content update"),
+    'request_duration_seconds': ('histogram', "Web request latency"),
+    'requests_total': ('counter', "Web requests by endpoint and status"),
+}
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """In-process counters and latency histograms, rendered in Prometheus text format
+
+    Pipeline stages (listing_fetch, article_fetch, extraction, summarization,
+    categorization, audio_download, transcription, llm_call, save) are timed per
+    source with stage(). Timings recorded between start_run() and finish_run() are
+    also summarized per (stage, source) and persisted as JSON, so the last update
+    run can be inspected from any process. Counters are per process (each gunicorn
+    worker has its own).
+    """
+    def __init__(self, prefix: str = 'energy_dashboard', buckets=DEFAULT_BUCKETS, summary_path: str = None):
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self.summary_path = summary_path or os.getenv('METRICS_SUMMARY_PATH', os.path.join('data', 'last_run_metrics.json'))
+        self._lock = threading.Lock()
+        self._counters = {}  # (name, labels) -> value
+        self._gauges = {}
+        self._histograms = {}  # (name, labels) -> [count per bucket..., overflow, sum, count]
+        self._run = None
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, str]) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, labels: Dict[str, str] = None, value: float = 1):
+        key = self._key(name, labels or {})
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, labels: Dict[str, str] = None):
+        with self._lock:
+            self._gauges[self._key(name, labels or {})] = value
+
+    def observe(self, name: str, value: float, labels: Dict[str, str] = None):
+        key = self._key(name, labels or {})
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(self.buckets) + 3)
+            # Counts per bucket are stored non-cumulatively and summed when rendered
+            histogram[bisect_left(self.buckets, value)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def record_stage(self, stage: str, source: str, seconds: float, outcome: str = 'ok'):
+        """Record one execution of a pipeline stage for a source"""
+        labels = {'stage': stage, 'source': source}
+        self.observe('stage_duration_seconds', seconds, labels)
+        self.inc('stage_total', {**labels, 'outcome': outcome})
+        with self._lock:
+            if self._run is not None:
+                entry = self._run['stages'].setdefault((stage, source), {
+                    'stage': stage, 'source': source, 'count': 0, 'errors': 0, 'seconds': 0.0, 'max_seconds': 0.0
+                })
+                entry['count'] += 1
+                entry['errors'] += outcome != 'ok'
+                entry['seconds'] += seconds
+                entry['max_seconds'] = max(entry['max_seconds'], seconds)
+
+    @contextmanager
+    def stage(self, stage: str, source: str = 'all'):
+        """Time the enclosed block as a pipeline stage; an exception counts as an error outcome"""
+        start = time.perf_counter()
+        outcome = 'ok'
+        try:
+            yield
+        except BaseException:
+            outcome = 'error'
+            raise
+        finally:
+            self.record_stage(stage, source or 'unknown', time.perf_counter() - start, outcome)
+
+    def observe_request(self, endpoint: str, method: str, status: int, seconds: float):
+        self.observe('request_duration_seconds', seconds, {'endpoint': endpoint, 'method': method})
+        self.inc('requests_total', {'endpoint': endpoint, 'method': method, 'status': str(status)})
+
+    def quantile(self, name: str, q: float, **labels) -> Optional[float]:
+        """Estimate a quantile of a histogram summed over the series matching labels (like histogram_quantile)"""
+        with self._lock:
+            matching = [
+                values for (series, series_labels), values in self._histograms.items()
+                if series == name and all(dict(series_labels).get(key) == value for key, value in labels.items())
+            ]
+        counts = [sum(values[idx] for values in matching) for idx in range(len(self.buckets) + 1)]
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * total
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, counts):
+            if count and cumulative + count >= rank:
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = bound
+        return self.buckets[-1]
+
+    def reset(self):
+        """Drop all recorded series (e.g. between load-test runs)"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def start_run(self):
+        """Begin collecting the per-stage summary of an update run"""
+        with self._lock:
+            self._run = {'started_at': datetime.now(timezone.utc), 'start': time.perf_counter(), 'stages': {}}
+
+    def finish_run(self, success: bool) -> Optional[Dict]:
+        """Close the current run, update the run metrics and persist its JSON summary"""
+        with self._lock:
+            run, self._run = self._run, None
+        if run is None:
+            return None
+        duration = time.perf_counter() - run['start']
+        stages = sorted(run['stages'].values(), key=lambda entry: (-entry['seconds'], entry['stage'], entry['source']))
+        for entry in stages:
+            entry['seconds'] = round(entry['seconds'], 4)
+            entry['max_seconds'] = round(entry['max_seconds'], 4)
+        summary = {
+            'started_at': run['started_at'].isoformat(),
+            'finished_at': datetime.now(timezone.utc).isoformat(),
+            'duration_seconds': round(duration, 4),
+            'success': success,
+            'stages': stages
+        }
+        self.inc('update_runs_total', {'outcome': 'success' if success else 'failure'})
+        self.set('update_last_run_timestamp_seconds', time.time())
+        self.set('update_last_run_duration_seconds', duration)
+        try:
+            atomic_write_json(self.summary_path, summary)
+        except Exception as e:
+            print(f"Error saving run metrics: {str(e)}")
+            traceback.print_exc()
+        return summary
+
+    def last_run(self) -> Optional[Dict]:
+        """JSON summary of the last finished update run (from disk, so any process can serve it)"""
+        try:
+            with open(self.summary_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def render_prometheus(self) -> str:
+        """All series in the Prometheus text exposition format"""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = {key: list(values) for key, values in self._histograms.items()}
+
+        lines = []
+        for name, (metric_type, help_text) in METRIC_DEFINITIONS.items():
+            full_name = f"{self.prefix}_{name}"
+            series = {'counter': counters, 'gauge': gauges, 'histogram': histograms}[metric_type]
+            keys = sorted(key for key in series if key[0] == name)
+            if not keys:
+                continue
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+            for key in keys:
+                labels = key[1]
+                if metric_type != 'histogram':
+                    lines.append(f"{full_name}{_format_labels(labels)} {_format_value(series[key])}")
+                    continue
+                values = series[key]
+                cumulative = 0
+                for bound, count in zip(self.buckets, values):
+                    cumulative += count
+                    lines.append(f"{full_name}_bucket{_format_labels(labels, (('le', _format_value(float(bound))),))} {cumulative}")
+                lines.append(f"{full_name}_bucket{_format_labels(labels, (('le', '+Inf'),))} {values[-1]}")
+                lines.append(f"{full_name}_sum{_format_labels(labels)} {_format_value(float(values[-2]))}")
+                lines.append(f"{full_name}_count{_format_labels(labels)} {values[-1]}")
+        return '\n'.join(lines) + '\n'
+
+
+# Shared instance so the scrapers, the update job and the web app record into one registry
+default_metrics = Metrics()
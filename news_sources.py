@@ -0,0 +1,88 @@
+"""
+Registry of news sources scraped by WebScraper.scrape_sources.
+
+Each source is declared once: its RSS/Atom feed, its listing page with the
+CSS selectors for listing items and their title, link and date, and the key of
+its entry in WebScraper.site_selectors (used to extract the full article). More
+sources can be added without code changes through a JSON file named by
+NEWS_SOURCES_FILE holding a list of entries in the same format.
+"""
+
+import json
+import os
+import traceback
+from typing import Dict, List, Optional
+
+# Built-in sources. 'feed' (RSS/Atom) is polled first; the listing page and its
+# selectors are the fallback when the feed is missing or unusable. Paths starting with
+# '/' are relative to 'base_url', which the 'base_url_env' variable overrides (e.g. to
+# point at a local stand-in server). Selector lists are tried in order until one
+# matches; optional fields are 'date' (defaults to the site_selectors entry for
+# 'site'), 'max_age_days' (7) and 'timeout' (SOURCE_TIMEOUT)
+NEWS_SOURCES = [
+    {
+        'name': 'Canary Media',
+        'base_url': 'https://www.canarymedia.com',
+        'base_url_env': 'CANARY_MEDIA_BASE_URL',
+        'feed': '/rss.rss',
+        'listing_url': '/',
+        'site': 'canarymedia.com',
+        'item': ['article', 'div.article', 'div.post'],
+        'title': ['h2', 'h3', 'div.title'],
+        'link': ['a[href]'],
+    },
+    {
+        'name': 'Utility Dive',
+        'base_url': 'https://www.utilitydive.com',
+        'base_url_env': 'UTILITY_DIVE_BASE_URL',
+        'feed': '/feeds/news/',
+        'listing_url': '/',
+        'site': 'utilitydive.com',
+        'item': ['div.feed__item', 'div.article-card', 'article'],
+        'title': ['h3', 'h2', 'div.title'],
+        'link': ['a[href]'],
+    },
+]
+
+# A source needs a feed, or a listing page with its selectors (or both)
+LISTING_FIELDS = ('listing_url', 'item', 'title', 'link')
+
+
+def source_timeout() -> float:
+    """Seconds a single source may take (listing plus article fetches) before its results are cut off"""
+    return float(os.getenv('SOURCE_TIMEOUT', '60'))
+
+
+def resolve_urls(source: Dict) -> Dict:
+    """Copy of a source with its '/'-relative feed and listing paths joined to its base URL"""
+    base_url = os.getenv(source['base_url_env'], '') if source.get('base_url_env') else ''
+    base_url = (base_url or source.get('base_url') or '').rstrip('/')
+    resolved = dict(source)
+    for field in ('feed', 'listing_url'):
+        if base_url and (resolved.get(field) or '').startswith('/'):
+            resolved[field] = base_url + resolved[field]
+    return resolved
+
+
+def load_sources(path: str = None) -> List[Dict]:
+    """Built-in sources plus any declared in NEWS_SOURCES_FILE (same name replaces a built-in)"""
+    sources = {source['name']: source for source in NEWS_SOURCES}
+    path = path or os.getenv('NEWS_SOURCES_FILE')
+    if path:
+        try:
+            with open(path, 'r') as f:
+                extra_sources = json.load(f)
+            for source in extra_sources:
+                missing = [field for field in LISTING_FIELDS if not source.get(field)]
+                if not source.get('name') or (missing and not source.get('feed')):
+                    print(f"Skipping news source {source.get('name', '?')}: needs a name and a feed or {', '.join(missing)}")
+                    continue
+                sources[source['name']] = source
+        except Exception as e:
+            print(f"Error loading news sources from {path}: {str(e)}")
+            traceback.print_exc()
+    return [resolve_urls(source) for source in sources.values()]
+
+
+def get_source(name: str, sources: List[Dict] = None) -> Optional[Dict]:
+    return next((source for source in sources or load_sources() if source['name'] == name), None)
@@ -0,0 +1,121 @@
+"""
+NLTK resources loaded lazily from local data only.
+
+Nothing here downloads. Install the data ahead of time with
+`python -m nltk.downloader punkt punkt_tab stopwords`; when it is missing
+a built-in English stopword list and a regex sentence splitter are used.
+"""
+
+import importlib.util
+import re
+import threading
+from typing import Callable, FrozenSet, List
+
+# NLTK's English stopword list, used when the corpus is not installed
+ENGLISH_STOP_WORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours yourself
+yourselves he him his himself she she's her hers herself it it's its itself they them their
+theirs themselves what which who whom this that that'll these those am is are was were be
+been being have has had having do does did doing a an the and but if or because as until
+while of at by for with about against between into through during before after above below
+to from up down in out on off over under again further then once here there when where why
+how all any both each few more most other some such no nor not only own same so than too
+very s t can will just don don't should should've now d ll m o re ve y ain aren aren't
+couldn couldn't didn didn't doesn doesn't hadn hadn't hasn hasn't haven haven't isn isn't
+ma mightn mightn't mustn mustn't needn needn't shan shan't shouldn shouldn't wasn wasn't
+weren weren't won won't wouldn wouldn't
+""".split())
+
+# Sentence-ending punctuation (plus closing quotes/brackets) followed by a likely sentence start
+SENTENCE_END_RE = re.compile(r'[.!?]["\'”’)\]]*(?=\s+["\'“‘(\[]?[A-Z0-9])')
+
+# Abbreviations that end in a period without ending the sentence
+ABBREVIATIONS = {
+    'mr.', 'mrs.', 'ms.', 'dr.', 'prof.', 'sr.', 'jr.', 'st.', 'gov.', 'sen.', 'rep.', 'gen.',
+    'inc.', 'corp.', 'co.', 'ltd.', 'llc.', 'vs.', 'no.', 'u.s.', 'u.k.', 'e.g.', 'i.e.',
+    'jan.', 'feb.', 'mar.', 'apr.', 'jun.', 'jul.', 'aug.', 'sep.', 'sept.', 'oct.', 'nov.', 'dec.'
+}
+
+_lock = threading.Lock()
+_stop_words = None
+_sentence_splitter = None
+
+
+def has_nltk_resource(resource: str) -> bool:
+    """Whether an NLTK data resource is installed locally (never downloads)"""
+    if importlib.util.find_spec('nltk') is None:
+        return False
+    import nltk
+
+    try:
+        nltk.data.find(resource)
+        return True
+    except LookupError:
+        return False
+
+
+def regex_sent_tokenize(text: str) -> List[str]:
+    """Split text into sentences on terminal punctuation, skipping common abbreviations"""
+    sentences = []
+    start = 0
+    for match in SENTENCE_END_RE.finditer(text):
+        end = match.end()
+        last_word = text[start:end].rsplit(None, 1)[-1].lower()
+        # Known abbreviations and initials like "J." do not end a sentence
+        if last_word in ABBREVIATIONS or (len(last_word) == 2 and last_word[0].isalpha()):
+            continue
+        sentence = text[start:end].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = end
+    remainder = text[start:].strip()
+    if remainder:
+        sentences.append(remainder)
+    return sentences
+
+
+def _resolve_sentence_splitter() -> Callable[[str], List[str]]:
+    # Newer NLTK releases read punkt_tab, older ones the pickled punkt model
+    if has_nltk_resource('tokenizers/punkt_tab/english/') or has_nltk_resource('tokenizers/punkt/english.pickle'):
+        from nltk.tokenize import sent_tokenize as nltk_sent_tokenize
+
+        try:
+            nltk_sent_tokenize("Probe sentence. Another one.")
+            return nltk_sent_tokenize
+        except LookupError:
+            pass
+    print("NLTK punkt data not found locally; using the built-in sentence splitter.")
+    return regex_sent_tokenize
+
+
+def sentence_splitter() -> Callable[[str], List[str]]:
+    """NLTK's punkt tokenizer if installed, otherwise the regex splitter (resolved once)"""
+    global _sentence_splitter
+    if _sentence_splitter is None:
+        with _lock:
+            if _sentence_splitter is None:
+                _sentence_splitter = _resolve_sentence_splitter()
+    return _sentence_splitter
+
+
+def sent_tokenize(text: str) -> List[str]:
+    """Split text into sentences"""
+    return sentence_splitter()(text)
+
+
+def english_stop_words() -> FrozenSet[str]:
+    """NLTK's English stopwords if the corpus is installed, otherwise the built-in copy"""
+    global _stop_words
+    if _stop_words is None:
+        with _lock:
+            if _stop_words is None:
+                stop_words = ENGLISH_STOP_WORDS
+                if has_nltk_resource('corpora/stopwords'):
+                    try:
+                        from nltk.corpus import stopwords
+
+                        stop_words = frozenset(stopwords.words('english'))
+                    except (LookupError, OSError):
+                        pass
+                _stop_words = stop_words
+    return _stop_words
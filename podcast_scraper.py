@@ -1,159 +1,83 @@
 import requests
 from datetime import datetime, timedelta
-import json
 import os
-from typing import Dict, List
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
+import queue
+import tempfile
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
 import traceback
-import re
-import feedparser
-import openai
+from contextlib import closing
+from dedup import NearDuplicateIndex
+from summary_engine import ExtractiveSummarizer
+from summary_cache import default_summary_cache
+from transcript_store import TranscriptStore
+from transcription_engine import TranscriptionEngine
+from content_store import ContentCollection, open_content_store
+from snapshots import default_snapshot_store
+from metrics import default_metrics
+
+# Placeholder transcripts recorded when no real transcript could be produced
+TRANSCRIPT_PLACEHOLDERS = [
+    "Audio URL not found or transcription skipped.",
+    "Audio download failed.",
+    "Transcription failed.",
+    "Transcription failed or model not loaded."
+]
+
+# Results of summarize_transcript_with_llm that are not a summary; the transcript is
+# summarized with NLTK instead, and (except for too-short transcripts) the LLM is tried again next run
+LLM_SUMMARY_FAILURES = [
+    "Summary not available.",
+    "LLM Summary not available (API key missing).",
+    "LLM summary generation failed.",
+    "LLM summary failed due to rate limit."
+]
 
 class PodcastScraper:
     def __init__(self): # Removed client_id and client_secret
         """Initialize Podcast Scraper"""
-        nltk.download('punkt', quiet=True)
-        nltk.download('stopwords', quiet=True)
-        self.stop_words = set(stopwords.words('english'))
-        self.rss_feed_url = "https://feeds.megaphone.fm/catalyst"
-        self.whisper_model = None # To be loaded on demand
-
-    def _load_whisper_model(self):
-        import whisper # <-- IMPORT WHISPER HERE
-        if self.whisper_model is None:
-            try:
-                print("Loading Whisper model (base.en)... This might take a moment on first run.")
-                self.whisper_model = whisper.load_model("base.en")
-                print("Whisper model loaded successfully.")
-            except Exception as e:
-                print(f"Error loading Whisper model: {str(e)}")
-                traceback.print_exc()
-                # Potentially raise an error or handle it so transcription is skipped
-        return self.whisper_model
-
-    def summarize_text(self, text: str, num_sentences: int = 4) -> str:
+        # NLTK stopwords and punkt are read from local data on first use; nothing is downloaded
+        self.summarizer = ExtractiveSummarizer()
+        self.summary_cache = default_summary_cache
+        self.metrics = default_metrics
+        self.rss_feed_url = os.getenv('PODCAST_RSS_URL', "https://feeds.megaphone.fm/catalyst")
+        # Whisper runs on a worker pool (WHISPER_WORKERS); the model loads on demand
+        self.transcriber = TranscriptionEngine()
+        
+        # Audio is streamed to disk; PODCAST_PREFETCH episodes may wait downloaded ahead of transcription
+        self.session = requests.Session()
+        self.prefetch_episodes = max(1, int(os.getenv('PODCAST_PREFETCH', '1')))
+        self.download_chunk_size = 1024 * 1024
+        
+        # Transcripts already produced, keyed by GUID and enclosure URL/length
+        self.transcript_store = TranscriptStore()
+        
+        # SQLite content store when STORAGE_BACKEND=sqlite; JSON files otherwise
+        self.content_store = open_content_store()
+        self.snapshots = default_snapshot_store
+        self.episode_storage = ContentCollection('episodes', self.content_store, self.snapshots, self.metrics, 'podcasts',
+                                                 'PODCAST_DAYS_FILTER', 30)
+
+    def summarize_text(self, text: str, num_sentences: int = 4, source: str = 'podcasts') -> str:
         """Generate a high-quality summary focused on key information"""
         try:
-            # If content is too short, return it as is
-            if len(text) < 200:
-                return text
-                
-            # Tokenize content into sentences
-            sentences = sent_tokenize(text)
-            if len(sentences) <= num_sentences:
-                return text
-            
-            # Define keywords related to important energy sector developments
-            energy_keywords = {
-                # Business and financial terms
-                'acquisition': 3.0, 'merger': 3.0, 'investment': 2.5, 'funding': 2.5, 
-                'billion': 2.5, 'million': 2.0, 'profit': 2.0, 'revenue': 2.0, 'growth': 2.0,
-                'budget': 2.0, 'cost': 1.5, 'price': 1.5, 'market': 1.5, 'stock': 1.5,
-                
-                # Technology and innovation
-                'innovation': 3.0, 'technology': 2.5, 'breakthrough': 3.0, 'efficiency': 2.5, 
-                'development': 2.0, 'research': 2.0, 'discovery': 2.5, 'patent': 2.5,
-                'prototype': 2.5, 'launch': 2.0, 'announce': 2.0, 'introduce': 2.0,
-                
-                # Energy sources
-                'renewable': 2.5, 'solar': 2.0, 'wind': 2.0, 'hydro': 2.0, 'nuclear': 2.0,
-                'battery': 2.5, 'storage': 2.5, 'grid': 2.0, 'power': 1.5, 'electricity': 1.5,
-                'energy': 1.5, 'oil': 1.5, 'gas': 1.5, 'coal': 1.5, 'hydrogen': 2.5,
-                
-                # Policy and regulation
-                'policy': 2.5, 'regulation': 2.5, 'law': 2.5, 'legislation': 2.5, 
-                'government': 2.0, 'epa': 2.5, 'subsidy': 2.5, 'incentive': 2.5,
-                'tax': 2.0, 'carbon': 2.5, 'emissions': 2.5, 'climate': 2.0,
-                
-                # Key events and time indicators
-                'announce': 2.0, 'report': 2.0, 'release': 2.0, 'unveil': 2.5,
-                'today': 2.0, 'yesterday': 2.0, 'week': 1.5, 'month': 1.5, 'year': 1.5
-            }
-            
-            # Tokenize words and remove stopwords
-            words = word_tokenize(text.lower())
-            words = [word for word in words if word.isalnum() and word not in self.stop_words]
-            
-            # Calculate word frequencies
-            freq_dist = {}
-            for word in words:
-                freq_dist[word] = freq_dist.get(word, 0) + 1
-            
-            max_freq = max(freq_dist.values()) if freq_dist else 1
-            
-            # Score sentences based on multiple factors
-            sentence_scores = {}
-            entity_pattern = r'([A-Z][a-z]+ )+(?:Inc\.?|LLC|Ltd\.?|Corp\.?|Corporation|Company|Group|Technologies|Energy|Solar|Wind|Power)'
-            
-            for idx, sentence in enumerate(sentences):
-                # Position weights (first few and last few sentences often contain key info)
-                position_weight = 1.5 if idx < 2 or idx > len(sentences) - 3 else 1.0
-                
-                # Presence of entities (companies, organizations)
-                entity_weight = 1.5 if re.search(entity_pattern, sentence) else 1.0
-                
-                # Length weight (prefer medium-sized sentences)
-                length = len(sentence.split())
-                length_weight = 1.2 if 10 <= length <= 25 else 0.8 if length > 40 else 1.0
-                
-                # Calculate base score from word frequencies
-                score = 0
-                for word in word_tokenize(sentence.lower()):
-                    # Apply special weighting for energy sector keywords
-                    if word in energy_keywords:
-                        score += freq_dist.get(word, 0) * energy_keywords[word]
-                    elif word in freq_dist:
-                        score += freq_dist[word]
-                
-                # Normalize score by sentence length to avoid favoring long sentences
-                base_score = score / max(1, length)
-                
-                # Apply all weights
-                sentence_scores[sentence] = base_score * position_weight * entity_weight * length_weight
-                
-                # Boost sentences containing numbers (often indicate key metrics)
-                if re.search(r'\d+', sentence):
-                    sentence_scores[sentence] *= 1.3
-                
-                # Boost sentences with quotes (often contain important statements)
-                if re.search(r'"[^"]+"', sentence) or re.search(r"'[^']+'", sentence):
-                    sentence_scores[sentence] *= 1.4
-            
-            # Get top sentences and sort them by original order
-            top_sentences = sorted(
-                sentence_scores.items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:num_sentences]
-            
-            top_sentences.sort(key=lambda x: sentences.index(x[0]))
-            
-            # Create cohesive summary
-            summary = ' '.join(sentence for sentence, _ in top_sentences)
-            
-            # If the summary is too short, add more sentences
-            if len(summary) < 200 and len(sentences) > num_sentences:
-                additional_sentences = sorted(
-                    [(s, score) for s, score in sentence_scores.items() if s not in [sent for sent, _ in top_sentences]],
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:2]
-                
-                # Add these sentences in original order
-                all_sentences = top_sentences + additional_sentences
-                all_sentences.sort(key=lambda x: sentences.index(x[0]))
-                summary = ' '.join(sentence for sentence, _ in all_sentences)
-            
+            with self.metrics.stage('summarization', source):
+                cache_key = self.summary_cache.make_key(text, self.summarizer.name, num_sentences=num_sentences)
+                summary = self.summary_cache.get(cache_key)
+                if summary is None:
+                    summary = self.summarizer.summarize(text, num_sentences)
+                    self.summary_cache.set(cache_key, summary)
             return summary
         except Exception as e:
             print(f"Error in summarization: {str(e)}")
             traceback.print_exc()
             return text[:300] + '...' if len(text) > 300 else text
     
-    def get_latest_episodes(self, limit: int = 5) -> List[Dict]: # Reduced limit for testing/daily runs
+    def get_latest_episodes(self, limit: int = 5, known_episodes: List[Dict] = None) -> List[Dict]: # Reduced limit for testing/daily runs
         """Get latest podcast episodes from RSS, download audio, and transcribe."""
+        import feedparser
+
         print(f"Fetching podcast episodes from RSS feed: {self.rss_feed_url}")
         feed = feedparser.parse(self.rss_feed_url)
         
@@ -161,106 +85,219 @@ class PodcastScraper:
             print(f"Error parsing RSS feed: {feed.bozo_exception}")
             return []
 
-        episodes_data = []
-        model = self._load_whisper_model()
-        if not model:
-            print("Whisper model not loaded, cannot transcribe. Returning episodes without transcripts.")
-            # Fallback to just getting metadata if transcription fails to load
-            for entry in feed.entries[:limit]:
-                release_date_parsed = datetime(*entry.published_parsed[:6]) if hasattr(entry, 'published_parsed') else datetime.now()
-                episodes_data.append({
-                    'title': entry.title if hasattr(entry, 'title') else "Untitled Episode",
-                    'description': entry.summary if hasattr(entry, 'summary') else "",
-                    'summary': self.summarize_text(entry.summary if hasattr(entry, 'summary') else ""),
-                    'release_date': release_date_parsed.strftime('%Y-%m-%d'),
-                    'duration_ms': 0, # Not easily available from all RSS, can parse entry.itunes_duration
-                    'url': entry.link if hasattr(entry, 'link') else "",
-                    'audio_url': next((link.href for link in entry.links if link.type.startswith('audio/')), None),
-                    'transcript': "Transcription failed or model not loaded.",
-                    'source': feed.feed.title if hasattr(feed.feed, 'title') else 'Catalyst Podcast RSS',
-                    'timestamp': datetime.now().isoformat()
-                })
-            return self.filter_recent_episodes(episodes_data)
-
-        for entry in feed.entries[:limit]:
-            print(f"Processing episode: {entry.title if hasattr(entry, 'title') else 'Untitled'}")
-            audio_url = None
-            if hasattr(entry, 'enclosures'):
-                for enclosure in entry.enclosures:
-                    if enclosure.type.startswith('audio/'):
-                        audio_url = enclosure.href
-                        break
-            
-            if not audio_url: # Fallback to links if no enclosure
-                 if hasattr(entry, 'links'):
-                    audio_url = next((link.href for link in entry.links if link.type.startswith('audio/')), None)
-
-            transcript_text = "Audio URL not found or transcription skipped."
-            description_text = entry.summary if hasattr(entry, 'summary') else ""
-            current_summary = "Summary not generated." # Default
-
-            if audio_url:
-                try:
-                    print(f"Downloading audio from: {audio_url}")
-                    audio_response = requests.get(audio_url, timeout=30) # Increased timeout
-                    audio_response.raise_for_status()
-                    
-                    # Save temporary audio file
-                    temp_audio_filename = "temp_podcast_audio.m4a" # Or determine extension
-                    with open(temp_audio_filename, 'wb') as f:
-                        f.write(audio_response.content)
-                    print(f"Audio downloaded to {temp_audio_filename}")
-
-                    print("Starting transcription...")
-                    # Ensure API key is set if using OpenAI's API directly (Whisper model might use it implicitly)
-                    # openai.api_key = os.getenv("OPENAI_API_KEY") # Uncomment if direct API calls are made elsewhere for transcription
-                    result = model.transcribe(temp_audio_filename)
-                    transcript_text = result["text"]
-                    print("Transcription complete.")
-                    
-                    os.remove(temp_audio_filename) # Clean up
-                    print(f"Temporary audio file {temp_audio_filename} removed.")
-
-                except requests.exceptions.RequestException as req_e:
-                    print(f"Error downloading audio for {entry.title if hasattr(entry, 'title') else 'Untitled'}: {str(req_e)}")
-                    traceback.print_exc() # Add traceback for download errors
-                    transcript_text = "Audio download failed."
-                except Exception as e:
-                    print(f"Error during transcription for {entry.title if hasattr(entry, 'title') else 'Untitled'}: {type(e).__name__} - {str(e)}")
-                    traceback.print_exc()  # This will print the full traceback
-                    transcript_text = "Transcription failed."
-                    if os.path.exists("temp_podcast_audio.m4a"):
-                        os.remove("temp_podcast_audio.m4a")
-
-            if transcript_text and transcript_text not in ["Audio URL not found or transcription skipped.", "Audio download failed.", "Transcription failed.", "Transcription failed or model not loaded."]:
-                print(f"Attempting LLM summary from transcript for: {entry.title if hasattr(entry, 'title') else 'Untitled'}")
-                current_summary = self.summarize_transcript_with_llm(transcript_text)
+        source = feed.feed.title if hasattr(feed.feed, 'title') else 'Catalyst Podcast RSS'
+        entries = feed.entries[:limit]
+        
+        # Episodes saved under an older key (e.g. before transcripts were keyed by GUID),
+        # matched by page URL and title
+        legacy_episodes = {
+            (episode.get('url'), episode.get('title')): episode
+            for episode in (known_episodes or [])
+            if episode.get('episode_key') and episode.get('has_transcript')
+        }
+        
+        try:
+            # Reuse stored transcripts; only new episodes or ones whose audio changed are transcribed
+            identities = []
+            stored_records = []
+            for entry in entries:
+                audio_url, audio_length = self._find_audio_enclosure(entry)
+                guid = entry.get('id') or entry.get('link') or audio_url
+                key = self.transcript_store.episode_key(guid, audio_url, audio_length)
+                record = self.transcript_store.get(key)
+                if record is None or not record.get('has_transcript'):
+                    record = None
+                    legacy = legacy_episodes.get((entry.get('link', audio_url), entry.get('title', "Untitled Episode")))
+                    if legacy and legacy['episode_key'] != key:
+                        transcript = self.transcript_store.load_transcript(legacy['episode_key'])
+                        if transcript:
+                            self.transcript_store.put(key, transcript, legacy.get('summary', ''),
+                                                      entry.get('summary', ''), guid=guid, audio_url=audio_url)
+                            record = self.transcript_store.get(key)
+                identities.append((guid, audio_url, audio_length, key))
+                stored_records.append(record)
+        
+            to_transcribe = [audio_url if record is None else None for (_, audio_url, _, _), record in zip(identities, stored_records)]
+            print(f"{len(entries) - sum(1 for url in to_transcribe if url)} episodes reuse stored transcripts, "
+                  f"{sum(1 for url in to_transcribe if url)} need transcription")
+        
+            # Only pay for loading Whisper when something actually needs transcribing
+            can_transcribe = any(to_transcribe) and self.transcriber.ensure_ready()
+            if any(to_transcribe) and not can_transcribe:
+                print("Whisper model not loaded, cannot transcribe new episodes.")
+                to_transcribe = [None] * len(entries)
+
+            episodes_data = []
+            # Audio for the next episodes downloads in the background while the current one transcribes
+            with closing(self._prefetch_audio(to_transcribe, source)) as prefetched:
+                for entry, (guid, audio_url, audio_length, key), record, (audio_path, download_error) in zip(
+                        entries, identities, stored_records, prefetched):
+                    print(f"Processing episode: {entry.title if hasattr(entry, 'title') else 'Untitled'}")
+
+                    transcript_text = "Audio URL not found or transcription skipped."
+                    description_text = entry.summary if hasattr(entry, 'summary') else ""
+                    current_summary = "Summary not generated." # Default
+                    retry_summary = False
+
+                    if record is not None:
+                        print("Reusing stored transcript.")
+                        # Summaries stored before failures were kept out of the store are regenerated too
+                        current_summary = record['summary'] if record['summary'] not in LLM_SUMMARY_FAILURES else ''
+                        # The full text is only read back if the summary has to be regenerated
+                        if not current_summary:
+                            transcript_text = self.transcript_store.load_transcript(key) or transcript_text
+                    elif download_error is not None:
+                        print(f"Error downloading audio for {entry.title if hasattr(entry, 'title') else 'Untitled'}: {str(download_error)}")
+                        transcript_text = "Audio download failed."
+                    elif audio_url and not can_transcribe:
+                        transcript_text = "Transcription failed or model not loaded."
+                    elif audio_path:
+                        try:
+                            print(f"Starting transcription of {audio_path}...")
+                            with self.metrics.stage('transcription', source):
+                                result = self.transcriber.transcribe(audio_path)
+                            transcript_text = result["text"]
+                            print("Transcription complete.")
+                        except Exception as e:
+                            print(f"Error during transcription for {entry.title if hasattr(entry, 'title') else 'Untitled'}: {type(e).__name__} - {str(e)}")
+                            traceback.print_exc()  # This will print the full traceback
+                            transcript_text = "Transcription failed."
+                        finally:
+                            self._remove_audio(audio_path)
+
+                    if record is not None and current_summary:
+                        print("Reusing stored summary.")
+                    elif transcript_text and transcript_text not in TRANSCRIPT_PLACEHOLDERS:
+                        print(f"Attempting LLM summary from transcript for: {entry.title if hasattr(entry, 'title') else 'Untitled'}")
+                        current_summary = self.summarize_transcript_with_llm(transcript_text, source)
                 
-                # Fallback to NLTK summary of transcript if LLM summary failed or wasn't suitable
-                if current_summary in ["Summary not available.", "LLM Summary not available (API key missing).", "LLM summary generation failed."]:
-                    print(f"LLM summary failed or not suitable. Falling back to NLTK summary of transcript for: {entry.title if hasattr(entry, 'title') else 'Untitled'}")
-                    current_summary = self.summarize_text(transcript_text, num_sentences=5)
-            else:
-                # Fallback to summarizing the original description if transcript is unavailable
-                print(f"Transcript not available. Generating summary from description for: {entry.title if hasattr(entry, 'title') else 'Untitled'}")
-                current_summary = self.summarize_text(description_text, num_sentences=3)
-
-            release_date_parsed = datetime(*entry.published_parsed[:6]) if hasattr(entry, 'published_parsed') else datetime.now()
-            
-            episodes_data.append({
-                'title': entry.title if hasattr(entry, 'title') else "Untitled Episode",
-                'description': description_text, # Keep original description
-                'summary': current_summary, # This will now prioritize LLM summary
-                'transcript': transcript_text,
-                'release_date': release_date_parsed.strftime('%Y-%m-%d'),
-                'duration_ms': self.parse_duration(getattr(entry, 'itunes_duration', '0')) * 1000,
-                'url': entry.link if hasattr(entry, 'link') else audio_url, 
-                'source': feed.feed.title if hasattr(feed.feed, 'title') else 'Catalyst Podcast RSS',
-                'timestamp': datetime.now().isoformat()
-            })
+                        # Fallback to NLTK summary of transcript if LLM summary failed or wasn't suitable
+                        if current_summary in LLM_SUMMARY_FAILURES:
+                            print(f"LLM summary failed or not suitable. Falling back to NLTK summary of transcript for: {entry.title if hasattr(entry, 'title') else 'Untitled'}")
+                            retry_summary = current_summary != "Summary not available."
+                            current_summary = self.summarize_text(transcript_text, num_sentences=5, source=source)
+                    else:
+                        # Fallback to summarizing the original description if transcript is unavailable
+                        print(f"Transcript not available. Generating summary from description for: {entry.title if hasattr(entry, 'title') else 'Untitled'}")
+                        current_summary = self.summarize_text(description_text, num_sentences=3, source=source)
 
+                    # Long text goes to the sidecar store; episodes with a transcript are skipped on later runs.
+                    # A fallback summary after a failed LLM call is stored empty so the next run retries it
+                    stored_summary = '' if retry_summary else current_summary
+                    if record is None:
+                        has_transcript = transcript_text not in TRANSCRIPT_PLACEHOLDERS
+                        self.transcript_store.put(key, transcript_text if has_transcript else None, stored_summary,
+                                                  description_text, guid=guid, audio_url=audio_url)
+                    else:
+                        has_transcript = True
+                        if stored_summary != record['summary'] and transcript_text not in TRANSCRIPT_PLACEHOLDERS:
+                            # Summary was regenerated from the stored transcript loaded above
+                            self.transcript_store.put(key, transcript_text, stored_summary,
+                                                      description_text, guid=guid, audio_url=audio_url)
+
+                    release_date_parsed = datetime(*entry.published_parsed[:6]) if hasattr(entry, 'published_parsed') else datetime.now()
+            
+                    episodes_data.append({
+                        'title': entry.title if hasattr(entry, 'title') else "Untitled Episode",
+                        'description': description_text, # Keep original description
+                        'summary': current_summary, # This will now prioritize LLM summary
+                        'has_transcript': has_transcript,
+                        'release_date': release_date_parsed.strftime('%Y-%m-%d'),
+                        'duration_ms': self.parse_duration(getattr(entry, 'itunes_duration', '0')) * 1000,
+                        'url': entry.link if hasattr(entry, 'link') else audio_url, 
+                        'audio_url': audio_url,
+                        'guid': guid,
+                        'episode_key': key,
+                        'source': source,
+                        'timestamp': datetime.now().isoformat()
+                    })
+        finally:
+            # Release the worker processes and the models they hold until the next run, even on errors
+            self.transcriber.close()
+            self.transcript_store.save()
         return self.filter_recent_episodes(episodes_data) # Apply existing filter
 
+    def _find_audio_enclosure(self, entry) -> Tuple[Optional[str], Optional[str]]:
+        """Audio enclosure URL and length of a feed entry, falling back to its audio links"""
+        if hasattr(entry, 'enclosures'):
+            for enclosure in entry.enclosures:
+                if enclosure.type.startswith('audio/'):
+                    return enclosure.href, enclosure.get('length')
+        if hasattr(entry, 'links'):
+            return next((link.href for link in entry.links if link.type.startswith('audio/')), None), None
+        return None, None
+
+    def download_audio(self, audio_url: str, source: str = 'podcasts') -> str:
+        """Stream an episode's audio to a unique temporary file and return its path"""
+        extension = os.path.splitext(urlparse(audio_url).path)[1] or '.mp3'
+        temp_file = tempfile.NamedTemporaryFile(prefix='podcast_audio_', suffix=extension, delete=False)
+        try:
+            print(f"Downloading audio from: {audio_url}")
+            with self.metrics.stage('audio_download', source), temp_file, \
+                    self.session.get(audio_url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=self.download_chunk_size):
+                    temp_file.write(chunk)
+            print(f"Audio downloaded to {temp_file.name}")
+            return temp_file.name
+        except Exception:
+            self._remove_audio(temp_file.name)
+            raise
+
+    def _remove_audio(self, audio_path: str):
+        try:
+            os.remove(audio_path)
+            print(f"Temporary audio file {audio_path} removed.")
+        except OSError:
+            pass
+
+    def _prefetch_audio(self, audio_urls: List[Optional[str]],
+                        source: str = 'podcasts') -> Iterator[Tuple[Optional[str], Optional[Exception]]]:
+        """Yield (audio_path, download_error) per URL in order, downloading at most prefetch_episodes ahead"""
+        ready = queue.Queue()
+        # One slot per episode being downloaded or waiting in the queue
+        slots = threading.Semaphore(self.prefetch_episodes)
+        stop = threading.Event()
+        handoff = threading.Lock()
+
+        def producer():
+            for audio_url in audio_urls:
+                # Wait for a free slot, but give up if the consumer went away
+                while not slots.acquire(timeout=0.5):
+                    if stop.is_set():
+                        return
+                item = (None, None)
+                if audio_url and not stop.is_set():
+                    try:
+                        item = (self.download_audio(audio_url, source), None)
+                    except Exception as e:
+                        item = (None, e)
+                with handoff:
+                    if stop.is_set():
+                        # Nobody will consume this download any more
+                        if item[0]:
+                            self._remove_audio(item[0])
+                        return
+                    ready.put(item)
+
+        downloader = threading.Thread(target=producer, name='podcast-audio-prefetch', daemon=True)
+        downloader.start()
+        try:
+            for _ in audio_urls:
+                item = ready.get()
+                slots.release()
+                yield item
+        finally:
+            # Consumer stopped early: the producer deletes whatever it fetches from now on,
+            # and anything it queued before is deleted here once it has exited
+            with handoff:
+                stop.set()
+            downloader.join(timeout=60)
+            while not ready.empty():
+                audio_path, _ = ready.get_nowait()
+                if audio_path:
+                    self._remove_audio(audio_path)
+
     def parse_duration(self, duration_str: str) -> int:
         """Parse itunes:duration string (HH:MM:SS, MM:SS, or S) into seconds."""
         parts = list(map(int, duration_str.split(':')))
@@ -273,7 +310,8 @@ class PodcastScraper:
             seconds = parts[0]
         return seconds
 
-    def filter_recent_episodes(self, episodes: List[Dict], days: int = 30) -> List[Dict]:
+    def filter_recent_episodes(self, episodes: List[Dict], days: int = 30,
+                               dedup_index: NearDuplicateIndex = None) -> List[Dict]:
         """Filter and deduplicate recent episodes"""
         try:
             # Convert dates to datetime objects if they are strings
@@ -296,24 +334,15 @@ class PodcastScraper:
                 if episode.get('release_date_dt', datetime.now()) >= cutoff_date # Use .get for safety
             ]
 
-            # Deduplicate similar content (simple title check for now)
+            # Deduplicate similar content with a MinHash/LSH index over title and
+            # description shingles; a persisted index also catches repeats from past runs
+            if dedup_index is None:
+                dedup_index = NearDuplicateIndex()
             unique_episodes = []
-            seen_titles = set()
             for episode in recent_episodes:
-                simple_title = ''.join(c.lower() for c in episode['title'] if c.isalnum())
-                # A more robust check might involve GUIDs from RSS if available (entry.id)
-                # For now, keeping title similarity
-                is_similar = False
-                for seen in seen_titles:
-                    # Basic similarity: if one title is a substring of another or very close
-                    # This could be improved with fuzzy matching if needed
-                    if simple_title in seen or seen in simple_title or \
-                       len(set(simple_title) & set(seen)) / len(set(simple_title) | set(seen)) > 0.8:
-                        is_similar = True
-                        break
-                if not is_similar:
+                key = episode.get('url') or episode['title']
+                if dedup_index.check_and_add(key, episode['title'], episode.get('description', '')) is None:
                     unique_episodes.append(episode)
-                    seen_titles.add(simple_title)
             
             # Clean up the temporary datetime object
             for episode in unique_episodes:
@@ -326,55 +355,63 @@ class PodcastScraper:
             traceback.print_exc()
             return episodes # Return original list if filtering fails
     
-    def save_episodes(self, episodes: List[Dict], filename: str):
-        """Save episodes to a JSON file"""
-        try:
-            # Convert datetime objects to strings
-            serializable_episodes = []
-            for episode in episodes:
-                episode_copy = episode.copy()
-                if isinstance(episode_copy.get('release_date'), datetime):
-                    episode_copy['release_date'] = episode_copy['release_date'].strftime('%Y-%m-%d')
-                # Ensure 'timestamp' is also stringified if it's a datetime object
-                if isinstance(episode_copy.get('timestamp'), datetime):
-                     episode_copy['timestamp'] = episode_copy['timestamp'].isoformat()
-                serializable_episodes.append(episode_copy)
-            
-            # Create data directory if it doesn't exist
-            os.makedirs('data', exist_ok=True)
-            
-            # Save to both root and data directory for compatibility
-            # Root location
-            with open(filename, 'w') as f:
-                json.dump(serializable_episodes, f, indent=2)
-            
-            # Data directory
-            with open(os.path.join('data', filename), 'w') as f:
-                json.dump(serializable_episodes, f, indent=2)
-            
-            print(f"Successfully saved {len(episodes)} episodes to {filename}")
-        except Exception as e:
-            print(f"Error saving episodes: {str(e)}")
-            traceback.print_exc()
+    def save_episodes(self, episodes: List[Dict], filename: str) -> bool:
+        """Save episodes to a JSON file (or upsert them into the SQLite store); False if that failed"""
+        # Transcripts and descriptions live in the sidecar store, not in the card metadata
+        episodes_metadata = []
+        for episode in episodes:
+            episode_copy = episode.copy()
+            if self.transcript_store.get(episode_copy.get('episode_key', '')) is not None:
+                episode_copy.pop('description', None)
+                episode_copy.pop('transcript', None)
+            episodes_metadata.append(episode_copy)
+        return self.episode_storage.save(episodes_metadata, filename)
     
     def load_episodes(self, filename: str) -> List[Dict]:
-        """Load episodes from a JSON file"""
-        try:
-            # Try loading from root first, then from data directory
-            try:
-                with open(filename, 'r') as f:
-                    episodes = json.load(f)
-            except FileNotFoundError:
-                with open(os.path.join('data', filename), 'r') as f:
-                    episodes = json.load(f)
-                
-            return episodes
-        except Exception as e:
-            print(f"Error loading episodes: {str(e)}")
-            traceback.print_exc()
-            return []
+        """Load episode metadata from a JSON file or the SQLite store (transcripts load on demand via load_transcript)
+
+        Read-only: files written before the sidecar store may still carry inline transcripts,
+        which the updater moves out with migrate_inline_transcripts().
+        """
+        return self.episode_storage.load(filename)
+
+    def migrate_inline_transcripts(self, episodes: List[Dict]) -> List[Dict]:
+        """Move transcripts and descriptions saved inside episode files into the sidecar store (updater only)"""
+        migrated = 0
+        for episode in episodes:
+            if 'transcript' not in episode and 'description' not in episode:
+                continue
+            key = episode.get('episode_key') or self.transcript_store.episode_key(episode.get('url'), None, None)
+            if self.transcript_store.get(key) is None:
+                transcript = episode.get('transcript')
+                if transcript in TRANSCRIPT_PLACEHOLDERS:
+                    transcript = None
+                self.transcript_store.put(key, transcript, episode.get('summary', ''), episode.get('description', ''),
+                                          guid=episode.get('guid'), audio_url=episode.get('audio_url'))
+                migrated += 1
+            episode.pop('transcript', None)
+            episode.pop('description', None)
+            episode['episode_key'] = key
+            episode['has_transcript'] = self.transcript_store.get(key)['has_transcript']
+        if migrated:
+            self.transcript_store.save()
+            print(f"Moved {migrated} inline transcripts to the transcript store")
+        return episodes
 
-    def summarize_transcript_with_llm(self, transcript_text: str) -> str:
+    def load_transcript(self, episode: Dict) -> Optional[str]:
+        """Full transcript of an episode, read from the sidecar store"""
+        if 'transcript' in episode or not episode.get('episode_key'):
+            # Not migrated yet
+            return episode.get('transcript')
+        return self.transcript_store.load_transcript(episode['episode_key'])
+
+    def load_description(self, episode: Dict) -> str:
+        """Original feed description of an episode, read from the sidecar store"""
+        if 'description' in episode or not episode.get('episode_key'):
+            return episode.get('description', '')
+        return self.transcript_store.load_description(episode['episode_key']) or ''
+
+    def summarize_transcript_with_llm(self, transcript_text: str, source: str = 'podcasts') -> str:
         if not transcript_text or len(transcript_text.split()) < 30: # Min length for meaningful summary
             print("Transcript too short for LLM summarization or not available.")
             return "Summary not available."
@@ -384,27 +421,43 @@ class PodcastScraper:
             print("OPENAI_API_KEY not found in environment. Skipping LLM summarization.")
             return "LLM Summary not available (API key missing)."
         
+        import openai
+
         openai.api_key = api_key
         # Shorten transcript if it's too long to reduce token usage/cost
         # OpenAI's gpt-3.5-turbo has a context window (e.g., 4k or 16k tokens)
         # 1 token is roughly 3/4 of a word.
         max_input_chars = 20000 # Approx 5000 tokens, adjust as needed
         truncated_transcript = transcript_text[:max_input_chars]
+        system_prompt = "You are an expert at summarizing podcast transcripts. Provide a concise, engaging summary of the key topics discussed in about 100-150 words."
+
+        # Reuse the summary of a transcript we've already sent to the LLM
+        cache_key = self.summary_cache.make_key(
+            truncated_transcript, 'openai:gpt-3.5-turbo',
+            system_prompt=system_prompt, max_tokens=200, temperature=0.6
+        )
+        cached_summary = self.summary_cache.get(cache_key)
+        if cached_summary is not None:
+            print("Using cached LLM summary for this transcript.")
+            return cached_summary
 
         try:
             print(f"Attempting OpenAI API call for summarization. Transcript length (chars): {len(truncated_transcript)}")
             print(f"Sending transcript (truncated to {len(truncated_transcript)} chars) to LLM for summarization...")
-            completion = openai.chat.completions.create(
-                model="gpt-3.5-turbo", # Or another cost-effective model
-                messages=[
-                    {"role": "system", "content": "You are an expert at summarizing podcast transcripts. Provide a concise, engaging summary of the key topics discussed in about 100-150 words."},
-                    {"role": "user", "content": f"Summarize this podcast transcript:\n\n{truncated_transcript}"}
-                ],
-                max_tokens=200, # Max tokens for the summary itself
-                temperature=0.6,
-            )
+            with self.metrics.stage('llm_call', source):
+                completion = openai.chat.completions.create(
+                    model="gpt-3.5-turbo", # Or another cost-effective model
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": f"Summarize this podcast transcript:\n\n{truncated_transcript}"}
+                    ],
+                    max_tokens=200, # Max tokens for the summary itself
+                    temperature=0.6,
+                )
             llm_summary = completion.choices[0].message.content.strip()
             print("LLM summary generated.")
+            if llm_summary:
+                self.summary_cache.set(cache_key, llm_summary)
             return llm_summary
         except openai.RateLimitError as rle:
             print(f"OpenAI API rate limit hit during summarization: {str(rle)}")
@@ -0,0 +1,134 @@
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import Response
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 512
+
+
+def make_etag(version: Optional[str], key: str) -> str:
+    """Weak validator for a response derived from one data version and request key"""
+    digest = hashlib.sha1(f"{version}|{key}".encode('utf-8')).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates or etag[2:] in candidates
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """Content codings from an Accept-Encoding header with their q-values"""
+    encodings = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def choose_encoding(accept_encoding: Optional[str], available) -> Optional[str]:
+    """Best precompressed variant the client accepts ('br' over 'gzip'), or None for identity"""
+    encodings = accepted_encodings(accept_encoding)
+    for encoding in ('br', 'gzip'):
+        if encoding in available and encodings.get(encoding, encodings.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+class ResponseCache:
+    """Rendered bodies per (request key, data version), stored with gzip/brotli variants
+
+    Requests carrying a matching validator get a 304 without rendering; others are
+    served the precompressed variant negotiated from Accept-Encoding.
+    """
+    def __init__(self, max_entries: int = None, max_age: int = None):
+        self.max_entries = max_entries or int(os.getenv('RESPONSE_CACHE_ENTRIES', '256'))
+        self.max_age = max_age if max_age is not None else int(os.getenv('RESPONSE_MAX_AGE', '60'))
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _compress(body: bytes) -> Dict[str, bytes]:
+        variants = {}
+        if len(body) < MIN_COMPRESS_BYTES:
+            return variants
+        variants['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None:
+            variants['br'] = brotli.compress(body, quality=9)
+        return variants
+
+    def _headers(self, etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+        headers = {
+            'ETag': etag,
+            'Cache-Control': f'public, max-age={self.max_age}, must-revalidate',
+            'Vary': 'Accept-Encoding'
+        }
+        if last_modified is not None:
+            headers['Last-Modified'] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+        return headers
+
+    @staticmethod
+    def _not_modified(request, etag: str, last_modified: Optional[datetime]) -> bool:
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            return etag_matches(if_none_match, etag)
+        if_modified_since = request.headers.get('If-Modified-Since')
+        if if_modified_since and last_modified is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return last_modified.replace(microsecond=0) <= since
+        return False
+
+    def respond(self, request, key: str, version: Optional[str], last_modified: Optional[datetime],
+                render: Callable[[], Tuple[bytes, str]]) -> Response:
+        """304 if the client is current, else the cached (or freshly rendered) body for this version"""
+        etag = make_etag(version, key)
+        headers = self._headers(etag, last_modified)
+        if self._not_modified(request, etag, last_modified):
+            return Response(status=304, headers=headers)
+
+        cache_key = (key, version)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+        if entry is None:
+            body, mimetype = render()
+            entry = {'body': body, 'mimetype': mimetype, 'variants': self._compress(body)}
+            with self._lock:
+                self._entries[cache_key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        encoding = choose_encoding(request.headers.get('Accept-Encoding'), entry['variants'])
+        if encoding is None:
+            return Response(entry['body'], mimetype=entry['mimetype'], headers=headers)
+        return Response(entry['variants'][encoding], mimetype=entry['mimetype'],
+                        headers={**headers, 'Content-Encoding': encoding})
@@ -0,0 +1,55 @@
+"""
+Template helpers shared by the Flask app and generate_static.py, so both
+render templates/ with the same filters and globals.
+"""
+
+from typing import Dict, List
+
+from categorizer import CATEGORY_KEYWORDS, DEFAULT_CATEGORIES
+
+# Display names for category badges and page titles
+CATEGORY_LABELS = {
+    'policy': 'Policy',
+    'innovation': 'Innovation',
+    'business': 'Business',
+    'climate': 'Climate'
+}
+
+# Longer names used by the filter buttons and category pages
+CATEGORY_TITLES = {
+    'policy': 'Policy & Regulation',
+    'innovation': 'Technology & Innovation',
+    'business': 'Market & Business',
+    'climate': 'Climate & Sustainability'
+}
+
+
+def category_list(categories) -> List[str]:
+    """Clean a stored category string ("policy,\\nclimate") into a list of names"""
+    if categories is None:
+        categories = ','.join(DEFAULT_CATEGORIES)
+    if isinstance(categories, (list, tuple)):
+        categories = ','.join(categories)
+    return [c.strip() for c in categories.replace('\\n', ',').replace('\n', ',').split(',') if c.strip()]
+
+
+def category_label(category: str) -> str:
+    return CATEGORY_LABELS.get(category, category.capitalize())
+
+
+def register_template_helpers(env):
+    """Add the dashboard's filters and globals to a Jinja environment"""
+    env.filters['category_list'] = category_list
+    env.filters['category_label'] = category_label
+    env.globals['categories'] = list(CATEGORY_KEYWORDS)
+    env.globals['category_titles'] = CATEGORY_TITLES
+    return env
+
+
+def group_by_month(items: List[Dict], date_field: str) -> Dict[str, List[Dict]]:
+    """Items keyed by YYYY-MM of their date, newest month first"""
+    months = {}
+    for item in items:
+        month = (item.get(date_field) or '')[:7] or 'undated'
+        months.setdefault(month, []).append(item)
+    return dict(sorted(months.items(), reverse=True))
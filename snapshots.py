@@ -0,0 +1,307 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: only in-process locking
+    fcntl = None
+
+# Data files published together in every snapshot
+SNAPSHOT_FILES = ['articles.json', 'podcasts.json']
+
+
+def atomic_write_json(path: str, data, indent: int = 2):
+    """Write JSON to a temp file in the same directory and rename it over `path`"""
+    atomic_write_bytes(path, json.dumps(data, indent=indent).encode('utf-8'))
+
+
+def atomic_write_bytes(path: str, content: bytes):
+    """Write bytes to a temp file in the same directory and rename it over `path`"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)  # mkstemp creates owner-only files
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SnapshotStore:
+    """Immutable, versioned data snapshots switched in by an atomically replaced manifest
+
+    Each publish writes a new data/snapshots/<generation>/ directory holding every
+    data file, then replaces data/manifest.json. Readers resolve files through the
+    manifest, so they always see one complete generation. Saves grouped with batch()
+    (as update_content does) go out as a single generation. The root and data/ copies
+    of each published file are refreshed right after the manifest.
+
+    The manifest is not committed, so a root or data/ copy that is newer than the
+    published generation and differs from it (e.g. after a git pull) makes the
+    manifest stale: readers then use those copies until the next publish.
+    """
+    def __init__(self, data_dir: str = 'data', filenames: List[str] = None, keep: int = None):
+        self.data_dir = data_dir
+        self.filenames = filenames or SNAPSHOT_FILES
+        self.keep = max(1, keep or int(os.getenv('SNAPSHOT_KEEP', '3')))
+        self.manifest_path = os.path.join(data_dir, 'manifest.json')
+        self.snapshots_dir = os.path.join(data_dir, 'snapshots')
+        self._lock = threading.Lock()
+        self._manifest = None
+        self._manifest_stat = None
+        self._digests = {}  # legacy copy path -> ((mtime_ns, size), sha256)
+        self._local = threading.local()
+
+    @contextmanager
+    def _publish_lock(self):
+        """Serialize publishers across threads and processes"""
+        with self._lock:
+            os.makedirs(self.data_dir, exist_ok=True)
+            with open(os.path.join(self.data_dir, '.manifest.lock'), 'w') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def manifest(self) -> Optional[Dict]:
+        """Current manifest, re-read only when the manifest file itself changed"""
+        try:
+            stat = os.stat(self.manifest_path)
+        except OSError:
+            return None
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if signature != self._manifest_stat:
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    self._manifest = json.load(f)
+                self._manifest_stat = signature
+            except (OSError, ValueError) as e:
+                print(f"Error reading snapshot manifest: {str(e)}")
+                return self._manifest
+        return self._manifest
+
+    def _legacy_digest(self, path: str, stat: os.stat_result) -> Optional[str]:
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._digests.get(path)
+        if cached is None or cached[0] != key:
+            try:
+                cached = self._digests[path] = (key, self._file_digest(path))
+            except OSError:
+                return None
+        return cached[1]
+
+    def _is_stale(self, manifest: Dict) -> bool:
+        """True if a root or data/ copy changed after the generation was published"""
+        try:
+            published = datetime.fromisoformat(manifest['published_at']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return False
+        for filename in self.filenames:
+            expected = manifest.get('files', {}).get(filename, {}).get('sha256')
+            for path in self._legacy_paths(filename):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if stat.st_mtime > published and self._legacy_digest(path, stat) != expected:
+                    return True
+        return False
+
+    def current(self) -> Optional[Dict]:
+        """Manifest of the generation readers should use, or None to read the legacy copies"""
+        manifest = self.manifest()
+        if manifest and self._is_stale(manifest):
+            return None
+        return manifest
+
+    @contextmanager
+    def pinned(self):
+        """Resolve every load in this thread against one generation, for consistent multi-file reads"""
+        self._local.pinned = True
+        self._local.manifest = self.current()
+        try:
+            yield self._local.manifest
+        finally:
+            self._local.pinned = False
+            self._local.manifest = None
+
+    def generation(self) -> Optional[int]:
+        """Generation number of the published data (None before the first publish or when stale)"""
+        manifest = self.current()
+        return manifest['generation'] if manifest else None
+
+    def published_at(self) -> Optional[str]:
+        """ISO timestamp (UTC) of when the current generation was published"""
+        manifest = self.current()
+        return manifest.get('published_at') if manifest else None
+
+    def path(self, filename: str) -> Optional[str]:
+        """Path of a data file in the current (or pinned) snapshot, or None if not published"""
+        if getattr(self._local, 'pinned', False):
+            manifest = self._local.manifest
+        else:
+            manifest = self.current()
+        if not manifest or filename not in manifest.get('files', {}):
+            return None
+        return os.path.join(self.data_dir, manifest['snapshot'], filename)
+
+    def load(self, filename: str):
+        """Parsed JSON of a data file from the current snapshot, or None if not published"""
+        path = self.path(filename)
+        if path is None:
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            # Pruned between reading the manifest and opening the file: retry on the new generation
+            self._manifest_stat = None
+            if getattr(self._local, 'pinned', False):
+                self._local.manifest = self.current()
+            path = self.path(filename)
+            if path is None:
+                return None
+            with open(path, 'r') as f:
+                return json.load(f)
+
+    @contextmanager
+    def batch(self):
+        """Collect publish() calls made in this thread and publish them as one generation on exit"""
+        self._local.pending = {}
+        try:
+            yield
+        finally:
+            pending, self._local.pending = self._local.pending, None
+            if pending:
+                self.publish(pending)
+
+    def _legacy_paths(self, filename: str) -> List[str]:
+        """Root and data/ copies, in the order the scrapers' load_* methods read them"""
+        return [filename, os.path.join(self.data_dir, filename)]
+
+    def _previous_file(self, manifest: Optional[Dict], filename: str) -> Optional[str]:
+        """Source for a file carried over unchanged: last snapshot, else the legacy copy"""
+        if manifest and filename in manifest.get('files', {}):
+            path = os.path.join(self.data_dir, manifest['snapshot'], filename)
+            if os.path.exists(path):
+                return path
+        return next((path for path in self._legacy_paths(filename) if os.path.exists(path)), None)
+
+    def _write_legacy_copies(self, contents: Dict[str, Tuple[bytes, str]]):
+        """Refresh the root and data/ copies of published files, each replaced atomically"""
+        for filename, (content, _) in contents.items():
+            for path in self._legacy_paths(filename):
+                atomic_write_bytes(path, content)
+
+    def publish(self, files: Dict[str, object]) -> Optional[int]:
+        """Publish a new generation with each filename replaced by its data; returns the generation
+
+        Inside batch() the files are only queued (None is returned) and published when it exits.
+        """
+        pending = getattr(self._local, 'pending', None)
+        if pending is not None:
+            pending.update(files)
+            return None
+
+        contents = {}
+        for filename, data in files.items():
+            content = json.dumps(data, indent=2).encode('utf-8')
+            contents[filename] = (content, hashlib.sha256(content).hexdigest())
+
+        with self._publish_lock():
+            self._manifest_stat = None
+            manifest = self.manifest()
+            if manifest and self._is_stale(manifest):
+                # Unchanged files are carried over from the newer legacy copies instead
+                manifest = None
+            published = (manifest or {}).get('files', {})
+            if manifest and all(published.get(filename, {}).get('sha256') == digest
+                                for filename, (_, digest) in contents.items()):
+                # Identical data: keep the current generation
+                self._write_legacy_copies(contents)
+                return manifest['generation']
+
+            current = self.manifest()
+            generation = (current['generation'] if current else 0) + 1
+            snapshot = os.path.join('snapshots', f"{generation:08d}")
+            os.makedirs(self.snapshots_dir, exist_ok=True)
+            staging_dir = tempfile.mkdtemp(prefix='.staging-', dir=self.snapshots_dir)
+            try:
+                os.chmod(staging_dir, 0o755)
+                new_files = {}
+                for filename, (content, digest) in contents.items():
+                    with open(os.path.join(staging_dir, filename), 'wb') as f:
+                        f.write(content)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    new_files[filename] = {'sha256': digest, 'size': len(content)}
+
+                # Unchanged files are hard-linked (or copied) from the previous generation
+                for other in self.filenames:
+                    if other in contents:
+                        continue
+                    source = self._previous_file(manifest, other)
+                    if source is None:
+                        continue
+                    target = os.path.join(staging_dir, other)
+                    try:
+                        os.link(source, target)
+                    except OSError:
+                        shutil.copyfile(source, target)
+                    previous = published.get(other)
+                    new_files[other] = previous or {'sha256': self._file_digest(target), 'size': os.path.getsize(target)}
+
+                os.replace(staging_dir, os.path.join(self.data_dir, snapshot))
+            except BaseException:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                raise
+
+            atomic_write_json(self.manifest_path, {
+                'generation': generation,
+                'snapshot': snapshot,
+                'published_at': datetime.now(timezone.utc).isoformat(),
+                'files': new_files
+            })
+            self._write_legacy_copies(contents)
+            self._prune(generation)
+            return generation
+
+    @staticmethod
+    def _file_digest(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _prune(self, generation: int):
+        """Delete snapshots older than the last `keep` generations"""
+        try:
+            for name in os.listdir(self.snapshots_dir):
+                if name.isdigit() and int(name) <= generation - self.keep:
+                    shutil.rmtree(os.path.join(self.snapshots_dir, name), ignore_errors=True)
+        except OSError:
+            traceback.print_exc()
+
+
+# Shared instance so the scrapers and the web app agree on the current generation
+default_snapshot_store = SnapshotStore()
@@ -1,22 +1,25 @@
 async function loadNews(){
-    let res = await fetch('/api/news'), j = await res.json();
-    for(let [src, arr] of Object.entries(j)){
-      let ul = document.querySelector(`#${src} ul`);
-      arr.forEach(a=>{
-        let li = document.createElement('li');
-        li.innerHTML = `<a href="${a.link}" target="_blank">${a.title}</a> <small>${a.date}</small>`;
-        ul.append(li);
-      });
-    }
+    // Only the card fields; the API pages with ?cursor= when there is more
+    let res = await fetch('/api/news?fields=title,link,date,source&limit=50'), j = await res.json();
+    j.items.forEach(a=>{
+      let ul = document.querySelector(`#${sourceId(a.source)} ul`);
+      if(!ul) return;
+      let li = document.createElement('li');
+      li.innerHTML = `<a href="${a.link}" target="_blank">${a.title}</a> <small>${a.date}</small>`;
+      ul.append(li);
+    });
   }
   async function loadTranscripts(){
-    let res = await fetch('/api/transcripts'), ep = await res.json();
+    let res = await fetch('/api/transcripts?fields=title,url,release_date,transcript&limit=5'), j = await res.json();
     let ul = document.querySelector('#transcripts ul');
-    ep.forEach(e=>{
+    j.items.filter(e=>e.transcript).forEach(e=>{
       let li = document.createElement('li');
-      li.innerHTML = `<strong>${e.episode}</strong>: ${e.transcript.substring(0,200)}...`;
+      li.innerHTML = `<strong>${e.title}</strong>: ${e.transcript.substring(0,200)}...`;
       ul.append(li);
     });
   }
+  function sourceId(source){
+    return (source || '').toLowerCase().replace(/[^a-z0-9]+/g, '-');
+  }
   loadNews();
-  loadTranscripts(); 
\ No newline at end of file
+  loadTranscripts();
@@ -1,57 +1,17 @@
-import nltk
-from nltk.tokenize import sent_tokenize
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.probability import FreqDist
 from typing import List, Dict
 import json
 import os
+from summary_engine import ExtractiveSummarizer
 
 class ContentSummarizer:
     def __init__(self):
         """Initialize the NLTK-based summarizer"""
-        # Download required NLTK data
-        nltk.download('punkt')
-        nltk.download('stopwords')
-        self.stop_words = set(stopwords.words('english'))
+        # NLTK data is loaded from the local install on first use, never downloaded
+        self.summarizer = ExtractiveSummarizer()
     
     def summarize_text(self, text: str, num_sentences: int = 3) -> str:
         """Summarize text using frequency-based extractive summarization"""
-        # Tokenize the text into sentences
-        sentences = sent_tokenize(text)
-        
-        if len(sentences) <= num_sentences:
-            return text
-        
-        # Tokenize words and remove stopwords
-        words = word_tokenize(text.lower())
-        words = [word for word in words if word.isalnum() and word not in self.stop_words]
-        
-        # Calculate word frequencies
-        freq_dist = FreqDist(words)
-        
-        # Score sentences based on word frequencies
-        sentence_scores = {}
-        for sentence in sentences:
-            for word in word_tokenize(sentence.lower()):
-                if word in freq_dist:
-                    if sentence not in sentence_scores:
-                        sentence_scores[sentence] = freq_dist[word]
-                    else:
-                        sentence_scores[sentence] += freq_dist[word]
-        
-        # Get top sentences
-        summary_sentences = sorted(sentence_scores.items(), 
-                                 key=lambda x: x[1], 
-                                 reverse=True)[:num_sentences]
-        
-        # Sort sentences by their original order
-        summary_sentences = sorted(summary_sentences, 
-                                 key=lambda x: sentences.index(x[0]))
-        
-        # Join sentences
-        summary = ' '.join(sentence for sentence, score in summary_sentences)
-        return summary
+        return self.summarizer.summarize_by_frequency(text, num_sentences)
     
     def process_articles(self, articles: List[Dict]) -> List[Dict]:
         """Process and summarize a list of articles"""
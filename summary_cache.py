@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import threading
+import traceback
+from collections import OrderedDict
+from typing import Optional
+
+
+class SummaryCache:
+    """Persistent LRU cache of summaries keyed by a hash of text and summarizer settings"""
+    def __init__(self, path: str = None, max_bytes: int = None, enabled: bool = None):
+        self.path = path or os.getenv('SUMMARY_CACHE_PATH', os.path.join('data', 'summary_cache.json'))
+        self.max_bytes = max_bytes or int(float(os.getenv('SUMMARY_CACHE_MAX_MB', '5')) * 1024 * 1024)
+        if enabled is None:
+            enabled = os.getenv('SUMMARY_CACHE_DISABLED', '').lower() not in ('1', 'true', 'yes')
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries = None  # key -> summary, least recently used first
+        self._size = 0
+        self._dirty = False
+
+    @staticmethod
+    def make_key(text: str, summarizer: str, **params) -> str:
+        """Hash of the input text, summarizer name and its parameters"""
+        digest = hashlib.sha256()
+        digest.update(summarizer.encode('utf-8'))
+        digest.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _load(self) -> OrderedDict:
+        """Load the cache file on first use"""
+        if self._entries is None:
+            self._entries = OrderedDict()
+            try:
+                with open(self.path, 'r') as f:
+                    for key, summary in json.load(f):
+                        self._entries[key] = summary
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Error loading summary cache, starting empty: {str(e)}")
+            self._size = sum(len(summary) for summary in self._entries.values())
+        return self._entries
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached summary for a key, marking it as recently used"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entries = self._load()
+            summary = entries.get(key)
+            if summary is not None:
+                entries.move_to_end(key)
+                self._dirty = True
+            return summary
+
+    def set(self, key: str, summary: str):
+        """Store a summary, evicting least recently used entries past max_bytes"""
+        if not self.enabled:
+            return
+        with self._lock:
+            entries = self._load()
+            if key in entries:
+                self._size -= len(entries.pop(key))
+            entries[key] = summary
+            self._size += len(summary)
+            while self._size > self.max_bytes and len(entries) > 1:
+                _, evicted = entries.popitem(last=False)
+                self._size -= len(evicted)
+            self._dirty = True
+
+    def save(self):
+        """Write the cache to disk if it changed"""
+        if not self.enabled or not self._dirty:
+            return
+        try:
+            with self._lock:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(list(self._entries.items()), f)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+        except Exception as e:
+            print(f"Error saving summary cache: {str(e)}")
+            traceback.print_exc()
+
+
+# Shared instance so both scrapers read and write the same cache file
+default_summary_cache = SummaryCache()
@@ -0,0 +1,175 @@
+"""
+Shared frequency-based extractive summarization engine.
+
+WebScraper.summarize_content, PodcastScraper.summarize_text and
+ContentSummarizer.summarize_text all delegate here. Text is split into
+sentences once and each sentence is tokenized once; the word frequency
+table is built from those same tokens.
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+from nlp_resources import english_stop_words, regex_sent_tokenize, sentence_splitter
+
+# Keywords related to important energy sector developments and their weights
+ENERGY_KEYWORDS = {
+    # Business and financial terms
+    'acquisition': 3.0, 'merger': 3.0, 'investment': 2.5, 'funding': 2.5,
+    'billion': 2.5, 'million': 2.0, 'profit': 2.0, 'revenue': 2.0, 'growth': 2.0,
+    'budget': 2.0, 'cost': 1.5, 'price': 1.5, 'market': 1.5, 'stock': 1.5,
+
+    # Technology and innovation
+    'innovation': 3.0, 'technology': 2.5, 'breakthrough': 3.0, 'efficiency': 2.5,
+    'development': 2.0, 'research': 2.0, 'discovery': 2.5, 'patent': 2.5,
+    'prototype': 2.5, 'launch': 2.0, 'announce': 2.0, 'introduce': 2.0,
+
+    # Energy sources
+    'renewable': 2.5, 'solar': 2.0, 'wind': 2.0, 'hydro': 2.0, 'nuclear': 2.0,
+    'battery': 2.5, 'storage': 2.5, 'grid': 2.0, 'power': 1.5, 'electricity': 1.5,
+    'energy': 1.5, 'oil': 1.5, 'gas': 1.5, 'coal': 1.5, 'hydrogen': 2.5,
+
+    # Policy and regulation
+    'policy': 2.5, 'regulation': 2.5, 'law': 2.5, 'legislation': 2.5,
+    'government': 2.0, 'epa': 2.5, 'subsidy': 2.5, 'incentive': 2.5,
+    'tax': 2.0, 'carbon': 2.5, 'emissions': 2.5, 'climate': 2.0,
+
+    # Key events and time indicators
+    'report': 2.0, 'release': 2.0, 'unveil': 2.5,
+    'today': 2.0, 'yesterday': 2.0, 'week': 1.5, 'month': 1.5, 'year': 1.5
+}
+
+# Word tokens: alphanumeric runs, keeping "net-zero", "u.s" and "1,000" whole the
+# way NLTK's Treebank tokenizer does (they are not alphanumeric and never score)
+TOKEN_RE = re.compile(r"[^\W_]+(?:[-.,][^\W_]+)*")
+
+# Companies and organizations, e.g. "Lunar Energy" or "Acme Corp."
+ENTITY_RE = re.compile(
+    r'([A-Z][a-z]+ )+(?:Inc\.?|LLC|Ltd\.?|Corp\.?|Corporation|Company|Group|Technologies|Energy|Solar|Wind|Power)'
+)
+NUMBER_RE = re.compile(r'\d')
+QUOTE_RE = re.compile(r'"[^"]+"|\'[^\']+\'')
+
+
+class ExtractiveSummarizer:
+    """Score and pick the most informative sentences of a text"""
+    # Bump when scoring changes so cached summaries are not reused
+    version = 'extractive-v1'
+
+    def __init__(self, stop_words: Iterable[str] = None, keyword_weights: Dict[str, float] = None):
+        # None means NLTK's English stopwords, loaded on first use
+        self._stop_words = None if stop_words is None else frozenset(stop_words)
+        self.keyword_weights = ENERGY_KEYWORDS if keyword_weights is None else keyword_weights
+
+    @property
+    def stop_words(self) -> frozenset:
+        if self._stop_words is None:
+            self._stop_words = english_stop_words()
+        return self._stop_words
+
+    @property
+    def name(self) -> str:
+        """Cache identity; the fallback sentence splitter can pick different sentences"""
+        if sentence_splitter() is regex_sent_tokenize:
+            return f"{self.version}+regex-split"
+        return self.version
+
+    def tokenize(self, text: str) -> Tuple[List[str], List[List[str]], Dict[str, int]]:
+        """Split text into sentences, their lowercase tokens and a word frequency table"""
+        sentences = sentence_splitter()(text)
+        sentence_tokens = [TOKEN_RE.findall(sentence.lower()) for sentence in sentences]
+
+        # Frequencies of alphanumeric, non-stopword tokens across the whole text
+        freq_dist = {}
+        stop_words = self.stop_words
+        for tokens in sentence_tokens:
+            for word in tokens:
+                if word not in stop_words and word.isalnum():
+                    freq_dist[word] = freq_dist.get(word, 0) + 1
+        return sentences, sentence_tokens, freq_dist
+
+    @staticmethod
+    def _top_ranked(scores: Dict[str, float], count: int, exclude: Iterable[str] = ()) -> List[str]:
+        """The `count` highest scoring sentences, ties kept in original order"""
+        excluded = set(exclude)
+        return sorted(
+            (sentence for sentence in scores if sentence not in excluded),
+            key=scores.__getitem__,
+            reverse=True
+        )[:count]
+
+    def summarize(self, text: str, num_sentences: int = 4) -> str:
+        """Weighted summary favouring energy keywords, entities, figures and quotes"""
+        # If content is too short, return it as is
+        if len(text) < 200:
+            return text
+
+        sentences, sentence_tokens, freq_dist = self.tokenize(text)
+        if len(sentences) <= num_sentences:
+            return text
+
+        keyword_weights = self.keyword_weights
+        last_position = len(sentences) - 3
+        sentence_scores = {}
+        first_index = {}
+
+        for idx, (sentence, tokens) in enumerate(zip(sentences, sentence_tokens)):
+            first_index.setdefault(sentence, idx)
+
+            # Position weights (first few and last few sentences often contain key info)
+            position_weight = 1.5 if idx < 2 or idx > last_position else 1.0
+
+            # Presence of entities (companies, organizations)
+            entity_weight = 1.5 if ENTITY_RE.search(sentence) else 1.0
+
+            # Length weight (prefer medium-sized sentences)
+            length = len(sentence.split())
+            length_weight = 1.2 if 10 <= length <= 25 else 0.8 if length > 40 else 1.0
+
+            # Base score from word frequencies, with energy keywords weighted up
+            score = 0
+            for word in tokens:
+                score += freq_dist.get(word, 0) * keyword_weights.get(word, 1)
+
+            # Normalize score by sentence length to avoid favoring long sentences
+            sentence_score = score / max(1, length) * position_weight * entity_weight * length_weight
+
+            # Boost sentences containing numbers (often indicate key metrics)
+            if NUMBER_RE.search(sentence):
+                sentence_score *= 1.3
+
+            # Boost sentences with quotes (often contain important statements)
+            if QUOTE_RE.search(sentence):
+                sentence_score *= 1.4
+
+            sentence_scores[sentence] = sentence_score
+
+        top_sentences = self._top_ranked(sentence_scores, num_sentences)
+        summary_sentences = sorted(top_sentences, key=first_index.__getitem__)
+        summary = ' '.join(summary_sentences)
+
+        # If the summary is too short, add the next two best sentences
+        if len(summary) < 200:
+            additional = self._top_ranked(sentence_scores, 2, exclude=top_sentences)
+            summary_sentences = sorted(top_sentences + additional, key=first_index.__getitem__)
+            summary = ' '.join(summary_sentences)
+
+        return summary
+
+    def summarize_by_frequency(self, text: str, num_sentences: int = 3) -> str:
+        """Plain word-frequency summary without keyword or position weighting"""
+        sentences, sentence_tokens, freq_dist = self.tokenize(text)
+        if len(sentences) <= num_sentences:
+            return text
+
+        sentence_scores = {}
+        first_index = {}
+        for idx, (sentence, tokens) in enumerate(zip(sentences, sentence_tokens)):
+            first_index.setdefault(sentence, idx)
+            score = sum(freq_dist[word] for word in tokens if word in freq_dist)
+            # Sentences without any frequent word are never picked
+            if score:
+                sentence_scores[sentence] = sentence_scores.get(sentence, 0) + score
+
+        top_sentences = self._top_ranked(sentence_scores, num_sentences)
+        return ' '.join(sorted(top_sentences, key=first_index.__getitem__))
@@ -0,0 +1,101 @@
+import pytest
+
+from content_api import ContentIndex, QueryError, decode_cursor, encode_cursor
+
+
+def make_items(days, per_day=2):
+    return [
+        {'link': f"https://example.com/{day:02d}-{n}", 'date': f"2026-01-{day:02d}"}
+        for day in days
+        for n in range(per_day)
+    ]
+
+
+def all_pages(index, limit, cursor=None, **kwargs):
+    items, pages = [], 0
+    while True:
+        page, cursor = index.page(cursor=cursor, limit=limit, **kwargs)
+        items.extend(page)
+        pages += 1
+        if cursor is None:
+            return items, pages
+
+
+def links(items):
+    return [item['link'] for item in items]
+
+
+def test_pages_cover_every_item_once_newest_first():
+    index = ContentIndex(make_items(range(1, 11)), 'date', 'link')
+
+    items, pages = all_pages(index, limit=3)
+
+    assert links(items) == links(index.items)
+    assert pages == 7
+    assert [item['date'] for item in items] == sorted((item['date'] for item in items), reverse=True)
+
+
+def test_exact_multiple_of_limit_has_no_empty_last_page():
+    index = ContentIndex(make_items(range(1, 4)), 'date', 'link')
+
+    page, cursor = index.page(limit=6)
+
+    assert len(page) == 6
+    assert cursor is None
+
+
+def test_cursor_continues_after_items_inserted_between_pages():
+    items = make_items([2, 4, 6, 8])
+    first, cursor = ContentIndex(items, 'date', 'link').page(limit=3)
+
+    # Newer items and items around the cursor position arrive before the next page is read
+    inserted = make_items([9, 5, 1], per_day=1) + [{'link': 'https://example.com/06-9', 'date': '2026-01-06'}]
+    rest, _ = all_pages(ContentIndex(items + inserted, 'date', 'link'), limit=3, cursor=cursor)
+
+    seen = links(first) + links(rest)
+    assert len(seen) == len(set(seen))
+    # Everything older than the cursor is served, including the inserted items
+    expected_after = [item for item in ContentIndex(items + inserted, 'date', 'link').items
+                      if (item['date'], item['link']) < decode_cursor(cursor)]
+    assert links(rest) == links(expected_after)
+    assert 'https://example.com/09-0' not in seen
+    assert 'https://example.com/01-0' in seen
+
+
+def test_since_and_until_are_inclusive():
+    index = ContentIndex(make_items(range(1, 11)), 'date', 'link')
+
+    items, _ = all_pages(index, limit=4, since='2026-01-03', until='2026-01-05')
+
+    assert sorted({item['date'] for item in items}) == ['2026-01-03', '2026-01-04', '2026-01-05']
+    assert len(items) == 6
+
+
+def test_until_before_all_items_and_since_after_all_items_are_empty():
+    index = ContentIndex(make_items(range(5, 8)), 'date', 'link')
+
+    assert index.page(until='2026-01-04') == ([], None)
+    assert index.page(since='2026-01-08') == ([], None)
+
+
+def test_cursor_and_until_combined_use_the_later_start():
+    index = ContentIndex(make_items(range(1, 11)), 'date', 'link')
+    cursor = encode_cursor(('2026-01-09', 'https://example.com/09-0'))
+
+    page, _ = index.page(cursor=cursor, until='2026-01-06', limit=2)
+
+    assert [item['date'] for item in page] == ['2026-01-06', '2026-01-06']
+
+
+def test_predicate_filters_within_pages():
+    index = ContentIndex(make_items(range(1, 11)), 'date', 'link')
+
+    items, _ = all_pages(index, limit=2, predicate=lambda item: item['link'].endswith('-1'))
+
+    assert len(items) == 10
+    assert all(item['link'].endswith('-1') for item in items)
+
+
+def test_invalid_cursor_is_a_query_error():
+    with pytest.raises(QueryError):
+        decode_cursor('not-a-cursor')
@@ -0,0 +1,65 @@
+import json
+from datetime import datetime, timedelta
+
+from dedup import NearDuplicateIndex
+
+TITLE = "Offshore wind developers pause projects as interest rates climb"
+BODY = ("Several offshore wind developers said on Tuesday they would pause projects along the east coast "
+        "after rising interest rates and supply chain costs pushed budgets past what state contracts allow.")
+
+
+def test_near_duplicate_is_found_and_distinct_item_is_not():
+    index = NearDuplicateIndex(threshold=0.6)
+
+    assert index.check_and_add('a', TITLE, BODY) is None
+    assert index.check_and_add('b', TITLE + '.', BODY.replace('Tuesday', 'Monday')) == 'a'
+    assert index.check_and_add('c', "Utility files rate case for grid upgrades",
+                               "The utility asked regulators to approve higher rates for new transmission lines.") is None
+
+
+def test_saved_index_finds_duplicates_after_reload(tmp_path):
+    path = str(tmp_path / 'dedup' / 'index.json')
+    index = NearDuplicateIndex(threshold=0.6)
+    index.check_and_add('a', TITLE, BODY)
+    index.save(path)
+
+    reloaded = NearDuplicateIndex.load(path, threshold=0.6)
+
+    assert reloaded.signatures == index.signatures
+    assert reloaded.seen == index.seen
+    assert reloaded.check_and_add('b', TITLE, BODY) == 'a'
+
+
+def test_changed_parameters_start_a_fresh_index(tmp_path):
+    path = str(tmp_path / 'index.json')
+    index = NearDuplicateIndex(threshold=0.6)
+    index.check_and_add('a', TITLE, BODY)
+    index.save(path)
+
+    assert NearDuplicateIndex.load(path, threshold=0.6, num_perm=32).signatures == {}
+    assert NearDuplicateIndex.load(path, threshold=0.8).signatures == {}
+
+
+def test_missing_or_corrupt_file_loads_empty(tmp_path):
+    path = tmp_path / 'index.json'
+    assert NearDuplicateIndex.load(str(path)).signatures == {}
+
+    path.write_text('{not json')
+    assert NearDuplicateIndex.load(str(path)).signatures == {}
+
+
+def test_prune_forgets_old_items_and_survives_reload(tmp_path):
+    path = str(tmp_path / 'index.json')
+    index = NearDuplicateIndex(threshold=0.6)
+    old = (datetime.now() - timedelta(days=10)).isoformat()
+    index.add('old', index.signature(TITLE, BODY), seen=old)
+    index.check_and_add('new', "Utility files rate case for grid upgrades")
+    index.save(path)
+
+    reloaded = NearDuplicateIndex.load(path, threshold=0.6)
+    reloaded.prune(7)
+
+    assert set(reloaded.signatures) == {'new'}
+    assert reloaded.check_and_add('again', TITLE, BODY) is None
+    with open(path) as f:
+        assert set(json.load(f)['items']) == {'old', 'new'}
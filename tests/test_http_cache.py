@@ -0,0 +1,133 @@
+import os
+
+import pytest
+import requests
+
+from http_cache import HTTPCache
+
+
+def make_response(url, status_code=200, body='', headers=None):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response._content = body.encode('utf-8')
+    response.encoding = 'utf-8'
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeSession:
+    """Serves queued responses per URL and records the request headers"""
+    def __init__(self):
+        self.responses = {}
+        self.requests = []
+
+    def queue(self, url, *responses):
+        self.responses.setdefault(url, []).extend(responses)
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append((url, dict(headers or {})))
+        return self.responses[url].pop(0)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HTTPCache(cache_dir=str(tmp_path / 'http_cache'), max_bytes=1024 * 1024, enabled=True)
+
+
+def test_not_modified_serves_stored_body(cache):
+    url = 'https://example.com/feed'
+    session = FakeSession()
+    session.queue(url,
+                  make_response(url, body='<rss>v1</rss>', headers={'ETag': '"v1"', 'Last-Modified': 'Mon, 05 Jan 2026 00:00:00 GMT'}),
+                  make_response(url, status_code=304))
+
+    first = cache.get(session, url)
+    second = cache.get(session, url)
+
+    assert (first.text, first.from_cache) == ('<rss>v1</rss>', False)
+    assert (second.text, second.status_code, second.from_cache) == ('<rss>v1</rss>', 200, True)
+    _, headers = session.requests[1]
+    assert headers['If-None-Match'] == '"v1"'
+    assert headers['If-Modified-Since'] == 'Mon, 05 Jan 2026 00:00:00 GMT'
+
+
+def test_changed_response_replaces_stored_body(cache):
+    url = 'https://example.com/feed'
+    session = FakeSession()
+    session.queue(url,
+                  make_response(url, body='v1', headers={'ETag': '"v1"'}),
+                  make_response(url, body='v2', headers={'ETag': '"v2"'}),
+                  make_response(url, status_code=304))
+
+    cache.get(session, url)
+    cache.get(session, url)
+
+    assert cache.get(session, url).text == 'v2'
+    assert session.requests[2][1]['If-None-Match'] == '"v2"'
+
+
+def test_responses_without_validators_are_not_stored(cache):
+    url = 'https://example.com/page'
+    session = FakeSession()
+    session.queue(url, make_response(url, body='plain'), make_response(url, body='plain'))
+
+    cache.get(session, url)
+    cache.get(session, url)
+
+    assert 'If-None-Match' not in session.requests[1][1]
+    assert cache._load_index() == {}
+
+
+def test_missing_body_is_fetched_again_without_validators(cache):
+    url = 'https://example.com/feed'
+    session = FakeSession()
+    session.queue(url,
+                  make_response(url, body='v1', headers={'ETag': '"v1"'}),
+                  make_response(url, status_code=304),
+                  make_response(url, body='v1', headers={'ETag': '"v1"'}))
+
+    cache.get(session, url)
+    os.remove(cache._body_path(url))
+    response = cache.get(session, url)
+
+    assert (response.text, response.from_cache) == ('v1', False)
+    assert 'If-None-Match' not in session.requests[2][1]
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = HTTPCache(cache_dir=str(tmp_path / 'http_cache'), max_bytes=25, enabled=True)
+    session = FakeSession()
+    urls = [f"https://example.com/{name}" for name in ('a', 'b', 'c')]
+    for url in urls:
+        session.queue(url, make_response(url, body='x' * 10, headers={'ETag': '"1"'}))
+
+    for url in urls:
+        cache.get(session, url)
+
+    index = cache._load_index()
+    assert set(index) == set(urls[1:])
+    assert not os.path.exists(cache._body_path(urls[0]))
+    assert all(os.path.exists(cache._body_path(url)) for url in urls[1:])
+
+
+def test_index_is_only_written_by_flush(cache):
+    url = 'https://example.com/feed'
+    session = FakeSession()
+    session.queue(url, make_response(url, body='v1', headers={'ETag': '"v1"'}))
+
+    cache.get(session, url)
+    assert not os.path.exists(cache.index_path)
+
+    cache.flush()
+    reopened = HTTPCache(cache_dir=cache.cache_dir, enabled=True)
+    assert reopened._load_index()[url]['etag'] == '"v1"'
+
+
+def test_error_status_raises(cache):
+    url = 'https://example.com/missing'
+    session = FakeSession()
+    session.queue(url, make_response(url, status_code=404))
+
+    with pytest.raises(requests.HTTPError):
+        cache.get(session, url)
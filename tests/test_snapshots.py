@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from snapshots import SnapshotStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # Legacy copies are written relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return SnapshotStore(data_dir='data', keep=3)
+
+
+def test_publish_writes_snapshot_and_legacy_copies(store):
+    generation = store.publish({'articles.json': [{'title': 'a'}], 'podcasts.json': []})
+
+    assert generation == 1
+    assert store.generation() == 1
+    assert store.load('articles.json') == [{'title': 'a'}]
+    for path in ('articles.json', os.path.join('data', 'articles.json')):
+        with open(path) as f:
+            assert json.load(f) == [{'title': 'a'}]
+
+
+def test_identical_publish_keeps_generation(store):
+    store.publish({'articles.json': [{'title': 'a'}]})
+
+    assert store.publish({'articles.json': [{'title': 'a'}]}) == 1
+    assert store.publish({'articles.json': [{'title': 'b'}]}) == 2
+
+
+def test_unchanged_files_are_carried_over(store):
+    store.publish({'articles.json': [{'title': 'a'}], 'podcasts.json': [{'title': 'p'}]})
+    store.publish({'articles.json': [{'title': 'b'}]})
+
+    assert store.load('podcasts.json') == [{'title': 'p'}]
+
+
+def test_batch_publishes_one_generation(store):
+    with store.batch():
+        assert store.publish({'articles.json': [{'title': 'a'}]}) is None
+        assert store.publish({'podcasts.json': [{'title': 'p'}]}) is None
+        assert store.generation() is None
+
+    assert store.generation() == 1
+    assert store.load('articles.json') == [{'title': 'a'}]
+    assert store.load('podcasts.json') == [{'title': 'p'}]
+
+
+def test_pinned_read_is_consistent_across_concurrent_publish(store):
+    store.publish({'articles.json': [{'title': 'a1'}], 'podcasts.json': [{'title': 'p1'}]})
+
+    with store.pinned() as manifest:
+        assert manifest['generation'] == 1
+        articles = store.load('articles.json')
+
+        publisher = threading.Thread(target=store.publish, args=({
+            'articles.json': [{'title': 'a2'}],
+            'podcasts.json': [{'title': 'p2'}]
+        },))
+        publisher.start()
+        publisher.join()
+
+        # The second file still comes from the pinned generation
+        podcasts = store.load('podcasts.json')
+
+    assert (articles, podcasts) == ([{'title': 'a1'}], [{'title': 'p1'}])
+    assert store.generation() == 2
+    assert store.load('podcasts.json') == [{'title': 'p2'}]
+
+
+def test_pinned_read_survives_pruned_generation(store):
+    store.keep = 1
+    store.publish({'articles.json': [{'title': 'a1'}]})
+
+    with store.pinned():
+        store.publish({'articles.json': [{'title': 'a2'}]})
+        # Generation 1 was pruned after the pin: the load retries on the new one
+        assert store.load('articles.json') == [{'title': 'a2'}]
+
+
+def test_manifest_is_stale_after_legacy_copy_replaced(store):
+    store.publish({'articles.json': [{'title': 'a'}], 'podcasts.json': []})
+
+    # e.g. a git pull brings in a newer articles.json than the local manifest
+    with open('articles.json', 'w') as f:
+        json.dump([{'title': 'pulled'}], f)
+    later = time.time() + 10
+    os.utime('articles.json', (later, later))
+
+    assert store.current() is None
+    assert store.generation() is None
+    assert store.load('articles.json') is None
+
+    # The next publish carries the newer copy over instead of the stale snapshot
+    generation = store.publish({'podcasts.json': [{'title': 'p'}]})
+    assert generation == 2
+    assert store.load('articles.json') == [{'title': 'pulled'}]
+
+
+def test_touched_but_identical_legacy_copy_is_not_stale(store):
+    store.publish({'articles.json': [{'title': 'a'}]})
+    later = time.time() + 10
+    os.utime('articles.json', (later, later))
+
+    assert store.generation() == 1
@@ -0,0 +1,125 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import traceback
+from datetime import datetime
+from typing import Dict, Optional
+
+# Single-file store used before transcripts moved to per-episode sidecars
+LEGACY_STORE_PATH = os.path.join('data', 'transcripts.json')
+
+
+class TranscriptStore:
+    """Episode transcripts and descriptions in compressed per-episode sidecar files
+
+    A small index (index.json) holds the summary and identity of each episode;
+    the long text lives in <key>.json.gz and is only read on demand.
+    """
+    def __init__(self, directory: str = None):
+        self.directory = directory or os.getenv('TRANSCRIPT_STORE_DIR', os.path.join('data', 'transcripts'))
+        self.index_path = os.path.join(self.directory, 'index.json')
+        self._lock = threading.Lock()
+        self._index = None
+        self._dirty = False
+
+    @staticmethod
+    def episode_key(guid: str, audio_url: str, audio_length) -> str:
+        """Stable key that changes when the episode's audio is replaced"""
+        identity = json.dumps([guid or '', audio_url or '', str(audio_length or '')])
+        return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+    def _sidecar_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json.gz")
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r') as f:
+                    self._index = json.load(f)
+            except FileNotFoundError:
+                self._index = {}
+                self._migrate_legacy_store()
+            except Exception as e:
+                print(f"Error loading transcript index, starting empty: {str(e)}")
+                self._index = {}
+        return self._index
+
+    def _migrate_legacy_store(self):
+        """Move records from the old single-file store into sidecars"""
+        try:
+            with open(LEGACY_STORE_PATH, 'r') as f:
+                records = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        for key, record in records.items():
+            transcript = record.pop('transcript', None)
+            summary = record.pop('summary', '')
+            self._put(key, transcript, summary, record.pop('description', None), **record)
+        print(f"Migrated {len(records)} transcripts from {LEGACY_STORE_PATH} to {self.directory}")
+
+    def _write_sidecar(self, key: str, document: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._sidecar_path(key)
+        tmp_path = f"{path}.tmp"
+        # mtime=0 keeps the bytes identical for identical text, so unchanged files stay unchanged in git
+        with open(tmp_path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+            f.write(json.dumps(document).encode('utf-8'))
+        os.replace(tmp_path, path)
+
+    def _read_sidecar(self, key: str) -> Dict:
+        try:
+            with gzip.open(self._sidecar_path(key), 'rb') as f:
+                return json.loads(f.read().decode('utf-8'))
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error reading transcript sidecar {key}: {str(e)}")
+            return {}
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Index record ({'summary', 'has_transcript', ...}) for an episode key, without the text"""
+        with self._lock:
+            record = self._load().get(key)
+            return dict(record) if record else None
+
+    def put(self, key: str, transcript: Optional[str], summary: str, description: str = None, **metadata):
+        """Store an episode's transcript, description and summary"""
+        with self._lock:
+            self._load()
+            self._put(key, transcript, summary, description, **metadata)
+
+    def _put(self, key: str, transcript: Optional[str], summary: str, description: str = None, **metadata):
+        self._write_sidecar(key, {'transcript': transcript, 'description': description})
+        self._index[key] = {
+            **metadata,
+            'summary': summary,
+            'has_transcript': bool(transcript),
+            'stored_at': datetime.now().isoformat()
+        }
+        self._dirty = True
+
+    def load_transcript(self, key: str) -> Optional[str]:
+        """Full transcript text for an episode, read from its sidecar"""
+        return self._read_sidecar(key).get('transcript')
+
+    def load_description(self, key: str) -> Optional[str]:
+        """Episode description (show notes), read from its sidecar"""
+        return self._read_sidecar(key).get('description')
+
+    def save(self):
+        """Write the index to disk if it changed"""
+        if not self._dirty:
+            return
+        try:
+            with self._lock:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = f"{self.index_path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(self._index, f, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.index_path)
+                self._dirty = False
+        except Exception as e:
+            print(f"Error saving transcript store: {str(e)}")
+            traceback.print_exc()
@@ -0,0 +1,165 @@
+"""
+Whisper transcription on a pool of worker processes.
+
+Each worker loads the model once. Long episodes are cut into overlapping
+windows that are transcribed in parallel and stitched back together by
+segment timestamps.
+"""
+
+import importlib.util
+import multiprocessing
+import os
+import shutil
+import subprocess
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+# Whisper works on 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+# Model loaded once per worker process by _init_worker
+_worker_model = None
+
+
+def load_audio(path: str):
+    """Decode an audio file to 16 kHz mono float32 samples with ffmpeg"""
+    import numpy as np
+
+    command = [
+        'ffmpeg', '-nostdin', '-threads', '0', '-i', path,
+        '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(SAMPLE_RATE), '-'
+    ]
+    output = subprocess.run(command, capture_output=True, check=True).stdout
+    return np.frombuffer(output, np.int16).flatten().astype(np.float32) / 32768.0
+
+
+def _init_worker(model_name: str, threads: int):
+    """Load the Whisper model once in a freshly started worker"""
+    global _worker_model
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    import torch
+    import whisper
+
+    torch.set_num_threads(threads)
+    _worker_model = whisper.load_model(model_name)
+
+
+def _transcribe_window(audio, offset_seconds: float) -> List[Dict]:
+    """Transcribe one window, returning segments on the episode's timeline"""
+    result = _worker_model.transcribe(audio, fp16=False)
+    return [
+        {
+            'start': segment['start'] + offset_seconds,
+            'end': segment['end'] + offset_seconds,
+            'text': segment['text']
+        }
+        for segment in result.get('segments', [])
+    ]
+
+
+class TranscriptionEngine:
+    """Transcribe episodes with Whisper across several CPU worker processes"""
+    def __init__(self, model_name: str = None, workers: int = None, threads_per_worker: int = None,
+                 chunk_seconds: int = None, overlap_seconds: int = None):
+        self.model_name = model_name or os.getenv('WHISPER_MODEL', 'base.en')
+        self.threads_per_worker = max(1, threads_per_worker or int(os.getenv('WHISPER_THREADS_PER_WORKER', '2')))
+        default_workers = max(1, min(4, (os.cpu_count() or 1) // self.threads_per_worker))
+        self.workers = max(1, workers or int(os.getenv('WHISPER_WORKERS', str(default_workers))))
+        self.chunk_seconds = chunk_seconds or int(os.getenv('WHISPER_CHUNK_SECONDS', '600'))
+        self.overlap_seconds = overlap_seconds if overlap_seconds is not None else int(os.getenv('WHISPER_CHUNK_OVERLAP', '10'))
+        self._pool = None
+        self._model = None  # In-process model when running with a single worker
+
+    def ensure_ready(self) -> bool:
+        """Check Whisper (and ffmpeg for chunking) are available, loading the model if in-process"""
+        if importlib.util.find_spec('whisper') is None:
+            print("Whisper is not installed; transcription is unavailable.")
+            return False
+        if self.workers == 1:
+            return self._load_model() is not None
+        if shutil.which('ffmpeg') is None:
+            print("ffmpeg not found; transcription is unavailable.")
+            return False
+        return True
+
+    def _load_model(self):
+        if self._model is None:
+            try:
+                import torch
+                import whisper
+
+                print(f"Loading Whisper model ({self.model_name})... This might take a moment on first run.")
+                torch.set_num_threads(self.threads_per_worker)
+                self._model = whisper.load_model(self.model_name)
+                print("Whisper model loaded successfully.")
+            except Exception as e:
+                print(f"Error loading Whisper model: {str(e)}")
+                traceback.print_exc()
+        return self._model
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            print(f"Starting {self.workers} Whisper workers ({self.threads_per_worker} threads each)")
+            # Workers are spawned, not forked: the app has scraper, prefetch and HTTP threads
+            # running, and a fork could copy a lock one of them holds
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.model_name, self.threads_per_worker)
+            )
+        return self._pool
+
+    def windows(self, total_samples: int) -> List[Tuple[int, int]]:
+        """Overlapping (start, end) sample ranges covering the whole episode"""
+        chunk = self.chunk_seconds * SAMPLE_RATE
+        overlap = min(self.overlap_seconds * SAMPLE_RATE, chunk // 2)
+        if total_samples <= chunk:
+            return [(0, total_samples)]
+        windows = []
+        start = 0
+        while True:
+            end = min(start + chunk, total_samples)
+            windows.append((start, end))
+            if end >= total_samples:
+                return windows
+            start = end - overlap
+
+    @staticmethod
+    def stitch(windows: List[Tuple[int, int]], window_segments: List[List[Dict]]) -> str:
+        """Join window transcripts, keeping each overlap's segments from one window only"""
+        texts = []
+        for idx, ((start, end), segments) in enumerate(zip(windows, window_segments)):
+            # Cut points sit in the middle of the overlaps with the neighbouring windows
+            lower = (start + windows[idx - 1][1]) / 2 / SAMPLE_RATE if idx > 0 else float('-inf')
+            upper = (end + windows[idx + 1][0]) / 2 / SAMPLE_RATE if idx + 1 < len(windows) else float('inf')
+            for segment in segments:
+                midpoint = (segment['start'] + segment['end']) / 2
+                if lower <= midpoint < upper:
+                    texts.append(segment['text'].strip())
+        return ' '.join(text for text in texts if text)
+
+    def transcribe(self, audio_path: str) -> Dict:
+        """Transcribe an audio file, returning {'text': ...} like whisper's transcribe"""
+        if self.workers == 1:
+            model = self._load_model()
+            if model is None:
+                raise RuntimeError("Whisper model could not be loaded")
+            return model.transcribe(audio_path, fp16=False)
+
+        audio = load_audio(audio_path)
+        windows = self.windows(len(audio))
+        print(f"Transcribing {len(audio) / SAMPLE_RATE:.0f}s of audio in {len(windows)} windows")
+        pool = self._get_pool()
+        futures = [
+            pool.submit(_transcribe_window, audio[start:end], start / SAMPLE_RATE)
+            for start, end in windows
+        ]
+        return {'text': self.stitch(windows, [future.result() for future in futures])}
+
+    def close(self):
+        """Shut down the worker pool, releasing the models it holds"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
@@ -0,0 +1,89 @@
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+
+class UpdateJobQueue:
+    """Run content updates on a single background worker and track their status"""
+    def __init__(self, update_func: Callable[[], bool], max_history: int = 50):
+        self.update_func = update_func
+        self.max_history = max_history
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='content-update')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, trigger: str = 'api', **update_kwargs) -> Dict:
+        """Queue an update, or return the one already waiting to run"""
+        with self._lock:
+            # Coalesce requests: a queued job will pick up the same changes anyway
+            for job in self._jobs.values():
+                if job['status'] == 'queued':
+                    return dict(job)
+
+            job_id = uuid.uuid4().hex[:12]
+            job = {
+                'id': job_id,
+                'status': 'queued',
+                'trigger': trigger,
+                'queued_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'error': None
+            }
+            self._jobs[job_id] = job
+            while len(self._jobs) > self.max_history:
+                self._jobs.popitem(last=False)
+
+        self._executor.submit(self._run, job_id, update_kwargs)
+        return dict(job)
+
+    def _run(self, job_id: str, update_kwargs: Dict):
+        self._set(job_id, status='running', started_at=datetime.now().isoformat())
+        try:
+            success = self.update_func(**update_kwargs)
+            self._set(job_id, status='succeeded' if success else 'failed',
+                      finished_at=datetime.now().isoformat())
+        except Exception as e:
+            traceback.print_exc()
+            self._set(job_id, status='failed', error=str(e), finished_at=datetime.now().isoformat())
+
+    def _set(self, job_id: str, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Status of a job, or None if it is unknown or has aged out"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+
+def start_scheduler(job_queue: UpdateJobQueue, interval_hours: float = None, daily_at: str = None,
+                    poll_seconds: int = 30) -> threading.Thread:
+    """Queue updates on a schedule from a daemon thread (daily at HH:MM, or every N hours)"""
+    import schedule
+
+    scheduler = schedule.Scheduler()
+    if daily_at:
+        scheduler.every().day.at(daily_at).do(job_queue.submit, trigger='schedule')
+    else:
+        minutes = max(1, int((interval_hours or 24) * 60))
+        scheduler.every(minutes).minutes.do(job_queue.submit, trigger='schedule')
+
+    def run():
+        while True:
+            try:
+                scheduler.run_pending()
+            except Exception:
+                traceback.print_exc()
+            time.sleep(poll_seconds)
+
+    thread = threading.Thread(target=run, name='update-scheduler', daemon=True)
+    thread.start()
+    return thread
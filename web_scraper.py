@@ -1,24 +1,80 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
-import json
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import os
-from typing import List, Dict
+import threading
+import time
+from typing import List, Dict, Optional, Tuple
 import traceback
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-import re
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+from http_cache import HTTPCache, CachedResponse
+from html_extract import build_extractors
+from dedup import NearDuplicateIndex
+from summary_engine import ExtractiveSummarizer
+from summary_cache import default_summary_cache
+from content_store import ContentCollection, open_content_store
+from snapshots import default_snapshot_store
+from metrics import default_metrics
+from news_sources import get_source, load_sources, source_timeout
+
+# Query parameters that only track the referrer and never change the article
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'cmp'}
+
+def normalize_link(link: str) -> str:
+    """Normalize an article URL so the same story always maps to one key"""
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', host, path, urlencode(query), ''))
 
 class WebScraper:
-    def __init__(self):
+    def __init__(self, max_workers: int = None, per_host_limit: int = None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        # Download required NLTK data
-        nltk.download('punkt')
-        nltk.download('stopwords')
-        self.stop_words = set(stopwords.words('english'))
+        
+        # Concurrency limits for full-article fetching (1 worker = sequential); the workers are
+        # shared by all sources, so max_workers bounds the article fetches in flight in total
+        self.max_workers = max(1, max_workers or int(os.getenv('SCRAPER_MAX_WORKERS', '8')))
+        self.per_host_limit = max(1, per_host_limit or int(os.getenv('SCRAPER_PER_HOST_LIMIT', '4')))
+        self._fetch_executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='article-fetch')
+        
+        # Shared keep-alive session so article fetches reuse TCP/TLS connections; one pool per
+        # host, sized so no registered source's pool is evicted (feed and article hosts may differ)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=max(10, 2 * len(load_sources())), pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._host_semaphores = {}
+        self._host_lock = threading.Lock()
+        
+        # Conditional-GET cache for listing and article pages
+        self.http_cache = HTTPCache()
+        
+        # Previously ingested articles keyed by normalized link (incremental mode)
+        self.known_articles = {}
+        
+        # SQLite content store when STORAGE_BACKEND=sqlite; JSON files otherwise
+        self.content_store = open_content_store()
+        self.snapshots = default_snapshot_store
+        
+        # NLTK stopwords and punkt are read from local data on first use; nothing is downloaded
+        self.summarizer = ExtractiveSummarizer()
+        self.summary_cache = default_summary_cache
+        
+        # Per-stage counters and latency histograms labeled by source
+        self.metrics = default_metrics
+        self.article_storage = ContentCollection('articles', self.content_store, self.snapshots, self.metrics, 'articles',
+                                                 'ARTICLE_DAYS_FILTER', 7, key=lambda article: normalize_link(article['link']))
         
         # Site-specific selectors
         self.site_selectors = {
@@ -33,17 +89,144 @@ class WebScraper:
                 'date': ['time.published', 'span.date']
             }
         }
+        # Compiled lxml/XPath extractors for the sites above
+        self.extractors = build_extractors(self.site_selectors)
+        # Hosts of sources whose base URL was overridden (e.g. a local stand-in) -> site key
+        self.site_hosts = {}
+    
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        """Get the semaphore capping concurrent requests to the URL's host"""
+        host = url.split('/')[2] if '//' in url else url
+        with self._host_lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_semaphores[host]
+    
+    def _fetch(self, url: str, timeout: int = None) -> CachedResponse:
+        """GET a page through the per-host limit and the HTTP cache"""
+        with self._host_semaphore(url):
+            return self.http_cache.get(self.session, url, timeout=timeout)
+    
+    def fetch_articles_content(self, links: List[str], deadline: float = None, source: str = None) -> List[Optional[str]]:
+        """Fetch full content for several articles concurrently, preserving order
+
+        Fetches run on the workers shared by all sources. Articles not fetched by the
+        deadline (a time.monotonic() value) come back as None.
+        """
+        if not links:
+            return []
+        if deadline is None and (self.max_workers == 1 or len(links) == 1):
+            return [self.get_article_content(link, source) for link in links]
+
+        # A source keeps at most per_host_limit fetches queued, so sources take turns on the
+        # shared workers instead of one source's backlog filling the queue (and the host limit
+        # leaving workers idle behind it)
+        contents = [None] * len(links)
+        waiting = list(enumerate(links))
+        running = {}
+        while waiting or running:
+            while waiting and len(running) < self.per_host_limit:
+                idx, link = waiting.pop(0)
+                running[self._fetch_executor.submit(self.get_article_content, link, source)] = idx
+            timeout = None if deadline is None else deadline - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                break
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                contents[running.pop(future)] = future.result()
+        # Fetches still running past the deadline finish in the background; their results are dropped
+        return contents
+    
+    def set_known_articles(self, articles: List[Dict]):
+        """Register already-ingested articles so unchanged ones are not fetched again"""
+        self.known_articles = {
+            normalize_link(article['link']): article
+            for article in articles if article.get('link')
+        }
+        # Feed GUIDs survive link changes (e.g. a retitled story with a new slug)
+        self.known_articles.update({
+            f"guid:{article['guid']}": article
+            for article in articles if article.get('guid')
+        })
+    
+    def build_articles(self, candidates: List[tuple], source: str, deadline: float = None) -> List[Dict]:
+        """Turn (title, link, date, guid) listing items into articles, reusing known ones"""
+        articles = [None] * len(candidates)
+        pending = []
+        for idx, (title, link, article_date, guid) in enumerate(candidates):
+            date_str = article_date.strftime('%Y-%m-%d')
+            known = (guid and self.known_articles.get(f"guid:{guid}")) or self.known_articles.get(normalize_link(link))
+            # Reuse the stored article when its listing entry is unchanged
+            if known and known.get('summary') and known.get('title') == title and known.get('date') == date_str:
+                articles[idx] = known.copy()
+            else:
+                pending.append(idx)
+        
+        if self.known_articles:
+            print(f"{source}: {len(candidates) - len(pending)} known articles reused, {len(pending)} to fetch")
+        
+        # Fetch new article content concurrently, then summarize in listing order;
+        # articles not fetched before the deadline are left for the next run
+        contents = self.fetch_articles_content([candidates[idx][1] for idx in pending], deadline=deadline, source=source)
+        timed_out = contents.count(None)
+        if timed_out:
+            print(f"{source}: {timed_out} articles not fetched before the source timeout, keeping the rest")
+        for idx, content in zip(pending, contents):
+            if content is None:
+                continue
+            title, link, article_date, guid = candidates[idx]
+            summary = self.summarize_content(content, source=source) if content else ''
+            articles[idx] = {
+                'title': title,
+                'link': link,
+                'summary': summary,
+                'source': source,
+                'date': article_date.strftime('%Y-%m-%d'),
+                'timestamp': datetime.now().isoformat()
+            }
+            if guid:
+                articles[idx]['guid'] = guid
+        return [article for article in articles if article is not None]
     
-    def get_article_content(self, url: str) -> str:
+    def merge_articles(self, existing: List[Dict], fresh: List[Dict]) -> List[Dict]:
+        """Merge freshly scraped articles into the existing set, fresh ones first"""
+        merged = {}
+        for article in fresh + existing:
+            if article.get('link'):
+                merged.setdefault(normalize_link(article['link']), article)
+        return list(merged.values())
+    
+    def get_article_content(self, url: str, source: str = None) -> str:
         """Get the full content of an article with improved extraction"""
+        source = source or url.split('/')[2]
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Get domain-specific selectors
-            domain = url.split('/')[2]
-            selectors = next((v for k, v in self.site_selectors.items() if k in domain), None)
+            # Only the network round trip is throttled per host; parsing runs freely
+            with self.metrics.stage('article_fetch', source):
+                response = self._fetch(url, timeout=10)
+            with self.metrics.stage('extraction', source):
+                return self.extract_article_text(response.text, url)
+        except Exception as e:
+            print(f"Error getting article content from {url}: {str(e)}")
+            traceback.print_exc()
+            return ''
+    
+    def extract_article_text(self, page: str, url: str) -> str:
+        """Paragraph text of an article page, via the site's compiled lxml extractor when it has one"""
+        domain = url.split('/')[2]
+        site = self.site_hosts.get(domain) or next((k for k in self.site_selectors if k in domain), None)
+        extractor = self.extractors.get(site)
+        if extractor is not None:
+            content = extractor.extract(page)
+            if content is not None:
+                return content
+        return self._soup_article_text(page, self.site_selectors.get(site))
+    
+    def _soup_article_text(self, page: str, selectors: Optional[Dict]) -> str:
+        """BeautifulSoup extraction for unknown domains and pages the compiled extractor can't handle"""
+        try:
+            soup = BeautifulSoup(page, 'html.parser')
             
             # Remove unwanted elements
             for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
@@ -80,16 +263,18 @@ class WebScraper:
                 return content
             return ''
         except Exception as e:
-            print(f"Error getting article content from {url}: {str(e)}")
+            print(f"Error extracting article content: {str(e)}")
             traceback.print_exc()
             return ''
     
-    def extract_date(self, article_element, domain: str = None) -> datetime:
+    def extract_date(self, article_element, domain: str = None, selectors: List[str] = None) -> datetime:
         """Extract date from article element with improved parsing"""
         try:
-            selectors = self.site_selectors.get(domain, {}).get('date', []) if domain else []
+            if selectors is None:
+                selectors = self.site_selectors.get(domain, {}).get('date', []) if domain else []
             
             # Try site-specific date selectors first
+            date_element = None
             for selector in selectors:
                 date_element = article_element.select_one(selector)
                 if date_element:
@@ -120,126 +305,23 @@ class WebScraper:
         except Exception:
             return datetime.now()
     
-    def summarize_content(self, content: str, num_sentences: int = 4) -> str:
+    def summarize_content(self, content: str, num_sentences: int = 4, source: str = 'all') -> str:
         """Generate a high-quality summary focused on key information"""
         try:
-            # If content is too short, return it as is
-            if len(content) < 200:
-                return content
-                
-            # Tokenize content into sentences
-            sentences = sent_tokenize(content)
-            if len(sentences) <= num_sentences:
-                return content
-            
-            # Define keywords related to important energy sector developments
-            energy_keywords = {
-                # Business and financial terms
-                'acquisition': 3.0, 'merger': 3.0, 'investment': 2.5, 'funding': 2.5, 
-                'billion': 2.5, 'million': 2.0, 'profit': 2.0, 'revenue': 2.0, 'growth': 2.0,
-                'budget': 2.0, 'cost': 1.5, 'price': 1.5, 'market': 1.5, 'stock': 1.5,
-                
-                # Technology and innovation
-                'innovation': 3.0, 'technology': 2.5, 'breakthrough': 3.0, 'efficiency': 2.5, 
-                'development': 2.0, 'research': 2.0, 'discovery': 2.5, 'patent': 2.5,
-                'prototype': 2.5, 'launch': 2.0, 'announce': 2.0, 'introduce': 2.0,
-                
-                # Energy sources
-                'renewable': 2.5, 'solar': 2.0, 'wind': 2.0, 'hydro': 2.0, 'nuclear': 2.0,
-                'battery': 2.5, 'storage': 2.5, 'grid': 2.0, 'power': 1.5, 'electricity': 1.5,
-                'energy': 1.5, 'oil': 1.5, 'gas': 1.5, 'coal': 1.5, 'hydrogen': 2.5,
-                
-                # Policy and regulation
-                'policy': 2.5, 'regulation': 2.5, 'law': 2.5, 'legislation': 2.5, 
-                'government': 2.0, 'epa': 2.5, 'subsidy': 2.5, 'incentive': 2.5,
-                'tax': 2.0, 'carbon': 2.5, 'emissions': 2.5, 'climate': 2.0,
-                
-                # Key events and time indicators
-                'announce': 2.0, 'report': 2.0, 'release': 2.0, 'unveil': 2.5,
-                'today': 2.0, 'yesterday': 2.0, 'week': 1.5, 'month': 1.5, 'year': 1.5
-            }
-            
-            # Tokenize words and remove stopwords
-            words = word_tokenize(content.lower())
-            words = [word for word in words if word.isalnum() and word not in self.stop_words]
-            
-            # Calculate word frequencies
-            freq_dist = {}
-            for word in words:
-                freq_dist[word] = freq_dist.get(word, 0) + 1
-            
-            max_freq = max(freq_dist.values()) if freq_dist else 1
-            
-            # Score sentences based on multiple factors
-            sentence_scores = {}
-            entity_pattern = r'([A-Z][a-z]+ )+(?:Inc\.?|LLC|Ltd\.?|Corp\.?|Corporation|Company|Group|Technologies|Energy|Solar|Wind|Power)'
-            
-            for idx, sentence in enumerate(sentences):
-                # Position weights (first few and last few sentences often contain key info)
-                position_weight = 1.5 if idx < 2 or idx > len(sentences) - 3 else 1.0
-                
-                # Presence of entities (companies, organizations)
-                entity_weight = 1.5 if re.search(entity_pattern, sentence) else 1.0
-                
-                # Length weight (prefer medium-sized sentences)
-                length = len(sentence.split())
-                length_weight = 1.2 if 10 <= length <= 25 else 0.8 if length > 40 else 1.0
-                
-                # Calculate base score from word frequencies
-                score = 0
-                for word in word_tokenize(sentence.lower()):
-                    # Apply special weighting for energy sector keywords
-                    if word in energy_keywords:
-                        score += freq_dist.get(word, 0) * energy_keywords[word]
-                    elif word in freq_dist:
-                        score += freq_dist[word]
-                
-                # Normalize score by sentence length to avoid favoring long sentences
-                base_score = score / max(1, length)
-                
-                # Apply all weights
-                sentence_scores[sentence] = base_score * position_weight * entity_weight * length_weight
-                
-                # Boost sentences containing numbers (often indicate key metrics)
-                if re.search(r'\d+', sentence):
-                    sentence_scores[sentence] *= 1.3
-                
-                # Boost sentences with quotes (often contain important statements)
-                if re.search(r'"[^"]+"', sentence) or re.search(r"'[^']+'", sentence):
-                    sentence_scores[sentence] *= 1.4
-            
-            # Get top sentences and sort them by original order
-            top_sentences = sorted(
-                sentence_scores.items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:num_sentences]
-            
-            top_sentences.sort(key=lambda x: sentences.index(x[0]))
-            
-            # Create cohesive summary
-            summary = ' '.join(sentence for sentence, _ in top_sentences)
-            
-            # If the summary is too short, add more sentences
-            if len(summary) < 200 and len(sentences) > num_sentences:
-                additional_sentences = sorted(
-                    [(s, score) for s, score in sentence_scores.items() if s not in [sent for sent, _ in top_sentences]],
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:2]
-                
-                # Add these sentences in original order
-                all_sentences = top_sentences + additional_sentences
-                all_sentences.sort(key=lambda x: sentences.index(x[0]))
-                summary = ' '.join(sentence for sentence, _ in all_sentences)
-            
+            with self.metrics.stage('summarization', source):
+                cache_key = self.summary_cache.make_key(content, self.summarizer.name, num_sentences=num_sentences)
+                summary = self.summary_cache.get(cache_key)
+                if summary is None:
+                    summary = self.summarizer.summarize(content, num_sentences)
+                    self.summary_cache.set(cache_key, summary)
             return summary
         except Exception as e:
             print(f"Error in summarization: {str(e)}")
             traceback.print_exc()
             return content[:300] + '...' if len(content) > 300 else content
     
-    def filter_recent_content(self, articles: List[Dict], days: int = 7) -> List[Dict]:
+    def filter_recent_content(self, articles: List[Dict], days: int = 7,
+                              dedup_index: NearDuplicateIndex = None) -> List[Dict]:
         """Filter and deduplicate recent content"""
         try:
             # Convert dates to datetime objects
@@ -254,198 +336,188 @@ class WebScraper:
                 if article['date'] >= cutoff_date
             ]
             
-            # Deduplicate similar content
+            # Deduplicate similar content with a MinHash/LSH index over title and
+            # summary shingles; a persisted index also catches repeats from past runs
+            if dedup_index is None:
+                dedup_index = NearDuplicateIndex()
             unique_articles = []
-            seen_titles = set()
             for article in recent_articles:
-                # Create a simplified version of the title for comparison
-                simple_title = ''.join(
-                    c.lower() for c in article['title'] 
-                    if c.isalnum()
-                )
-                
-                # Check if we've seen a similar title
-                if not any(
-                    len(set(simple_title) & set(seen)) / len(set(simple_title) | set(seen)) > 0.8
-                    for seen in seen_titles
-                ):
+                key = normalize_link(article['link']) if article.get('link') else article['title']
+                if dedup_index.check_and_add(key, article['title'], article.get('summary', '')) is None:
                     unique_articles.append(article)
-                    seen_titles.add(simple_title)
             
             return unique_articles
         except Exception as e:
             print(f"Error filtering content: {str(e)}")
             return articles
     
-    def scrape_canary_media(self) -> List[Dict]:
-        """Scrape latest articles from Canary Media"""
+    @staticmethod
+    def _select_first(element, selectors: List[str]):
+        """First element matching the earliest selector in the list that matches"""
+        for selector in selectors:
+            match = element.select_one(selector)
+            if match is not None:
+                return match
+        return None
+    
+    def _feed_candidates(self, source: Dict, deadline: float) -> Optional[List[tuple]]:
+        """(title, link, date, guid) items from the source's RSS/Atom feed, or None if it is unusable"""
+        import feedparser
+        
         try:
-            print("Scraping Canary Media...")
-            url = "https://www.canarymedia.com/"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            print(f"Response status code: {response.status_code}")
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            articles = []
-            
-            # Try different selectors
-            article_elements = (
-                soup.find_all('article') or 
-                soup.find_all('div', class_='article') or
-                soup.find_all('div', class_='post')
-            )
-            
-            print(f"Found {len(article_elements)} article elements")
-            
-            for article in article_elements:
-                # Get article date
-                article_date = self.extract_date(article)
-                # Skip articles older than 7 days
-                if datetime.now() - article_date > timedelta(days=7):
-                    continue
-                
-                # Get title and link
-                title_element = (
-                    article.find('h2') or 
-                    article.find('h3') or
-                    article.find('div', class_='title')
-                )
-                title = title_element.text.strip() if title_element else ''
-                
-                link_element = article.find('a')
-                link = link_element['href'] if link_element else ''
-                if link and not link.startswith('http'):
-                    link = f"https://www.canarymedia.com{link}"
-                
-                if title and link:
-                    # Get full article content
-                    content = self.get_article_content(link)
-                    summary = self.summarize_content(content) if content else ''
-                    
-                    articles.append({
-                        'title': title,
-                        'link': link,
-                        'summary': summary,
-                        'source': 'Canary Media',
-                        'date': article_date.strftime('%Y-%m-%d'),
-                        'timestamp': datetime.now().isoformat()
-                    })
-            
-            print(f"Successfully scraped {len(articles)} recent articles from Canary Media")
-            return articles
-            
+            # Conditional GET through the HTTP cache: an unchanged feed costs a 304
+            with self.metrics.stage('listing_fetch', source['name']):
+                response = self._fetch(source['feed'], timeout=max(1.0, deadline - time.monotonic()))
         except Exception as e:
-            print(f"Error scraping Canary Media: {str(e)}")
-            traceback.print_exc()
-            return []
+            print(f"{source['name']}: feed unavailable ({str(e)}), falling back to the listing page")
+            return None
+        print(f"{source['name']} feed status code: {response.status_code}{' (not modified)' if response.from_cache else ''}")
+        
+        feed = feedparser.parse(response.text)
+        if not feed.entries:
+            reason = feed.bozo_exception if feed.bozo else 'no entries'
+            print(f"{source['name']}: could not use feed ({reason}), falling back to the listing page")
+            return None
+        
+        candidates = []
+        for entry in feed.entries:
+            published = entry.get('published_parsed') or entry.get('updated_parsed')
+            title = (entry.get('title') or '').strip()
+            link = (entry.get('link') or '').strip()
+            if not (published and title and link):
+                continue
+            # feedparser normalizes publish times to UTC
+            article_date = datetime(*published[:6], tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+            candidates.append((title, link, article_date, entry.get('id') or None))
+        return candidates
     
-    def scrape_utility_dive(self) -> List[Dict]:
-        """Scrape latest articles from Utility Dive"""
-        try:
-            print("Scraping Utility Dive...")
-            url = "https://www.utilitydive.com/"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            print(f"Response status code: {response.status_code}")
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            articles = []
-            
-            # Try different selectors
-            article_elements = (
-                soup.find_all('div', class_='feed__item') or
-                soup.find_all('div', class_='article-card') or
-                soup.find_all('article')
-            )
+    def _listing_candidates(self, source: Dict, deadline: float) -> List[tuple]:
+        """(title, link, date, None) items scraped from the source's HTML listing page"""
+        name = source['name']
+        with self.metrics.stage('listing_fetch', name):
+            response = self._fetch(source['listing_url'], timeout=max(1.0, deadline - time.monotonic()))
+        print(f"{name} response status code: {response.status_code}{' (not modified)' if response.from_cache else ''}")
+        
+        # lxml backend: the listing selectors only need the tree, not html.parser's quirks
+        soup = BeautifulSoup(response.text, 'lxml')
+        candidates = []
+        
+        # First item selector that matches anything wins
+        article_elements = []
+        for selector in source['item']:
+            article_elements = soup.select(selector)
+            if article_elements:
+                break
+        
+        print(f"{name}: found {len(article_elements)} article elements")
+        
+        for article in article_elements:
+            article_date = self.extract_date(article, source.get('site'), source.get('date'))
             
-            print(f"Found {len(article_elements)} article elements")
+            title_element = self._select_first(article, source['title'])
+            title = title_element.text.strip() if title_element else ''
             
-            for article in article_elements:
-                # Get article date
-                article_date = self.extract_date(article)
-                # Skip articles older than 7 days
-                if datetime.now() - article_date > timedelta(days=7):
-                    continue
-                
-                # Get title and link
-                title_element = (
-                    article.find('h3') or
-                    article.find('h2') or
-                    article.find('div', class_='title')
-                )
-                title = title_element.text.strip() if title_element else ''
-                
-                link_element = article.find('a')
-                link = link_element['href'] if link_element else ''
-                if link and not link.startswith('http'):
-                    link = f"https://www.utilitydive.com{link}"
-                
-                if title and link:
-                    # Get full article content
-                    content = self.get_article_content(link)
-                    summary = self.summarize_content(content) if content else ''
-                    
-                    articles.append({
-                        'title': title,
-                        'link': link,
-                        'summary': summary,
-                        'source': 'Utility Dive',
-                        'date': article_date.strftime('%Y-%m-%d'),
-                        'timestamp': datetime.now().isoformat()
-                    })
-            
-            print(f"Successfully scraped {len(articles)} recent articles from Utility Dive")
-            return articles
+            link_element = self._select_first(article, source['link'])
+            link = link_element.get('href', '') if link_element else ''
+            if link and not link.startswith('http'):
+                link = urljoin(source['listing_url'], link)
             
+            if title and link:
+                candidates.append((title, link, article_date, None))
+        return candidates
+    
+    def scrape_source(self, source: Dict, deadline: float = None) -> List[Dict]:
+        """Scrape recent articles from one registered news source, feed first (errors give [])"""
+        try:
+            return self._scrape_source(source, deadline)
         except Exception as e:
-            print(f"Error scraping Utility Dive: {str(e)}")
+            print(f"Error scraping {source['name']}: {str(e)}")
             traceback.print_exc()
             return []
     
-    def save_articles(self, articles: List[Dict], filename: str):
-        """Save articles to a JSON file"""
+    def _scrape_source(self, source: Dict, deadline: float = None) -> List[Dict]:
+        """scrape_source, raising when neither the feed nor the listing page could be used"""
+        name = source['name']
+        print(f"Scraping {name}...")
+        if deadline is None:
+            deadline = time.monotonic() + float(source.get('timeout') or source_timeout())
+        if source.get('site'):
+            for url in (source.get('feed'), source.get('listing_url')):
+                if url and source['site'] not in urlsplit(url).netloc:
+                    self.site_hosts[urlsplit(url).netloc] = source['site']
+        
+        # Feeds give exact publish dates and GUIDs in one small request;
+        # the HTML listing is only scraped when there is no usable feed
+        candidates = self._feed_candidates(source, deadline) if source.get('feed') else None
+        if candidates is None and source.get('listing_url'):
+            candidates = self._listing_candidates(source, deadline)
+        if candidates is None:
+            raise ValueError("no usable feed and no listing page")
+        
+        # Skip articles older than the source's window before fetching anything
+        max_age = timedelta(days=int(source.get('max_age_days', 7)))
+        now = datetime.now()
+        candidates = [candidate for candidate in candidates if now - candidate[2] <= max_age]
+        
+        articles = self.build_articles(candidates, name, deadline=deadline)
+        
+        print(f"Successfully scraped {len(articles)} recent articles from {name}")
+        return articles
+    
+    def scrape_sources(self, sources: List[Dict] = None) -> Tuple[List[Dict], Dict]:
+        """Scrape all registered sources in parallel, each within its own timeout
+
+        A source that fails contributes nothing and one that is still running when its
+        timeout passes contributes nothing this run; neither delays the rest. Returns the
+        articles and a report: {'sources': count, 'failed': {name: 'error: ...' or 'timeout'}}.
+        """
+        sources = load_sources() if sources is None else sources
+        report = {'sources': len(sources), 'failed': {}}
+        if not sources:
+            return [], report
+        
+        started = time.monotonic()
+        deadlines = [started + float(source.get('timeout') or source_timeout()) for source in sources]
+        workers = min(len(sources), int(os.getenv('SOURCE_MAX_WORKERS', '16')))
+        executor = ThreadPoolExecutor(max_workers=workers)
         try:
-            # Convert datetime objects to strings
-            serializable_articles = []
-            for article in articles:
-                article_copy = article.copy()
-                if isinstance(article_copy.get('date'), datetime):
-                    article_copy['date'] = article_copy['date'].strftime('%Y-%m-%d')
-                if isinstance(article_copy.get('timestamp'), datetime):
-                    article_copy['timestamp'] = article_copy['timestamp'].isoformat()
-                serializable_articles.append(article_copy)
-            
-            # Create data directory if it doesn't exist
-            os.makedirs('data', exist_ok=True)
-            
-            # Save to both root and data directory for compatibility
-            # Root location
-            with open(filename, 'w') as f:
-                json.dump(serializable_articles, f, indent=2)
-            
-            # Data directory
-            with open(os.path.join('data', filename), 'w') as f:
-                json.dump(serializable_articles, f, indent=2)
+            futures = [
+                executor.submit(self._scrape_source, source, deadline)
+                for source, deadline in zip(sources, deadlines)
+            ]
+            # Grace period for summarizing the articles fetched just before a deadline
+            wait(futures, timeout=max(deadlines) - started + 5)
             
-            print(f"Successfully saved {len(articles)} articles to {filename}")
-        except Exception as e:
-            print(f"Error saving articles: {str(e)}")
-            traceback.print_exc()
+            articles = []
+            for source, future in zip(sources, futures):
+                if not future.done():
+                    print(f"{source['name']} did not finish within its timeout, skipping it this run")
+                    report['failed'][source['name']] = 'timeout'
+                elif future.exception() is not None:
+                    error = future.exception()
+                    print(f"Error scraping {source['name']}: {str(error)}")
+                    traceback.print_exception(type(error), error, error.__traceback__)
+                    report['failed'][source['name']] = f"error: {str(error)}"
+                else:
+                    articles.extend(future.result())
+            failed = f" ({len(report['failed'])} failed)" if report['failed'] else ''
+            print(f"Scraped {len(articles)} articles from {len(sources)} sources in {time.monotonic() - started:.1f}s{failed}")
+            return articles, report
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def scrape_canary_media(self) -> List[Dict]:
+        """Scrape latest articles from Canary Media"""
+        return self.scrape_source(get_source('Canary Media'))
+    
+    def scrape_utility_dive(self) -> List[Dict]:
+        """Scrape latest articles from Utility Dive"""
+        return self.scrape_source(get_source('Utility Dive'))
+    
+    def save_articles(self, articles: List[Dict], filename: str) -> bool:
+        """Save articles to a JSON file (or upsert them into the SQLite store); False if that failed"""
+        return self.article_storage.save(articles, filename)
     
     def load_articles(self, filename: str) -> List[Dict]:
-        """Load articles from a JSON file"""
-        try:
-            # Try loading from root first, then from data directory
-            try:
-                with open(filename, 'r') as f:
-                    articles = json.load(f)
-            except FileNotFoundError:
-                with open(os.path.join('data', filename), 'r') as f:
-                    articles = json.load(f)
-                
-            return articles
-        except Exception as e:
-            print(f"Error loading articles: {str(e)}")
-            traceback.print_exc()
-            return [] 
\ No newline at end of file
+        """Load articles from a JSON file (or the recent window of the SQLite store, newest first)"""
+        return self.article_storage.load(filename)